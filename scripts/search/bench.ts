@@ -0,0 +1,118 @@
+// Keystroke-to-results latency of the company search (src/lib/company-search.ts)
+// over the SEC ticker file as a company list, one company per listing:
+//
+//   npm run bench:search [-- --copies <n>]
+//
+// Every prefix of each query below is searched as if typed, for the top 8 (what
+// the search dropdowns show). It reports per-keystroke latency percentiles
+// against the 1 ms budget, and the index's build time, serialized size and
+// revive (JSON.parse) time, then prints the top hits of each full query so the
+// ranking can be eyeballed. --copies repeats the list (names suffixed) to try
+// larger lists.
+
+import { readFileSync } from 'node:fs';
+import { StockItem } from '../../src/lib/types';
+import { CompanySearch, buildCompanySearchIndex } from '../../src/lib/company-search';
+import { TickerRow } from '../../src/lib/ticker-index';
+
+const LIMIT = 8;
+const BUDGET_MS = 1;
+// Passes over all keystrokes. The first is reported on its own (a cold page
+// runs the search unoptimized); the next WARMUP passes let the JIT settle and
+// the rest are measured.
+const WARMUP = 5;
+const PASSES = 25;
+
+const QUERIES = [
+  'aapl',
+  'apple',
+  'microsoft',
+  'micrsoft',
+  'nvda',
+  'brk.b',
+  'berkshire hathaway',
+  'goldman sachs',
+  'jpmorgan chase',
+  'amazn',
+  'tesla',
+  'taiwan semiconductor',
+  'coca cola',
+  'procter gamble',
+  'nasdaq',
+  'x',
+  'blackrok',
+  'exxon mobil',
+  'visa',
+  'meta platforms',
+];
+
+const args = process.argv.slice(2);
+const copiesAt = args.indexOf('--copies');
+const copies = copiesAt === -1 ? 1 : Number(args[copiesAt + 1]);
+
+const file = JSON.parse(
+  readFileSync(new URL('../../src/lib/data/company_tickers_exchange.json', import.meta.url), 'utf8')
+) as { data: TickerRow[] };
+const items: StockItem[] = [];
+for (let c = 0; c < copies; c++) {
+  for (const [cik, name, ticker, exchange] of file.data) {
+    if (!ticker) continue;
+    items.push({
+      cik: cik + c * 1e7,
+      ticker: c === 0 ? ticker : `${ticker}${c}`,
+      companyName: c === 0 ? name : `${name} ${c}`,
+      listedExchange: exchange ? [exchange] : null,
+    });
+  }
+}
+
+const fmt = (ms: number) => `${ms.toFixed(3)} ms`;
+
+// Median of a few builds: the first runs unoptimized code.
+const builds: number[] = [];
+let index = buildCompanySearchIndex(items);
+for (let i = 0; i < 5; i++) {
+  const t = performance.now();
+  index = buildCompanySearchIndex(items);
+  builds.push(performance.now() - t);
+}
+const buildMs = builds.sort((a, b) => a - b)[2];
+const json = JSON.stringify(index);
+const start = performance.now();
+const revived = JSON.parse(json);
+const reviveMs = performance.now() - start;
+const search = new CompanySearch(items, revived);
+
+console.log(`${items.length} companies, ${index.terms.length} terms`);
+console.log(`index: build ${fmt(buildMs)}, ${(json.length / 1024).toFixed(0)} KB JSON, revive ${fmt(reviveMs)}\n`);
+
+const keystrokes = QUERIES.flatMap((q) => Array.from({ length: q.length }, (_, i) => q.slice(0, i + 1)));
+const cold: number[] = [];
+const warm: number[] = [];
+let sink: unknown;
+for (let pass = 0; pass < PASSES; pass++) {
+  for (const k of keystrokes) {
+    const t = performance.now();
+    sink = search.search(k, LIMIT);
+    const ms = performance.now() - t;
+    if (pass === 0) cold.push(ms);
+    else if (pass > WARMUP) warm.push(ms);
+  }
+}
+void sink;
+
+const pct = (xs: number[], p: number) => xs[Math.min(xs.length - 1, Math.floor((p / 100) * xs.length))];
+const summary = (xs: number[]) => {
+  xs.sort((a, b) => a - b);
+  return `p50 ${fmt(pct(xs, 50))}  p90 ${fmt(pct(xs, 90))}  p99 ${fmt(pct(xs, 99))}  max ${fmt(xs[xs.length - 1])}`;
+};
+console.log(`${keystrokes.length} keystrokes; latency (budget ${BUDGET_MS} ms)`);
+console.log(`  cold  ${summary(cold)}`);
+console.log(`  warm  ${summary(warm)}  (${PASSES - WARMUP - 1} passes)`);
+console.log(`  warm p99 ${pct(warm, 99) < BUDGET_MS ? 'within' : 'over'} budget`);
+
+console.log('');
+for (const q of QUERIES) {
+  const hits = search.search(q, 3).map((i) => `${i.ticker} ${i.companyName}`);
+  console.log(`${q.padEnd(22)}${hits.join(' | ')}`);
+}
@@ -0,0 +1,166 @@
+// Transfer size and time-to-ready of the ticker data, before and after the
+// binary index:
+//
+//   npm run bench:tickers
+//
+// "json" is what the client used to do: parse the ~500 KB SEC file, then build
+// the ticker/CIK maps and the token-case map over every row. "index" is what it
+// does now: inflate the gzipped tickers.bin and wrap it in a TickerIndex. Both
+// are timed from the bytes in memory, so the network is left out. "served" is
+// what each one costs on the wire: the JSON went out as application/json, which
+// the CDN compresses, while a .bin is sent as stored, so tickers.bin is its
+// build-time gzip. The per-letter ticker shards
+// the dashboard resolves from are sized too. It then checks that every lookup
+// the app makes agrees between the old maps, the index and the shards, and
+// exits non-zero if not.
+
+import { readFileSync } from 'node:fs';
+import { brotliCompressSync, gzipSync } from 'node:zlib';
+import {
+  TICKER_SHARD_KEYS,
+  TickerIndex,
+  TickerInfo,
+  TickerRow,
+  TickerShard,
+  encodeTickerIndex,
+  encodeTickerShard,
+  gzipTickerIndex,
+  readTickerIndexFile,
+  stripEnds,
+  tickerShardKey,
+} from '../../src/lib/ticker-index';
+
+// Keep each measurement running at least this long, and at least one pass.
+const MIN_TIME_MS = 1000;
+
+const json = readFileSync(new URL('../../src/lib/data/company_tickers_exchange.json', import.meta.url));
+const rows = (JSON.parse(json.toString()) as { data: TickerRow[] }).data;
+const bin = encodeTickerIndex(rows);
+const served = new Uint8Array(await gzipTickerIndex(bin));
+const shardBins = new Map(TICKER_SHARD_KEYS.map((key) => [key, encodeTickerShard(rows, key)]));
+
+// --- The Map-based loader the index replaced ---
+
+type Maps = {
+  tickerToCik: Map<string, number>;
+  cikToInfo: Map<number, TickerInfo>;
+  tokenCase: Map<string, string>;
+};
+
+const CLEAN_CAMEL = /^[A-Za-z][a-z]*([A-Z][a-z]+)+$/;
+
+function buildMaps(rows: TickerRow[]): Maps {
+  const tickerToCik = new Map<string, number>();
+  const cikToInfo = new Map<number, TickerInfo>();
+  for (const [cik, name, ticker, exchange] of rows) {
+    if (!ticker) continue;
+    const t = ticker.toUpperCase();
+    const c = Number(cik);
+    tickerToCik.set(t, c);
+    if (!cikToInfo.has(c)) cikToInfo.set(c, { ticker: t, exchange: exchange ?? null, name });
+  }
+  const formCounts = new Map<string, Map<string, number>>();
+  for (const row of rows) {
+    const name = row[1];
+    if (!name) continue;
+    for (const raw of name.split(/\s+/)) {
+      const word = stripEnds(raw);
+      if (!word || !/[a-z][A-Z]/.test(word) || !CLEAN_CAMEL.test(word)) continue;
+      const key = word.toLowerCase();
+      let forms = formCounts.get(key);
+      if (!forms) {
+        forms = new Map();
+        formCounts.set(key, forms);
+      }
+      forms.set(word, (forms.get(word) ?? 0) + 1);
+    }
+  }
+  const tokenCase = new Map<string, string>();
+  for (const [key, forms] of formCounts) {
+    let best = '';
+    let bestCount = -1;
+    for (const [form, count] of forms) {
+      if (count > bestCount) {
+        best = form;
+        bestCount = count;
+      }
+    }
+    tokenCase.set(key, best);
+  }
+  return { tickerToCik, cikToInfo, tokenCase };
+}
+
+// --- Sizes ---
+
+const kb = (n: number) => `${(n / 1024).toFixed(1)} KB`.padStart(10);
+const sizes = (bytes: Uint8Array) => [bytes.length, gzipSync(bytes).length, brotliCompressSync(bytes).length];
+const row = (name: string, [raw, gz, br]: number[]) => console.log(`${name.padEnd(14)}${kb(raw)}${kb(gz)}${kb(br)}`);
+console.log(`${''.padEnd(14)}${'raw'.padStart(10)}${'gzip'.padStart(10)}${'br'.padStart(10)}`);
+row('json', sizes(json));
+row('index', sizes(bin));
+const shardSizes = [...shardBins.values()].filter((b) => b.length > 12).map(sizes);
+row('shard (mean)', [0, 1, 2].map((k) => shardSizes.reduce((n, s) => n + s[k], 0) / shardSizes.length));
+row('shard (max)', [0, 1, 2].map((k) => Math.max(...shardSizes.map((s) => s[k]))));
+console.log(
+  `\nserved        json ${kb(sizes(json)[2]).trim()} (br), tickers.bin ${kb(served.length).trim()} (gzip at build)`
+);
+
+// --- Time to ready ---
+
+let sink: unknown;
+
+async function msPerLoad(load: () => unknown): Promise<number> {
+  for (let i = 0; i < 5; i++) sink = await load();
+  let runs = 0;
+  const start = performance.now();
+  let elapsed = 0;
+  do {
+    sink = await load();
+    runs++;
+    elapsed = performance.now() - start;
+  } while (elapsed < MIN_TIME_MS);
+  return elapsed / runs;
+}
+
+// The client receives the file as an ArrayBuffer of its own.
+const buffer = bin.buffer.slice(bin.byteOffset, bin.byteOffset + bin.byteLength);
+const file = served.buffer.slice(served.byteOffset, served.byteOffset + served.byteLength);
+const text = json.toString();
+const before = await msPerLoad(() => buildMaps((JSON.parse(text) as { data: TickerRow[] }).data));
+const after = await msPerLoad(async () => new TickerIndex(await readTickerIndexFile(file)));
+console.log(`\ntime to ready  json ${before.toFixed(3)} ms, index ${after.toFixed(3)} ms`);
+void sink;
+
+// --- Agreement ---
+
+const maps = buildMaps(rows);
+const index = new TickerIndex(await readTickerIndexFile(file));
+const shards = new Map(
+  [...shardBins].map(([key, b]) => [key, new TickerShard(b.buffer.slice(b.byteOffset, b.byteOffset + b.byteLength))])
+);
+let mismatches = 0;
+const expect = (what: string, got: unknown, want: unknown) => {
+  if (JSON.stringify(got) === JSON.stringify(want)) return;
+  if (mismatches++ < 10) console.error(`mismatch: ${what}: got ${JSON.stringify(got)}, want ${JSON.stringify(want)}`);
+};
+for (const [ticker, cik] of maps.tickerToCik) {
+  expect(`cik(${ticker})`, index.cik(ticker), cik);
+  expect(`shard cik(${ticker})`, shards.get(tickerShardKey(ticker))!.cik(ticker), cik);
+}
+for (const [cik, info] of maps.cikToInfo) expect(`info(${cik})`, index.info(cik), info);
+for (const [key, form] of maps.tokenCase) expect(`tokenCase(${key})`, index.tokenCase(key), form);
+for (const miss of ['', 'ZZZZZZZZ', 'TOOLONGTICKER', 'A.', '1A']) {
+  expect(`cik(${miss})`, index.cik(miss), null);
+  expect(`shard cik(${miss})`, shards.get(tickerShardKey(miss))!.cik(miss), null);
+}
+for (const miss of [0, 1, 4294967295]) expect(`info(${miss})`, index.info(miss), maps.cikToInfo.get(miss) ?? null);
+expect('tokenCase(blackrockx)', index.tokenCase('blackrockx'), null);
+// A host that already inflated the file hands over the index itself.
+expect('uncompressed file', (await readTickerIndexFile(buffer)) === buffer, true);
+
+const lookups = 2 * maps.tickerToCik.size + maps.cikToInfo.size + maps.tokenCase.size;
+if (mismatches) {
+  console.error(`${mismatches} lookups disagree`);
+  process.exit(1);
+}
+console.log(`${lookups} lookups agree`);
@@ -0,0 +1,144 @@
+// Micro-benchmarks for the pure XBRL core over the synthetic corpus from
+// ./fixtures, at several corpus sizes:
+//
+//   npm run bench:xbrl [-- <sizes, e.g. 1,100,10000>] [--seed <n>]
+//
+// For each function and size it reports filings processed per second and the
+// bytes allocated per filing. Allocation is read from V8 GC statistics (heap
+// reclaimed by every collection during the run plus the heap growth left at
+// the end), so it counts short-lived garbage the final heap size would miss.
+
+import { GCProfiler } from 'node:v8';
+import { LineItemRow } from '../../src/lib/types';
+import {
+  LineItemColumns,
+  LineSourceRow,
+  allocColumns,
+  columnsFromRows,
+  rowAt,
+  stmtIndex,
+  valueWriter,
+} from '../../src/lib/line-columns';
+import { buildAnnualOverview, collapseInstantEndpoints, groupStatements } from '../../src/lib/xbrl';
+import { Fixture, generateFilings } from './fixtures';
+
+// Keep each measurement running at least this long, and at least one pass.
+const MIN_TIME_MS = 500;
+
+const args = process.argv.slice(2);
+const seedAt = args.indexOf('--seed');
+const seed = seedAt === -1 ? 1 : Number(args[seedAt + 1]);
+const sizesArg = args.find((a, i) => !a.startsWith('--') && args[i - 1] !== '--seed');
+const sizes = (sizesArg ?? '1,10,100,1000,10000').split(',').map(Number);
+
+type Case = {
+  name: string;
+  // Per-filing input, prepared outside the timed loop.
+  prepare: (f: Fixture) => unknown;
+  run: (input: unknown) => unknown;
+};
+
+// Balance sheet rows as groupStatements hands them to collapseInstantEndpoints
+// (the statement with the most instant endpoints).
+function balanceSheetRows(cols: LineItemColumns): LineItemRow[] {
+  const bs = stmtIndex('BS');
+  const rows: LineItemRow[] = [];
+  for (let i = 0; i < cols.length; i++) if (cols.stmt[i] === bs) rows.push(rowAt(cols, i));
+  return rows;
+}
+
+const CASES: Case[] = [
+  // Value parsing alone: the exact decimal + float writer against the plain
+  // Number() coercion it replaced.
+  {
+    name: 'values: valueWriter',
+    prepare: (f) => ({ raw: f.rows.map((r) => r.value), cols: allocColumns(f.rows.length) }),
+    run: (input) => {
+      const { raw, cols } = input as { raw: LineSourceRow['value'][]; cols: LineItemColumns };
+      const write = valueWriter(cols);
+      for (let i = 0; i < raw.length; i++) write(i, raw[i]);
+      return cols;
+    },
+  },
+  {
+    name: 'values: Number()',
+    prepare: (f) => ({ raw: f.rows.map((r) => r.value), cols: allocColumns(f.rows.length) }),
+    run: (input) => {
+      const { raw, cols } = input as { raw: LineSourceRow['value'][]; cols: LineItemColumns };
+      for (let i = 0; i < raw.length; i++) {
+        const v = raw[i];
+        cols.value[i] = v === null || v === undefined ? NaN : Number(v);
+      }
+      return cols;
+    },
+  },
+  {
+    name: 'columnsFromRows',
+    prepare: (f) => f.rows,
+    run: (rows) => columnsFromRows(rows as LineSourceRow[]),
+  },
+  {
+    name: 'buildAnnualOverview',
+    prepare: (f) => f,
+    run: (f) => buildAnnualOverview((f as Fixture).filing, (f as Fixture).cols),
+  },
+  {
+    name: 'groupStatements',
+    prepare: (f) => f.cols,
+    run: (cols) => groupStatements(cols as LineItemColumns),
+  },
+  {
+    name: 'collapseInstantEndpoints (BS)',
+    prepare: (f) => balanceSheetRows(f.cols),
+    run: (rows) => collapseInstantEndpoints(rows as LineItemRow[]),
+  },
+];
+
+// Results are kept here so the work can't be optimized away.
+let sink: unknown;
+
+function measure(c: Case, inputs: unknown[]): { opsPerSec: number; bytesPerOp: number } {
+  // Warm up so the timed passes run optimized code.
+  for (let i = 0; i < Math.min(inputs.length, 200); i++) sink = c.run(inputs[i]);
+
+  const profiler = new GCProfiler();
+  const heapBefore = process.memoryUsage().heapUsed;
+  profiler.start();
+  const start = performance.now();
+  let ops = 0;
+  let elapsed = 0;
+  do {
+    for (const input of inputs) sink = c.run(input);
+    ops += inputs.length;
+    elapsed = performance.now() - start;
+  } while (elapsed < MIN_TIME_MS);
+  const heapAfter = process.memoryUsage().heapUsed;
+  const gcs = profiler.stop()?.statistics ?? [];
+
+  const reclaimed = gcs.reduce(
+    (n, gc) => n + gc.beforeGC.heapStatistics.usedHeapSize - gc.afterGC.heapStatistics.usedHeapSize,
+    0
+  );
+  return {
+    opsPerSec: (ops / elapsed) * 1000,
+    bytesPerOp: Math.max(0, heapAfter - heapBefore + reclaimed) / ops,
+  };
+}
+
+const fmt = (n: number) => Math.round(n).toLocaleString('en-US');
+
+const corpus = generateFilings(Math.max(...sizes), seed);
+const rows = corpus.reduce((n, f) => n + f.cols.length, 0);
+console.log(`corpus: ${corpus.length} filings, ${fmt(rows / corpus.length)} rows/filing (seed ${seed})\n`);
+console.log(`${'function'.padEnd(32)}${'filings'.padStart(8)}${'filings/s'.padStart(14)}${'B/filing'.padStart(12)}`);
+
+for (const c of CASES) {
+  for (const size of sizes) {
+    const inputs = corpus.slice(0, size).map(c.prepare);
+    const { opsPerSec, bytesPerOp } = measure(c, inputs);
+    console.log(
+      `${c.name.padEnd(32)}${String(size).padStart(8)}${fmt(opsPerSec).padStart(14)}${fmt(bytesPerOp).padStart(12)}`
+    );
+  }
+}
+void sink;
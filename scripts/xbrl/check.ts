@@ -0,0 +1,194 @@
+// Equivalence checks for the optimized paths in src/lib/xbrl.ts against the
+// baseline's behaviour, over a synthetic corpus:
+//
+//   buildAnnualOverview       against golden-overview.json, the baseline's
+//                             Overviews for a whole-amount corpus (where its
+//                             float sums are exact too); every field must
+//                             match exactly (Object.is, so NaN and -0 count)
+//   collapseInstantEndpoints  single pass vs. sort-based, per statement, on
+//                             warehouse-ordered rows and on shuffled rows; the
+//                             same row objects in the same order
+//   exact sums                a filing whose float sums would round, against
+//                             hand-computed totals
+//   value text                valueWriter on a table of boundary cases and on
+//                             random decimals, against Number() for the float
+//                             and BigInt for the int64 mantissa
+//
+//   npm run check:xbrl [-- <filings> <seed>]
+//
+// The golden Overviews have their own corpus (count and seed in the file); the
+// arguments size the collapse corpus. Exits non-zero and prints the first
+// mismatches on any difference.
+
+import { readFileSync } from 'node:fs';
+import { AnnualOverview, LineItemRow } from '../../src/lib/types';
+import {
+  INEXACT,
+  LineItemColumns,
+  allocColumns,
+  columnsFromRows,
+  rowAt,
+  stmtIndex,
+  valueWriter,
+} from '../../src/lib/line-columns';
+import { STATEMENT_CODES, buildAnnualOverview, collapseInstantEndpoints } from '../../src/lib/xbrl';
+import { generateFilings, rng } from './fixtures';
+import { referenceCollapseInstantEndpoints } from './reference-collapse';
+
+const count = Number(process.argv[2] ?? 20000);
+const seed = Number(process.argv[3] ?? 1);
+
+const fixtures = generateFilings(count, seed);
+const mismatches: string[] = [];
+let statements = 0;
+
+function statementRows(cols: LineItemColumns, stmt: number): LineItemRow[] {
+  const rows: LineItemRow[] = [];
+  for (let i = 0; i < cols.length; i++) if (cols.stmt[i] === stmt) rows.push(rowAt(cols, i));
+  return rows;
+}
+
+function checkCollapse(where: string, rows: LineItemRow[]) {
+  const expected = referenceCollapseInstantEndpoints(rows);
+  const actual = collapseInstantEndpoints(rows);
+  statements++;
+  if (actual.length !== expected.length || actual.some((r, i) => r !== expected[i])) {
+    mismatches.push(`${where}: collapseInstantEndpoints returned different rows`);
+  }
+}
+
+const shuffle = rng(seed ^ 0x5eed);
+
+// Captured from buildAnnualOverview at the baseline commit, one row of
+// `fields` per filing (null where it had no Overview). Numbers JSON can't
+// hold, such as -0, are strings.
+type Golden = {
+  count: number;
+  seed: number;
+  fields: (keyof AnnualOverview)[];
+  overviews: ((number | string | null)[] | null)[];
+};
+const golden: Golden = JSON.parse(readFileSync(new URL('./golden-overview.json', import.meta.url), 'utf8'));
+let nulls = 0;
+
+generateFilings(golden.count, golden.seed, { wholeAmounts: true }).forEach(({ filing, cols }, n) => {
+  const expected = golden.overviews[n];
+  const actual = buildAnnualOverview(filing, cols);
+  if (expected === null || actual === null) {
+    if (expected !== actual) mismatches.push(`${filing.adsh}: ${expected} vs ${actual}`);
+    else nulls++;
+    return;
+  }
+  golden.fields.forEach((key, k) => {
+    const v = expected[k];
+    const want = typeof v === 'string' ? Number(v) : v;
+    if (!Object.is(want, actual[key])) mismatches.push(`${filing.adsh} ${key}: expected ${want}, got ${actual[key]}`);
+  });
+  if (Object.keys(actual).length !== golden.fields.length) mismatches.push(`${filing.adsh}: fields differ`);
+});
+
+for (const { filing, cols } of fixtures) {
+  for (const code of STATEMENT_CODES) {
+    const rows = statementRows(cols, stmtIndex(code));
+    checkCollapse(`${filing.adsh} ${code}`, rows);
+    // Fisher-Yates, to exercise the unordered path too.
+    for (let i = rows.length - 1; i > 0; i--) {
+      const j = Math.floor(shuffle() * (i + 1));
+      [rows[i], rows[j]] = [rows[j], rows[i]];
+    }
+    checkCollapse(`${filing.adsh} ${code} (shuffled)`, rows);
+  }
+}
+
+// A capex total past 2^53 and fractional cash, where float sums round.
+{
+  const row = (stmt: string, line: number, tag: string, value: string, qtrs: number) => ({
+    stmt, line, plabel: null, tag, value, uom: 'USD', qtrs, ddate: '2024-03-31',
+  });
+  const cols = columnsFromRows([
+    row('BS', 1, 'CashAndCashEquivalentsAtCarryingValue', '0.1000', 0),
+    row('BS', 2, 'ShortTermInvestments', '0.2000', 0),
+    row('CF', 1, 'NetCashProvidedByUsedInOperatingActivities', '9007199254740994.0000', 4),
+    row('CF', 2, 'PaymentsToAcquirePropertyPlantAndEquipment', '9007199254740991.0000', 4),
+    row('CF', 3, 'PaymentsToAcquireProductiveAssets', '2.0000', 4),
+  ]);
+  const filing = { adsh: 'exact', form: '20-F', period: '2024-03-31', fy: 2024, fp: 'FY', filed: null };
+  const o = buildAnnualOverview(filing, cols);
+  // OCF - (capex a + capex b) = 1 exactly; in floats the capex total
+  // (2^53 + 1) rounds to 2^53 first.
+  if (o?.freeCashFlow !== 1) mismatches.push(`exact: freeCashFlow ${o?.freeCashFlow}, expected 1`);
+  if (o?.cashAndShortTermInvestments !== 0.3) {
+    mismatches.push(`exact: cashAndShortTermInvestments ${o?.cashAndShortTermInvestments}, expected 0.3`);
+  }
+}
+
+// Value text at every boundary of valueWriter's paths: the int32 and safe
+// integer words, the scale-4 limit, the 9-digit split of the whole part, the
+// 18-digit limit of the text path, int64 overflow (INEXACT) and text that is
+// not the warehouse's layout. The mantissa is compared at scale 4, since whole
+// amounts are stored at scale 0.
+const VALUE_CASES: (string | null)[] = [
+  null, '0.0000', '-0.0000', '0', '-0', '0.0001', '-0.0001', '1.0000', '-1.0000',
+  '2147483647.0000', '2147483648.0000', '-2147483648.0000', '-2147483649.0000',
+  '4294967295.0000', '4294967296.0000', '4294967297.0000', '-4294967296.0000',
+  '9007199254740991.0000', '9007199254740992.0000', '9007199254740993.0000',
+  '-9007199254740991.0000', '-9007199254740993.0000',
+  '900719925474.0000', '900719925474.0991', '900719925474.0992', '900719925475.0001',
+  '-900719925474.0991', '-900719925474.0992',
+  '999999999.9999', '1000000000.0000', '1000000000.0001', '-999999999.9999',
+  '999999999999999999.0000', '-999999999999999999.0000', '999999999999999999.0001',
+  '281474976710655999.0000', '281474976710656000.0000', '-281474976710656001.0000',
+  '1000000000000000000.0000', '-1000000000000000000.0000',
+  '9223372036854775807.0000', '-9223372036854775807.0000', '9223372036854775807',
+  '-9223372036854775808.0000', '9223372036854775808.0000', '922337203685477.5807',
+  '0.1', '12.50', '-7', '0.00001', '1.23456', '1.50000', '00012.0000', 'abc', '1.00a0',
+];
+
+// The exact value of decimal text `s` at scale 4, or INEXACT when it needs
+// more than 4 decimals or its mantissa at the smallest scale leaves int64.
+function expectedExact(s: string | null): bigint {
+  const match = s === null ? null : /^(-?)(\d+)(?:\.(\d+))?$/.exec(s);
+  if (!match) return INEXACT;
+  const fraction = (match[3] ?? '').replace(/0+$/, '');
+  if (fraction.length > 4) return INEXACT;
+  const minimal = BigInt(match[1] + match[2] + fraction);
+  if (minimal <= INEXACT || minimal > -(INEXACT + BigInt(1))) return INEXACT;
+  return BigInt(match[1] + match[2] + fraction.padEnd(4, '0'));
+}
+
+{
+  const random = rng(seed ^ 0xdec);
+  const texts = [...VALUE_CASES];
+  for (let n = 0; n < 20000; n++) {
+    let digits = String(1 + Math.floor(random() * 9));
+    const length = Math.floor(random() * 19);
+    for (let j = 0; j < length; j++) digits += Math.floor(random() * 10);
+    let fraction = '';
+    for (let j = 0; j < 4; j++) fraction += random() < 0.5 ? '0' : Math.floor(random() * 10);
+    texts.push(`${random() < 0.3 ? '-' : ''}${digits}.${fraction}`);
+  }
+  const cols = allocColumns(texts.length);
+  const write = valueWriter(cols);
+  texts.forEach((s, i) => write(i, s));
+  texts.forEach((s, i) => {
+    const value = s === null ? NaN : Number(s);
+    if (!Object.is(cols.value[i], value)) mismatches.push(`value ${s}: ${cols.value[i]}, expected ${value}`);
+    let exact = cols.exact[i];
+    for (let k = cols.scale[i]; exact !== INEXACT && k < 4; k++) exact *= BigInt(10);
+    const expected = expectedExact(s);
+    if (exact !== expected) mismatches.push(`value ${s}: exact ${exact}, expected ${expected}`);
+  });
+}
+
+const rows = fixtures.reduce((n, f) => n + f.cols.length, 0);
+console.log(`${fixtures.length} filings, ${rows} rows (seed ${seed})`);
+console.log(`${golden.count} golden filings (seed ${golden.seed}, ${nulls} without a fact year)`);
+if (mismatches.length) {
+  console.error(`${mismatches.length} mismatches:`);
+  for (const m of mismatches.slice(0, 20)) console.error(`  ${m}`);
+  process.exit(1);
+}
+console.log('buildAnnualOverview matches the golden Overviews');
+console.log(`collapseInstantEndpoints matches the reference (${statements} statements)`);
+console.log('exact sums are exact');
+console.log('value text parses exactly');
@@ -0,0 +1,320 @@
+// Deterministic synthetic `line_item` corpus for exercising src/lib/xbrl.ts
+// without the warehouse. Filings are 10-K, 20-F or 40-F; 10-K filers report
+// US-GAAP tags, foreign filers mostly IFRS ones, and a few mix both. Each
+// statement mixes the Overview's tags with unrelated ones and deliberately hits
+// the awkward cases: a tag repeated on several lines, null values, negative
+// equity, missing totals (so the derivation fallbacks run), instants at both
+// period endpoints and rows in statements or durations the Overview ignores.
+// The same seed always yields the same corpus.
+
+import { FilingMeta } from '../../src/lib/types';
+import {
+  LineItemColumns,
+  LineSourceRow,
+  StringTable,
+  columnsFromRows,
+  ddateString,
+} from '../../src/lib/line-columns';
+
+export type Fixture = { filing: FilingMeta; rows: LineSourceRow[]; cols: LineItemColumns };
+
+// mulberry32: small, fast and good enough to shuffle fixtures.
+export function rng(seed: number): () => number {
+  let a = seed >>> 0;
+  return () => {
+    a = (a + 0x6d2b79f5) >>> 0;
+    let t = a;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+// The tags the Overview reads, by the statement that carries them.
+const INCOME_TAGS = [
+  'RevenueFromContractWithCustomerExcludingAssessedTax',
+  'RevenueFromContractWithCustomerIncludingAssessedTax',
+  'Revenues',
+  'RevenuesNetOfInterestExpense',
+  'SalesRevenueNet',
+  'SalesRevenueServicesNet',
+  'RegulatedAndUnregulatedOperatingRevenue',
+  'RegulatedOperatingRevenue',
+  'Revenue',
+  'RevenueFromContractsWithCustomers',
+  'NetIncomeLoss',
+  'ProfitLoss',
+  'NetIncomeLossAvailableToCommonStockholdersBasic',
+  'ProfitLossAttributableToOwnersOfParent',
+  'EarningsPerShareBasic',
+  'EarningsPerShareBasicAndDiluted',
+  'EarningsPerShareDiluted',
+  'IncomeLossFromContinuingOperationsPerBasicShare',
+  'BasicEarningsLossPerShare',
+  'BasicEarningsLossPerShareFromContinuingOperations',
+  'IncomeTaxExpenseBenefit',
+  'CurrentIncomeTaxExpenseBenefit',
+  'IncomeTaxExpenseContinuingOperations',
+  'IncomeLossFromContinuingOperationsBeforeIncomeTaxesMinorityInterestAndIncomeLossFromEquityMethodInvestments',
+  'IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest',
+  'IncomeLossFromContinuingOperationsBeforeIncomeTaxesDomestic',
+  'IncomeLossFromContinuingOperationsBeforeIncomeTaxes',
+  'ProfitLossBeforeTax',
+  'OperatingExpenses',
+  'CostsAndExpenses',
+  'OperatingCostsAndExpenses',
+  'NoninterestExpense',
+  'MarketingAdministrationAndResearchCosts',
+  'OtherCostOfOperatingRevenue',
+  'OperatingExpense',
+  'SellingGeneralAndAdministrativeExpense',
+  'SellingAndMarketingExpense',
+  'GeneralAndAdministrativeExpense',
+  'MarketingAndAdvertisingExpense',
+  'ResearchAndDevelopmentExpense',
+  'ResearchAndDevelopmentExpenseExcludingAcquiredInProcessCost',
+  'RestructuringCharges',
+  'RestructuringSettlementAndImpairmentProvisions',
+  'AmortizationOfIntangibleAssets',
+  'OtherOperatingIncomeExpenseNet',
+  'OtherCostAndExpenseOperating',
+  'CommonStockSharesOutstanding',
+  'WeightedAverageNumberOfSharesOutstandingBasic',
+  'WeightedAverageNumberOfDilutedSharesOutstanding',
+  'NumberOfSharesOutstanding',
+  'WeightedAverageShares',
+  'AdjustedWeightedAverageShares',
+  'CommonStockSharesIssued',
+  'NumberOfSharesIssued',
+];
+const BALANCE_TAGS = [
+  'Assets',
+  'Liabilities',
+  'StockholdersEquity',
+  'StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest',
+  'Equity',
+  'EquityAttributableToOwnersOfParent',
+  'StockholdersEquityBeforeTreasuryStock',
+  'PreferredStockValue',
+  'CashAndCashEquivalentsAtCarryingValue',
+  'CashAndCashEquivalents',
+  'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents',
+  'CashCashEquivalentsAndShortTermInvestments',
+  'Cash',
+  'ShortTermInvestments',
+  'OtherShortTermInvestments',
+  'MarketableSecuritiesCurrent',
+  'AvailableForSaleSecuritiesCurrent',
+  'AvailableForSaleSecuritiesDebtSecuritiesCurrent',
+  'TradingSecuritiesCurrent',
+  'DebtSecuritiesAvailableForSaleCurrent',
+  'EquitySecuritiesFvNi',
+  'MarketableSecurities',
+  'CommonStockSharesOutstanding',
+  'WeightedAverageNumberOfSharesOutstandingBasic',
+  'WeightedAverageNumberOfDilutedSharesOutstanding',
+  'NumberOfSharesOutstanding',
+  'WeightedAverageShares',
+  'AdjustedWeightedAverageShares',
+  'CommonStockSharesIssued',
+  'NumberOfSharesIssued',
+  'TreasuryStockCommonShares',
+  'TreasuryStockShares',
+];
+const EQUITY_STMT_TAGS = [
+  'StockholdersEquity',
+  'StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest',
+  'Equity',
+  'EquityAttributableToOwnersOfParent',
+  'StockholdersEquityBeforeTreasuryStock',
+];
+const CASH_FLOW_TAGS = [
+  'NetCashProvidedByUsedInOperatingActivities',
+  'NetCashProvidedByUsedInOperatingActivitiesContinuingOperations',
+  'CashFlowsFromUsedInOperatingActivities',
+  'NetCashProvidedByUsedInInvestingActivities',
+  'NetCashProvidedByUsedInInvestingActivitiesContinuingOperations',
+  'CashFlowsFromUsedInInvestingActivities',
+  'NetCashProvidedByUsedInFinancingActivities',
+  'NetCashProvidedByUsedInFinancingActivitiesContinuingOperations',
+  'CashFlowsFromUsedInFinancingActivities',
+  'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsPeriodIncreaseDecreaseIncludingExchangeRateEffect',
+  'CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalentsPeriodIncreaseDecreaseExcludingExchangeRateEffect',
+  'CashAndCashEquivalentsPeriodIncreaseDecrease',
+  'IncreaseDecreaseInCashAndCashEquivalents',
+  'IncreaseDecreaseInCashAndCashEquivalentsBeforeEffectOfExchangeRateChanges',
+  'PaymentsToAcquirePropertyPlantAndEquipment',
+  'PaymentsToAcquireProductiveAssets',
+  'PaymentsForCapitalImprovements',
+  'PaymentsToAcquireOtherPropertyPlantAndEquipment',
+  'PaymentsToAcquireMachineryAndEquipment',
+  'PaymentsToAcquireBuildings',
+  'PurchaseOfPropertyPlantAndEquipmentClassifiedAsInvestingActivities',
+  'PurchaseOfIntangibleAssetsClassifiedAsInvestingActivities',
+  'PurchaseOfPropertyPlantAndEquipmentIntangibleAssetsOtherThanGoodwillInvestmentPropertyAndOtherNoncurrentAssets',
+  'PurchaseOfOtherLongtermAssetsClassifiedAsInvestingActivities',
+  'ProceedsFromSaleOfPropertyPlantAndEquipment',
+  'ProceedsFromSaleOfProductiveAssets',
+  'ProceedsFromDisposalOfPropertyPlantAndEquipment',
+  'ProceedsFromSalesOfPropertyPlantAndEquipmentClassifiedAsInvestingActivities',
+];
+// Tags no Overview metric reads.
+const OTHER_TAGS = [
+  'AccountsPayableCurrent',
+  'AccumulatedOtherComprehensiveIncomeLossNetOfTax',
+  'DeferredRevenueCurrent',
+  'Goodwill',
+  'InterestExpense',
+  'InventoryNet',
+  'LongTermDebtNoncurrent',
+  'PropertyPlantAndEquipmentNet',
+  'RetainedEarningsAccumulatedDeficit',
+  'ShareBasedCompensation',
+];
+
+// The `ifrs-full` entries of the Overview's tag lists, plus the few tags both
+// taxonomies share.
+const IFRS_TAGS = new Set([
+  'Revenue',
+  'RevenueFromContractsWithCustomers',
+  'ProfitLossAttributableToOwnersOfParent',
+  'BasicEarningsLossPerShare',
+  'BasicEarningsLossPerShareFromContinuingOperations',
+  'IncomeTaxExpenseContinuingOperations',
+  'ProfitLossBeforeTax',
+  'OperatingExpense',
+  'Equity',
+  'EquityAttributableToOwnersOfParent',
+  'NumberOfSharesOutstanding',
+  'NumberOfSharesIssued',
+  'WeightedAverageShares',
+  'AdjustedWeightedAverageShares',
+  'CashAndCashEquivalents',
+  'CashFlowsFromUsedInOperatingActivities',
+  'CashFlowsFromUsedInInvestingActivities',
+  'CashFlowsFromUsedInFinancingActivities',
+  'IncreaseDecreaseInCashAndCashEquivalents',
+  'IncreaseDecreaseInCashAndCashEquivalentsBeforeEffectOfExchangeRateChanges',
+  'PurchaseOfPropertyPlantAndEquipmentClassifiedAsInvestingActivities',
+  'PurchaseOfIntangibleAssetsClassifiedAsInvestingActivities',
+  'PurchaseOfPropertyPlantAndEquipmentIntangibleAssetsOtherThanGoodwillInvestmentPropertyAndOtherNoncurrentAssets',
+  'PurchaseOfOtherLongtermAssetsClassifiedAsInvestingActivities',
+  'ProceedsFromSalesOfPropertyPlantAndEquipmentClassifiedAsInvestingActivities',
+]);
+const SHARED_TAGS = new Set(['Assets', 'Liabilities', 'Cash', 'ProfitLoss']);
+
+type Taxonomy = 'gaap' | 'ifrs' | 'mixed';
+
+function byTaxonomy(tags: string[]): Record<Taxonomy, string[]> {
+  return {
+    gaap: tags.filter((t) => !IFRS_TAGS.has(t)),
+    ifrs: tags.filter((t) => IFRS_TAGS.has(t) || SHARED_TAGS.has(t)),
+    mixed: tags,
+  };
+}
+
+const STATEMENTS: { stmt: string; tags: Record<Taxonomy, string[]>; qtrs: number }[] = [
+  { stmt: 'IS', tags: byTaxonomy(INCOME_TAGS), qtrs: 4 },
+  { stmt: 'BS', tags: byTaxonomy(BALANCE_TAGS), qtrs: 0 },
+  { stmt: 'EQ', tags: byTaxonomy(EQUITY_STMT_TAGS), qtrs: 0 },
+  { stmt: 'CF', tags: byTaxonomy(CASH_FLOW_TAGS), qtrs: 4 },
+];
+
+function taxonomyFor(form: string, r: number): Taxonomy {
+  if (r < 0.05) return 'mixed';
+  if (form === '10-K') return 'gaap';
+  if (form === '20-F') return r < 0.75 ? 'ifrs' : 'gaap';
+  return r < 0.5 ? 'ifrs' : 'gaap'; // 40-F: MJDS filers report under either
+}
+
+function generateFiling(
+  next: () => number,
+  n: number,
+  table: StringTable,
+  wholeAmounts: boolean
+): Fixture {
+  const pickOf = <V>(xs: V[]): V => xs[Math.floor(next() * xs.length)];
+  const form = next() < 0.8 ? '10-K' : pickOf(['20-F', '40-F']);
+  const taxonomy = taxonomyFor(form, next());
+  const year = 2009 + Math.floor(next() * 16);
+  const yearEnd = year * 10000 + pickOf([331, 630, 930, 1231]);
+  // numeric(28,4) as the warehouse sends it: text with four decimals. Mostly
+  // whole amounts up to the trillions; a few past 2^53, as in large JPY or
+  // KRW filings, where only the exact column keeps every digit. With
+  // `wholeAmounts`, only the trillions, where float sums are exact too.
+  const value = (): string | null => {
+    const r = next();
+    if (r < 0.05) return null;
+    if (r < 0.08) return '0.0000';
+    const digits = next() < 0.03 && !wholeAmounts ? 16 + Math.floor(next() * 3) : 1 + Math.floor(next() * 12);
+    let int = String(1 + Math.floor(next() * 9));
+    for (let k = 1; k < digits; k++) int += Math.floor(next() * 10);
+    const fraction =
+      next() < 0.1 && !wholeAmounts ? String(Math.floor(next() * 10000)).padStart(4, '0') : '0000';
+    return `${next() < 0.2 ? '-' : ''}${int}.${fraction}`;
+  };
+
+  const rows: LineSourceRow[] = [];
+  let line = 1;
+  for (const s of STATEMENTS) {
+    // Sparse or dense: sometimes a statement carries almost none of the
+    // Overview's tags, which drives the fallbacks.
+    const count = Math.floor(next() * (next() < 0.2 ? 4 : 70));
+    for (let k = 0; k < count; k++) {
+      const tag = next() < 0.25 ? pickOf(OTHER_TAGS) : pickOf(s.tags[taxonomy]);
+      // Mostly the slice the Overview reads, sometimes a quarter or an instant.
+      const qtrs = next() < 0.85 ? s.qtrs : pickOf([0, 1, 4]);
+      const plabel = next() < 0.1 ? `${tag}, beginning of period` : next() < 0.7 ? tag : null;
+      const row = (ordinal: number): LineSourceRow => ({
+        stmt: s.stmt,
+        line,
+        plabel,
+        tag,
+        value: value(),
+        uom: next() < 0.1 ? 'shares' : 'USD',
+        qtrs,
+        ddate: ddateString(ordinal),
+      });
+      rows.push(row(yearEnd));
+      // Prior-year comparatives: two for durations, one for instants. Instants
+      // on the EQ/CF are also repeated at the period's beginning.
+      if (next() < 0.8) rows.push(row(yearEnd - 10000));
+      if (qtrs !== 0 && next() < 0.7) rows.push(row(yearEnd - 20000));
+      if (qtrs === 0 && s.stmt !== 'BS' && next() < 0.6) rows.push(row(yearEnd - 10000));
+      // Now and then the next tag shares this line under another label.
+      if (next() >= 0.1) line++;
+    }
+  }
+  // Statements the Overview never reads.
+  if (next() < 0.2) {
+    rows.push({
+      stmt: 'CI', line, plabel: null, tag: pickOf(OTHER_TAGS), value: value(), uom: 'USD',
+      qtrs: 4, ddate: ddateString(yearEnd),
+    });
+  }
+  // Warehouse order: line, then ddate.
+  rows.sort((a, b) => Number(a.line) - Number(b.line) || a.ddate.localeCompare(b.ddate));
+
+  const filing: FilingMeta = {
+    adsh: `0000000000-${String(year % 100).padStart(2, '0')}-${String(n).padStart(6, '0')}`,
+    form,
+    period: ddateString(yearEnd),
+    fy: year,
+    fp: 'FY',
+    filed: `${year + 1}-02-15`,
+  };
+  return { filing, rows, cols: columnsFromRows(rows, table) };
+}
+
+/**
+ * `count` synthetic annual filings sharing one StringTable. `wholeAmounts`
+ * keeps every value a whole amount below 10^12, so no sum depends on exact
+ * arithmetic.
+ */
+export function generateFilings(count: number, seed = 1, { wholeAmounts = false } = {}): Fixture[] {
+  const next = rng(seed);
+  const table = new StringTable();
+  const out: Fixture[] = [];
+  for (let n = 0; n < count; n++) out.push(generateFiling(next, n, table, wholeAmounts));
+  return out;
+}
@@ -0,0 +1,34 @@
+// Frozen copy of the sort-based `collapseInstantEndpoints` from
+// src/lib/xbrl.ts, kept as the oracle for check.ts. The app's version collapses
+// line-ordered input in a single pass; its output must stay identical to this,
+// down to which row objects are returned and in what order.
+
+import { LineItemRow } from '../../src/lib/types';
+
+export function referenceCollapseInstantEndpoints(rows: LineItemRow[]): LineItemRow[] {
+  const groups = new Map<string, LineItemRow[]>();
+  const result: LineItemRow[] = [];
+
+  for (const r of rows) {
+    if (r.qtrs !== 0) {
+      result.push(r);
+      continue;
+    }
+    const key = `${r.line}|${r.plabel ?? r.tag}`;
+    const g = groups.get(key);
+    if (g) g.push(r);
+    else groups.set(key, [r]);
+  }
+
+  for (const group of groups.values()) {
+    if (group.length === 1) {
+      result.push(group[0]);
+      continue;
+    }
+    const sorted = [...group].sort((a, b) => a.ddate.localeCompare(b.ddate));
+    const isBeginning = (sorted[0].plabel ?? '').toLowerCase().includes('begin');
+    result.push(isBeginning ? sorted[0] : sorted[sorted.length - 1]);
+  }
+
+  return result.sort((a, b) => a.line - b.line || a.ddate.localeCompare(b.ddate));
+}
@@ -5,7 +5,7 @@ import dynamic from 'next/dynamic';
 import { useSearchParams } from 'next/navigation';
 import { getAnnualOverview, getCompanyName } from '@/lib/warehouse';
 import { AnnualOverview } from '@/lib/types';
-import { tickerToCik, cikToTicker, loadTickerData } from '@/lib/tickers';
+import { resolveTicker, cikToTicker, loadTickerData } from '@/lib/tickers';
 import { formatCompanyName } from '@/lib/company-name';
 import { Spinner } from '@/components/spinner';
 import { ErrorState } from '@/components/error-state';
@@ -25,9 +25,9 @@ const StatementsView = dynamic(() => import('./statements-view'), {
 
 // Resolve a ?ticker= value to a CIK: try the SEC ticker map first, then fall
 // back to treating the value itself as a raw CIK.
-const resolveCik = (raw: string | null): number | null => {
+const resolveCik = async (raw: string | null): Promise<number | null> => {
   if (!raw) return null;
-  const fromTicker = tickerToCik(raw);
+  const fromTicker = await resolveTicker(raw).catch(() => null);
   if (fromTicker != null) return fromTicker;
   const asNum = parseInt(raw, 10);
   return isNaN(asNum) ? null : asNum;
@@ -37,30 +37,36 @@ function Dashboard() {
   const searchParams = useSearchParams();
   const tickerParam = searchParams.get('ticker');
 
-  // The ticker->CIK map loads lazily (see tickers.ts). Always start "not ready"
-  // so the server's first render and the client's first render agree: the map is
-  // a module singleton that can be warm on the server but is always cold on a
+  // ticker->CIK comes from a small per-letter shard (see tickers.ts), so the
+  // Overview query starts after one tiny fetch; the full ticker index (names,
+  // exchanges, casing) follows for display. Both start "not ready" so the
+  // server's first render and the client's first render agree: the data is a
+  // module singleton that can be warm on the server but is always cold on a
   // fresh client, so reading it during render would cause a hydration mismatch.
-  // The client-only effect flips it on, then we resolve the ticker.
+  const [resolved, setResolved] = useState<{ param: string | null; cik: number | null } | null>(null);
   const [tickerReady, setTickerReady] = useState(false);
   useEffect(() => {
     let cancelled = false;
-    loadTickerData()
-      .then(() => { if (!cancelled) setTickerReady(true); })
-      .catch(() => { if (!cancelled) setTickerReady(true); });
+    // Keep the full index off the wire until the CIK is known, so it doesn't
+    // compete with the shard.
+    void resolveCik(tickerParam).then((cik) => {
+      if (cancelled) return;
+      setResolved({ param: tickerParam, cik });
+      loadTickerData()
+        .then(() => { if (!cancelled) setTickerReady(true); })
+        .catch(() => { if (!cancelled) setTickerReady(true); });
+    });
     return () => { cancelled = true; };
-  }, []);
+  }, [tickerParam]);
 
-  // Resolve only once the map is ready so all derived display values (exchange,
-  // company name, tabs) are identical on the first server/client paint.
-  const cik = tickerReady ? resolveCik(tickerParam) : null;
-  const resolving = tickerParam != null && cik == null && !tickerReady;
+  const cik = resolved?.param === tickerParam ? resolved.cik : null;
+  const resolving = tickerParam != null && resolved?.param !== tickerParam;
 
   const [overview, setOverview] = useState<AnnualOverview[]>([]);
   const [selectedYear, setSelectedYear] = useState<number | null>(null);
   // Start in the loading state when there's a company in the URL to fetch, so
   // the first paint shows the spinner instead of a flash of "No data available"
-  // (covers the window while the ticker map is still resolving the CIK).
+  // (covers the window while the ticker shard is still resolving the CIK).
   const [loading, setLoading] = useState(tickerParam != null);
   const [error, setError] = useState(false);
   const [reloadKey, setReloadKey] = useState(0);
@@ -77,24 +83,24 @@ function Dashboard() {
       setError(false);
       return;
     }
-    let cancelled = false;
+    const controller = new AbortController();
     setLoading(true);
     setError(false);
     (async () => {
       try {
-        const rows = await getAnnualOverview(cik);
-        if (!cancelled) setOverview(rows);
+        const rows = await getAnnualOverview(cik, controller.signal);
+        if (!controller.signal.aborted) setOverview(rows);
       } catch (err) {
-        if (!cancelled) {
+        if (!controller.signal.aborted) {
           console.error('Failed to fetch overview:', err);
           setOverview([]);
           setError(true);
         }
       } finally {
-        if (!cancelled) setLoading(false);
+        if (!controller.signal.aborted) setLoading(false);
       }
     })();
-    return () => { cancelled = true; };
+    return () => controller.abort();
   }, [cik, reloadKey, resolving]);
 
   useEffect(() => {
@@ -116,19 +122,19 @@ function Dashboard() {
       setWarehouseName(null);
       return;
     }
-    let cancelled = false;
+    const controller = new AbortController();
     (async () => {
       try {
-        const name = await getCompanyName(cik);
-        if (!cancelled) setWarehouseName(name);
+        const name = await getCompanyName(cik, controller.signal);
+        if (!controller.signal.aborted) setWarehouseName(name);
       } catch (err) {
-        if (!cancelled) {
+        if (!controller.signal.aborted) {
           console.error('Failed to fetch company name:', err);
           setWarehouseName(null);
         }
       }
     })();
-    return () => { cancelled = true; };
+    return () => controller.abort();
   }, [cik, reloadKey]);
 
   const info = cik != null ? cikToTicker(cik) : null;
@@ -107,7 +107,7 @@ export default function StatementsView({ cik }: { cik: number }) {
   const [reloadKey, setReloadKey] = useState(0);
 
   useEffect(() => {
-    let cancelled = false;
+    const controller = new AbortController();
     setError(false);
     // Cache hit: resolve synchronously, no spinner, no round trip. Seed the
     // statements from cache too so we never flash the previous company's
@@ -131,22 +131,22 @@ export default function StatementsView({ cik }: { cik: number }) {
     setLoading(true);
     (async () => {
       try {
-        const list = await getFilings(cik);
-        if (cancelled) return;
+        const list = await getFilings(cik, controller.signal);
+        if (controller.signal.aborted) return;
         setFilings(list);
         setSelectedAdsh(defaultAdsh(list));
       } catch (err) {
-        if (!cancelled) {
+        if (!controller.signal.aborted) {
           console.error('Failed to fetch filings:', err);
           setFilings([]);
           setSelectedAdsh('');
           setError(true);
         }
       } finally {
-        if (!cancelled) setFilingsLoaded(true);
+        if (!controller.signal.aborted) setFilingsLoaded(true);
       }
     })();
-    return () => { cancelled = true; };
+    return () => controller.abort();
   }, [cik, reloadKey]);
 
   useEffect(() => {
@@ -154,7 +154,7 @@ export default function StatementsView({ cik }: { cik: number }) {
       setStatements(null);
       return;
     }
-    let cancelled = false;
+    const controller = new AbortController();
     // Cache hit (e.g. annual filings the Overview already loaded): render
     // instantly without flipping into the loading state.
     const cached = peekStatements(selectedAdsh);
@@ -166,19 +166,19 @@ export default function StatementsView({ cik }: { cik: number }) {
     setLoading(true);
     (async () => {
       try {
-        const s = await getStatements(selectedAdsh);
-        if (!cancelled) setStatements(s);
+        const s = await getStatements(selectedAdsh, controller.signal);
+        if (!controller.signal.aborted) setStatements(s);
       } catch (err) {
-        if (!cancelled) {
+        if (!controller.signal.aborted) {
           console.error('Failed to fetch statements:', err);
           setStatements(null);
           setError(true);
         }
       } finally {
-        if (!cancelled) setLoading(false);
+        if (!controller.signal.aborted) setLoading(false);
       }
     })();
-    return () => { cancelled = true; };
+    return () => controller.abort();
   }, [selectedAdsh, reloadKey]);
 
   const periodEnd = useMemo(
@@ -0,0 +1,24 @@
+import { buildOverviewBundle, listWarehouseCiks } from '@/lib/warehouse';
+
+// Build-time Overview bundles. Under `output: 'export'` Next runs this handler
+// once per CIK during `next build` and writes the response to
+// `out/data/overview/<cik>.json`, which Cloudflare then serves as a plain static
+// asset. `getAnnualOverview` reads the bundle first and only falls back to the
+// warehouse on a miss (e.g. a company ingested after the last deploy).
+export const dynamic = 'force-static';
+export const dynamicParams = false;
+
+export async function generateStaticParams(): Promise<{ file: string }[]> {
+  const ciks = await listWarehouseCiks();
+  return ciks.map((cik) => ({ file: `${cik}.json` }));
+}
+
+export async function GET(
+  _request: Request,
+  { params }: { params: Promise<{ file: string }> }
+): Promise<Response> {
+  const { file } = await params;
+  const cik = parseInt(file, 10);
+  if (Number.isNaN(cik)) return new Response(null, { status: 404 });
+  return Response.json(await buildOverviewBundle(cik));
+}
@@ -0,0 +1,16 @@
+import tickerFile from '@/lib/data/company_tickers_exchange.json';
+import { TickerRow, encodeTickerIndex, gzipTickerIndex } from '@/lib/ticker-index';
+
+// Build-time ticker index. Under `output: 'export'` Next runs this handler once
+// during `next build` and writes the response to `out/data/tickers.bin`, which
+// `loadTickerData` fetches as a single ArrayBuffer. The SEC JSON itself never
+// reaches the client. The file is written gzipped and inflated by the client,
+// since hosts serve .bin as-is.
+export const dynamic = 'force-static';
+
+export async function GET(): Promise<Response> {
+  const rows = (tickerFile as unknown as { data: TickerRow[] }).data;
+  return new Response(await gzipTickerIndex(encodeTickerIndex(rows)), {
+    headers: { 'Content-Type': 'application/octet-stream' },
+  });
+}
@@ -0,0 +1,26 @@
+import tickerFile from '@/lib/data/company_tickers_exchange.json';
+import { TICKER_SHARD_KEYS, TickerRow, encodeTickerShard } from '@/lib/ticker-index';
+
+// Build-time ticker -> CIK shards, one per first letter, written to
+// `out/data/tickers/<key>.bin`. `resolveTicker` fetches the one a ?ticker= URL
+// needs, so the dashboard can start its Overview query before the full index
+// (tickers.bin) arrives.
+export const dynamic = 'force-static';
+export const dynamicParams = false;
+
+export function generateStaticParams(): { file: string }[] {
+  return TICKER_SHARD_KEYS.map((key) => ({ file: `${key}.bin` }));
+}
+
+export async function GET(
+  _request: Request,
+  { params }: { params: Promise<{ file: string }> }
+): Promise<Response> {
+  const { file } = await params;
+  const key = file.replace(/\.bin$/, '');
+  if (!TICKER_SHARD_KEYS.includes(key)) return new Response(null, { status: 404 });
+  const rows = (tickerFile as unknown as { data: TickerRow[] }).data;
+  return new Response(encodeTickerShard(rows, key), {
+    headers: { 'Content-Type': 'application/octet-stream' },
+  });
+}
@@ -20,15 +20,19 @@ const MENU_ITEMS = [
 
 
 export function Navbar() {
-  const [tickers, setTickers] = useState<StockItem[]>([]);
+  const [companies, setCompanies] = useState<StockItem[]>([]);
   const [loadError, setLoadError] = useState(false);
   useEffect(() => {
     let cancelled = false;
 
     (async () => {
       try {
-        const list = await getCompanies();
-        if (!cancelled) setTickers(list);
+        // A stale cached list comes back immediately; the refreshed one swaps
+        // in when it lands.
+        const list = await getCompanies((fresh) => {
+          if (!cancelled) setCompanies(fresh);
+        });
+        if (!cancelled) setCompanies(list);
       } catch (err) {
         if (!cancelled) {
           console.error('Failed to load companies:', err);
@@ -75,7 +79,7 @@ export function Navbar() {
         <div className="hidden justify-center md:flex md:w-1/3">
         </div>
         <div className="flex justify-end md:w-1/3" />
-        <StockSearch allTickers={tickers} onSelect={() => {}} navigateToDashboard loadError={loadError} />
+        <StockSearch companies={companies} onSelect={() => {}} navigateToDashboard loadError={loadError} />
       </div>
     </nav>
   );
@@ -10,6 +10,8 @@ interface Props {
   filtered: StockItem[];
   onClose: () => void;
   onSelect: (ticker: string) => void;
+  // Called when a result is touched or focused, before it is picked.
+  onPrefetch: (item: StockItem) => void;
   handleKeyDown: (e: React.KeyboardEvent<HTMLInputElement>) => void;
   formatCompanyName: (name: string) => string;
 }
@@ -20,6 +22,7 @@ export default function MobileSearchModal({
   filtered,
   onClose,
   onSelect,
+  onPrefetch,
   handleKeyDown,
   formatCompanyName,
 }: Props) {
@@ -49,13 +52,18 @@ export default function MobileSearchModal({
       </div>
       {filtered.length > 0 && (
         <ul className="mt-4 w-full rounded-md bg-white shadow-md dark:bg-neutral-900">
-          {filtered.slice(0, 8).map(({ ticker, companyName }) => (
+          {filtered.slice(0, 8).map((item) => (
             <li
-              key={ticker}
+              key={item.ticker}
+              tabIndex={0}
               className="cursor-pointer px-4 py-2 hover:bg-neutral-100 dark:hover:bg-neutral-800"
-              onClick={() => onSelect(ticker)}
+              onClick={() => onSelect(item.ticker)}
+              onKeyDown={(e) => e.key === 'Enter' && onSelect(item.ticker)}
+              onTouchStart={() => onPrefetch(item)}
+              onMouseEnter={() => onPrefetch(item)}
+              onFocus={() => onPrefetch(item)}
             >
-              <span className="font-semibold">{ticker}</span> — {formatCompanyName(companyName)}
+              <span className="font-semibold">{item.ticker}</span> — {formatCompanyName(item.companyName)}
             </li>
           ))}
         </ul>
@@ -1,20 +1,49 @@
 'use client';
 
-import { useState, useEffect, useMemo } from 'react';
-import Fuse from 'fuse.js';
+import { useState, useEffect } from 'react';
 import { StockItem } from '@/lib/types';
+import { loadCompanySearch, searchCompanies } from '@/lib/company-search-client';
 import { formatCompanyName } from '@/lib/company-name';
+import { tickerToCik } from '@/lib/tickers';
+import { prefetchOverview } from '@/lib/warehouse';
 import { useRouter } from 'next/navigation';
 import { MagnifyingGlassIcon } from '@heroicons/react/24/outline';
 import MobileSearchModal from '../mobile-search-modal';
 
+// The dashboard's chart chunk (same module, so the same chunk); fetching it
+// here overlaps its download with the user still typing.
+const importOverviewCharts = () => import('@/app/dashboard/overview-charts');
+
+// How long the top hit has to stay put before it's worth prefetching.
+const PREFETCH_DEBOUNCE_MS = 250;
+
+// Results kept per query: the most either dropdown shows.
+const MAX_RESULTS = 8;
+
+let prefetched: { cik: number; controller: AbortController } | null = null;
+
+// Speculatively load a search result's Overview at low priority, so that by the
+// time the dashboard mounts for it the data is usually already in cache. Runs
+// for the settled top hit and for any result hovered, focused or touched.
+function prefetchResult(item: StockItem) {
+  const cik = item.cik ?? tickerToCik(item.ticker);
+  if (cik == null || prefetched?.cik === cik) return;
+  // A different company is now the likelier pick: drop the previous warm-up
+  // (a no-op for the data if the dashboard already joined it).
+  prefetched?.controller.abort();
+  const controller = new AbortController();
+  prefetched = { cik, controller };
+  prefetchOverview(cik, controller.signal);
+  void importOverviewCharts().catch(() => {});
+}
+
 export default function StockSearch({
-  allTickers,
+  companies,
   onSelect,
   navigateToDashboard = false,
   loadError = false
 }: {
-  allTickers: StockItem[];
+  companies: StockItem[];
   onSelect: (ticker: string) => void;
   navigateToDashboard?: boolean;
   loadError?: boolean;
@@ -24,23 +53,34 @@ export default function StockSearch({
   const [searchOpen, setSearchOpen] = useState(false);
   const router = useRouter();
 
-  const fuse = useMemo(() => {
-    return new Fuse(allTickers, {
-        keys: ['ticker', 'companyName', 'listedExchange'],
-        threshold: 0.4, 
-        ignoreLocation: true
-    });
-    }, [allTickers]);
+  // The list and its index live in the search worker; hand each new list over
+  // before anyone types.
+  useEffect(() => {
+    if (companies.length > 0) loadCompanySearch(companies);
+  }, [companies]);
 
   useEffect(() => {
-    if (search.trim() === '') {
+    const query = search.trim();
+    if (query === '') {
         setFiltered([]);
         return;
     }
+    // null: a later keystroke's query superseded this one.
+    let cancelled = false;
+    void searchCompanies(companies, query, MAX_RESULTS).then((items) => {
+      if (items && !cancelled) setFiltered(items);
+    });
+    return () => { cancelled = true; };
+  }, [search, companies]);
 
-    const results = fuse.search(search.trim());
-    setFiltered(results.map(r => r.item));
-  }, [search, fuse]);
+  // Prefetch the top hit once it stops changing. Not cancelled when the list
+  // clears: that is also what selecting a result does.
+  const topHit = filtered[0];
+  useEffect(() => {
+    if (!topHit) return;
+    const timer = setTimeout(() => prefetchResult(topHit), PREFETCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [topHit]);
 
     function handleSelect(ticker: string) {
         if (navigateToDashboard) {
@@ -83,6 +123,7 @@ export default function StockSearch({
             filtered={filtered}
             onClose={() => setSearchOpen(false)}
             onSelect={handleSelect}
+            onPrefetch={prefetchResult}
             handleKeyDown={handleKeyDown}
             formatCompanyName={formatCompanyName}
         />
@@ -114,18 +155,25 @@ export default function StockSearch({
 
         {filtered.length > 0 && (
             <ul className="absolute z-10 mt-1 w-full rounded-md bg-white shadow-md dark:bg-neutral-900">
-            {filtered.slice(0, 5).map(({ ticker, companyName, listedExchange },) => (
+            {filtered.slice(0, 5).map((item) => {
+                const { ticker, companyName, listedExchange } = item;
+                return (
                 <li
                 key={ticker}
+                tabIndex={0}
                 className="cursor-pointer px-4 py-2 hover:bg-neutral-100 dark:hover:bg-neutral-800"
                 onClick={() => handleSelect(ticker)}
+                onKeyDown={(e) => e.key === 'Enter' && handleSelect(ticker)}
+                onMouseEnter={() => prefetchResult(item)}
+                onFocus={() => prefetchResult(item)}
                 >
                 <div className="flex flex-col">
                     <span className="font-medium">{formatCompanyName(companyName)}</span>
                     <span className="text-sm text-gray-400">{ticker} - {listedExchange}</span>
                 </div>
                 </li>
-            ))}
+                );
+            })}
             </ul>
         )}
         </div>
@@ -0,0 +1,95 @@
+import { CompanySearch, createCompanySearch } from './company-search';
+import { StockItem } from './types';
+import type { SearchRequest, SearchResponse } from './company-search.worker';
+
+// Company search off the main thread. The search list and its index live in
+// `./company-search.worker`, which receives the items once per list (it builds
+// or revives the index itself) and then only queries. Every query carries an
+// increasing id, and an answer is only used if no later query was made since,
+// so results from an earlier keystroke can never replace a later one's.
+// Elsewhere (SSR), after a worker failure and when the worker couldn't answer,
+// queries run inline.
+
+type PendingSearch = {
+  items: StockItem[];
+  query: string;
+  limit: number;
+  resolve: (items: StockItem[] | null) => void;
+};
+
+let worker: Worker | null | undefined;
+// The list the worker currently holds.
+let workerItems: StockItem[] | null = null;
+let latestId = 0;
+const pending = new Map<number, PendingSearch>();
+let inline: { items: StockItem[]; search: CompanySearch } | null = null;
+
+function getWorker(): Worker | null {
+  if (worker !== undefined) return worker;
+  worker = null;
+  if (typeof window === 'undefined' || typeof Worker === 'undefined') return null;
+  try {
+    const w = new Worker(new URL('./company-search.worker.ts', import.meta.url));
+    w.onmessage = (e: MessageEvent<SearchResponse>) => {
+      const call = pending.get(e.data.id);
+      if (!call) return;
+      pending.delete(e.data.id);
+      const { id, ranked } = e.data;
+      if (id !== latestId) call.resolve(null);
+      else if (ranked) call.resolve(ranked.map((i) => call.items[i]));
+      else call.resolve(searchInline(call.items, call.query, call.limit));
+    };
+    w.onerror = () => {
+      // Failed to load or crashed: stop using it and answer the newest query
+      // inline (the rest are stale anyway).
+      worker = null;
+      workerItems = null;
+      w.terminate();
+      for (const [id, call] of pending) {
+        call.resolve(id === latestId ? searchInline(call.items, call.query, call.limit) : null);
+      }
+      pending.clear();
+    };
+    worker = w;
+  } catch {
+    worker = null;
+  }
+  return worker;
+}
+
+function searchInline(items: StockItem[], query: string, limit: number): StockItem[] {
+  if (inline?.items !== items) inline = { items, search: createCompanySearch(items) };
+  return inline.search.search(query, limit);
+}
+
+/**
+ * Hand `items` to the search worker ahead of the first query, so that query
+ * doesn't wait for the list to be copied over and indexed. Repeat calls with
+ * the same list are free.
+ */
+export function loadCompanySearch(items: StockItem[]): void {
+  const w = getWorker();
+  if (!w || workerItems === items) return;
+  workerItems = items;
+  w.postMessage({ kind: 'list', items } satisfies SearchRequest);
+}
+
+/**
+ * The best `limit` companies in `items` for `query` (see ./company-search).
+ * Resolves to null when a later query has been made in the meantime, so only
+ * the newest query's results are ever shown.
+ */
+export function searchCompanies(
+  items: StockItem[],
+  query: string,
+  limit: number
+): Promise<StockItem[] | null> {
+  const id = ++latestId;
+  const w = getWorker();
+  if (!w) return Promise.resolve(searchInline(items, query, limit));
+  loadCompanySearch(items);
+  return new Promise((resolve) => {
+    pending.set(id, { items, query, limit, resolve });
+    w.postMessage({ kind: 'search', id, query, limit } satisfies SearchRequest);
+  });
+}
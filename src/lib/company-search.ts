@@ -0,0 +1,485 @@
+// Company search for the navbar, over the warehouse company list (see
+// getCompanies). A query is answered from an inverted index instead of
+// scanning every company:
+//
+// - exact ticker: the query with punctuation removed ("brk.b" -> "brkb") is
+//   looked up directly, and a hit is always the top result;
+// - prefix: every query token matches the terms it prefixes (tickers, name
+//   tokens and exchange names) through a range search over the sorted term
+//   dictionary, the flat, serializable equivalent of a prefix trie;
+// - fuzzy: tokens of three or more characters also collect the terms sharing
+//   the most trigrams with them, and only those few candidates are scored by
+//   edit distance, so typos ("micrsoft") still match.
+//
+// A company must match every query token; its score is the mean of its best
+// match per token, and the top `limit` are selected without sorting the rest.
+//
+// The index is plain arrays of strings and numbers, built once per list by the
+// search worker and persisted in IndexedDB (see ./company-search.worker), so
+// page loads revive it instead of re-indexing every company.
+
+import { StockItem } from './types';
+
+// Where a term came from, packed into each posting beside its item.
+const TICKER = 0;
+const NAME_HEAD = 1; // the first token of the name
+const NAME = 2;
+const EXCHANGE = 3;
+const FIELDS = 4;
+const FIELD_WEIGHT = [1, 0.9, 0.75, 0.3];
+
+// Match scores before field weighting: exact 1, prefix PREFIX_BASE up to
+// PREFIX_BASE + PREFIX_SPAN by how much of the term the query covers, fuzzy at
+// most FUZZY_BASE.
+const PREFIX_BASE = 0.5;
+const PREFIX_SPAN = 0.4;
+const FUZZY_BASE = 0.5;
+// Fuzzy matching of a query token against a term's prefix (still typing) is
+// worth a little less than against the whole term.
+const FUZZY_PREFIX_FACTOR = 0.9;
+// Added to an exact ticker hit so it outranks everything else.
+const EXACT_TICKER_BONUS = 10;
+
+// Terms scored by edit distance per query token, most shared trigrams first.
+const FUZZY_CANDIDATES = 24;
+const FUZZY_MIN_LENGTH = 3;
+// Terms longer than this are never fuzzy-matched (keeps the DP rows fixed).
+const MAX_FUZZY_LENGTH = 48;
+
+// Trigram alphabet: 0 pads the start of a term, then a-z and 0-9.
+const GRAM_BASE = 37;
+const GRAM_CODES = GRAM_BASE ** 3;
+
+/** Serializable search index over a company list. */
+export type CompanySearchIndex = {
+  terms: string[]; // sorted, unique
+  termStart: number[]; // [terms + 1] into postings
+  postings: number[]; // item * FIELDS + field, by field then item
+  grams: number[]; // sorted trigram codes
+  gramStart: number[]; // [grams + 1] into gramTerms
+  gramTerms: number[]; // ids of the terms containing each trigram
+};
+
+// Lowercase alphanumeric runs, accents dropped: "Procter & Gamble Co." ->
+// ["procter", "gamble", "co"].
+function tokenize(s: string): string[] {
+  const plain = /[^\x00-\x7f]/.test(s) ? s.normalize('NFD').replace(/[\u0300-\u036f]/g, '') : s;
+  return plain.toLowerCase().match(/[a-z0-9]+/g) ?? [];
+}
+
+// A ticker as one term: "BRK-B" -> "brkb".
+function compact(s: string): string {
+  return tokenize(s).join('');
+}
+
+function gramChar(code: number): number {
+  return code >= 97 ? code - 96 : code - 21; // a-z -> 1..26, 0-9 -> 27..36
+}
+
+// Trigram codes of `term` with one pad in front ("ab" -> [" ab"]), or none for
+// single characters.
+function trigrams(term: string): number[] {
+  const out: number[] = [];
+  let a = 0;
+  let b = gramChar(term.charCodeAt(0));
+  for (let i = 1; i < term.length; i++) {
+    const c = gramChar(term.charCodeAt(i));
+    out.push((a * GRAM_BASE + b) * GRAM_BASE + c);
+    a = b;
+    b = c;
+  }
+  return out;
+}
+
+export function buildCompanySearchIndex(items: StockItem[]): CompanySearchIndex {
+  const byTerm = new Map<string, number[]>();
+  const add = (term: string, item: number, field: number) => {
+    if (!term) return;
+    let list = byTerm.get(term);
+    if (!list) {
+      list = [];
+      byTerm.set(term, list);
+    }
+    const posting = item * FIELDS + field;
+    if (list[list.length - 1] !== posting) list.push(posting);
+  };
+  items.forEach((item, i) => {
+    add(compact(item.ticker), i, TICKER);
+    tokenize(item.companyName).forEach((token, k) => add(token, i, k === 0 ? NAME_HEAD : NAME));
+    for (const exchange of item.listedExchange ?? []) {
+      for (const token of tokenize(exchange)) add(token, i, EXCHANGE);
+    }
+  });
+
+  const terms = [...byTerm.keys()].sort();
+  const termStart = [0];
+  const postings: number[] = [];
+  for (const term of terms) {
+    // By field, then item: a term's strongest postings come first.
+    const list = byTerm.get(term)!.sort((a, b) => (a % FIELDS) - (b % FIELDS) || a - b);
+    for (const p of list) postings.push(p);
+    termStart.push(postings.length);
+  }
+
+  // Trigram -> terms, laid out by counting over every possible code (a term
+  // repeating a trigram is listed once).
+  const termGrams = terms.map(trigrams);
+  const count = new Int32Array(GRAM_CODES);
+  const last = new Int32Array(GRAM_CODES).fill(-1);
+  termGrams.forEach((codes, id) => {
+    for (const g of codes) {
+      if (last[g] !== id) {
+        last[g] = id;
+        count[g]++;
+      }
+    }
+  });
+  const grams: number[] = [];
+  const gramStart = [0];
+  const cursor = new Int32Array(GRAM_CODES);
+  for (let g = 0; g < GRAM_CODES; g++) {
+    if (count[g] === 0) continue;
+    cursor[g] = gramStart[grams.length];
+    grams.push(g);
+    gramStart.push(cursor[g] + count[g]);
+  }
+  const gramTerms: number[] = new Array(gramStart[grams.length]);
+  last.fill(-1);
+  termGrams.forEach((codes, id) => {
+    for (const g of codes) {
+      if (last[g] !== id) {
+        last[g] = id;
+        gramTerms[cursor[g]++] = id;
+      }
+    }
+  });
+  return { terms, termStart, postings, grams, gramStart, gramTerms };
+}
+
+/**
+ * A search over `items`, reusing `index` if one was already built for them
+ * (built here otherwise).
+ */
+export function createCompanySearch(items: StockItem[], index?: CompanySearchIndex | null): CompanySearch {
+  return new CompanySearch(items, index ?? buildCompanySearchIndex(items));
+}
+
+export class CompanySearch {
+  // Per-item scratch, reused across queries. Stamps mark which entries belong
+  // to the current query (itemStamp) or query token (tokenStamp), so nothing
+  // is cleared between calls.
+  private readonly tokenScore: Float64Array;
+  private readonly tokenStamp: Uint32Array;
+  private readonly total: Float64Array;
+  private readonly matched: Uint8Array;
+  private readonly itemStamp: Uint32Array;
+  // Per-term scratch for counting shared trigrams.
+  private readonly gramCount: Uint16Array;
+  private readonly gramStamp: Uint32Array;
+  // Prefix matches grouped by term length, emptied after each use.
+  private readonly byLength: number[][];
+  // Edit distance rows.
+  private readonly rows = [0, 1, 2].map(() => new Int32Array(MAX_FUZZY_LENGTH + 2));
+  private stamp = 0;
+
+  constructor(
+    private readonly items: StockItem[],
+    private readonly index: CompanySearchIndex
+  ) {
+    const n = items.length;
+    this.tokenScore = new Float64Array(n);
+    this.tokenStamp = new Uint32Array(n);
+    this.total = new Float64Array(n);
+    this.matched = new Uint8Array(n);
+    this.itemStamp = new Uint32Array(n);
+    this.gramCount = new Uint16Array(index.terms.length);
+    this.gramStamp = new Uint32Array(index.terms.length);
+    const longest = index.terms.reduce((n, t) => Math.max(n, t.length), 0);
+    this.byLength = Array.from({ length: longest + 1 }, () => []);
+  }
+
+  /** The best `limit` companies for `query`, best first. */
+  search(query: string, limit: number): StockItem[] {
+    return this.rank(query, limit).map((i) => this.items[i]);
+  }
+
+  /** Like `search`, as positions in the company list. */
+  rank(query: string, limit: number): number[] {
+    const tokens = tokenize(query).slice(0, 255);
+    if (tokens.length === 0 || limit <= 0) return [];
+    // The exact ticker, whatever the tokens made of it, goes first.
+    const exact = this.exactTicker(compact(query));
+    const rest = exact === -1 ? limit : limit - 1;
+    const top =
+      tokens.length === 1 ? this.searchOne(tokens[0], exact, rest) : this.searchAll(tokens, exact, rest);
+    if (exact !== -1) top.unshift(exact);
+    return top;
+  }
+
+  // A single token, which is every first keystroke: terms are visited best
+  // first and each term's postings by field weight, so the scan stops as soon
+  // as nothing left could enter the top.
+  private searchOne(token: string, exact: number, limit: number): number[] {
+    const { termStart, postings } = this.index;
+    const { tokenScore, tokenStamp } = this;
+    const stamp = ++this.stamp;
+    const top = new TopK(limit);
+    const { ids, scores } = this.matchTerms(token);
+    for (let k = 0; k < ids.length && top.admits(scores[k]); k++) {
+      for (let p = termStart[ids[k]]; p < termStart[ids[k] + 1]; p++) {
+        const posting = postings[p];
+        const score = scores[k] * FIELD_WEIGHT[posting % FIELDS];
+        if (!top.admits(score)) break;
+        const item = Math.floor(posting / FIELDS);
+        if (item === exact) continue;
+        if (tokenStamp[item] !== stamp) {
+          tokenStamp[item] = stamp;
+          tokenScore[item] = score;
+          top.offer(item, score);
+        } else if (score > tokenScore[item]) {
+          tokenScore[item] = score;
+          top.raise(item, score);
+        }
+      }
+    }
+    return top.items;
+  }
+
+  // Several tokens: every company matching each of them, scored by the mean of
+  // its best match per token.
+  private searchAll(tokens: string[], exact: number, limit: number): number[] {
+    const { total, matched, itemStamp, tokenScore } = this;
+    const queryStamp = ++this.stamp;
+    // Candidates are the items matching the first token; later tokens only
+    // narrow them down.
+    let candidates: number[] = [];
+    for (let q = 0; q < tokens.length; q++) {
+      const touched = this.matchToken(tokens[q]);
+      if (q === 0) {
+        for (const item of touched) {
+          itemStamp[item] = queryStamp;
+          total[item] = tokenScore[item];
+          matched[item] = 1;
+        }
+        candidates = touched;
+      } else {
+        for (const item of touched) {
+          if (itemStamp[item] === queryStamp && matched[item] === q) {
+            total[item] += tokenScore[item];
+            matched[item] = q + 1;
+          }
+        }
+      }
+    }
+    const top = new TopK(limit);
+    for (const item of candidates) {
+      if (matched[item] === tokens.length && item !== exact) top.offer(item, total[item] / tokens.length);
+    }
+    return top.items;
+  }
+
+  // The item whose ticker is exactly `term`, or -1.
+  private exactTicker(term: string): number {
+    const { terms, termStart, postings } = this.index;
+    const id = lowerBound(terms, term);
+    if (id === terms.length || terms[id] !== term) return -1;
+    // Postings are ordered by field, tickers first.
+    const posting = postings[termStart[id]];
+    return posting % FIELDS === TICKER ? Math.floor(posting / FIELDS) : -1;
+  }
+
+  // Scores every item matching `token` (its best match) into tokenScore and
+  // returns them.
+  private matchToken(token: string): number[] {
+    const tokenStamp = ++this.stamp;
+    const touched: number[] = [];
+    const { ids, scores } = this.matchTerms(token);
+    for (let k = 0; k < ids.length; k++) this.scoreTerm(ids[k], scores[k], tokenStamp, touched);
+    return touched;
+  }
+
+  // The terms `token` matches and their match scores, best first: the terms it
+  // prefixes by ascending length (an exact match leads), then the fuzzy
+  // matches, which always score below any prefix.
+  private matchTerms(token: string): { ids: number[]; scores: number[] } {
+    const { terms } = this.index;
+    const ids: number[] = [];
+    const scores: number[] = [];
+
+    const lo = lowerBound(terms, token);
+    const hi = lowerBound(terms, token + '\uffff');
+    const { byLength } = this;
+    const lengths: number[] = [];
+    for (let id = lo; id < hi; id++) {
+      const bucket = byLength[terms[id].length];
+      if (bucket.length === 0) lengths.push(terms[id].length);
+      bucket.push(id);
+    }
+    lengths.sort((a, b) => a - b);
+    for (const length of lengths) {
+      const score = length === token.length ? 1 : PREFIX_BASE + (PREFIX_SPAN * token.length) / length;
+      for (const id of byLength[length]) {
+        ids.push(id);
+        scores.push(score);
+      }
+      byLength[length].length = 0;
+    }
+
+    if (token.length >= FUZZY_MIN_LENGTH && token.length <= MAX_FUZZY_LENGTH) {
+      const maxEdits = token.length < 6 ? 1 : 2;
+      const fuzzy: { id: number; score: number }[] = [];
+      for (const id of this.fuzzyCandidates(token, lo, hi)) {
+        const term = terms[id];
+        if (term.length > MAX_FUZZY_LENGTH) continue;
+        let score = 0;
+        const whole = this.distance(token, term, term.length, maxEdits);
+        if (whole <= maxEdits) score = FUZZY_BASE * (1 - whole / token.length);
+        if (term.length > token.length) {
+          const prefix = this.distance(token, term, token.length, maxEdits);
+          if (prefix <= maxEdits) {
+            score = Math.max(score, FUZZY_PREFIX_FACTOR * FUZZY_BASE * (1 - prefix / token.length));
+          }
+        }
+        if (score > 0) fuzzy.push({ id, score });
+      }
+      fuzzy.sort((a, b) => b.score - a.score);
+      for (const { id, score } of fuzzy) {
+        ids.push(id);
+        scores.push(score);
+      }
+    }
+    return { ids, scores };
+  }
+
+  private scoreTerm(id: number, score: number, tokenStamp: number, touched: number[]): void {
+    const { termStart, postings } = this.index;
+    for (let p = termStart[id]; p < termStart[id + 1]; p++) {
+      const posting = postings[p];
+      const item = Math.floor(posting / FIELDS);
+      const s = score * FIELD_WEIGHT[posting % FIELDS];
+      if (this.tokenStamp[item] !== tokenStamp) {
+        this.tokenStamp[item] = tokenStamp;
+        this.tokenScore[item] = s;
+        touched.push(item);
+      } else if (s > this.tokenScore[item]) {
+        this.tokenScore[item] = s;
+      }
+    }
+  }
+
+  // The terms outside [skipLo, skipHi) (already matched by prefix) sharing the
+  // most trigrams with `token`, at most FUZZY_CANDIDATES of them.
+  private fuzzyCandidates(token: string, skipLo: number, skipHi: number): number[] {
+    const { grams, gramStart, gramTerms } = this.index;
+    const { gramCount, gramStamp } = this;
+    const stamp = ++this.stamp;
+    const seen: number[] = [];
+    for (const gram of new Set(trigrams(token))) {
+      const g = lowerBound(grams, gram);
+      if (g === grams.length || grams[g] !== gram) continue;
+      for (let k = gramStart[g]; k < gramStart[g + 1]; k++) {
+        const id = gramTerms[k];
+        if (id >= skipLo && id < skipHi) continue;
+        if (gramStamp[id] !== stamp) {
+          gramStamp[id] = stamp;
+          gramCount[id] = 1;
+          seen.push(id);
+        } else {
+          gramCount[id]++;
+        }
+      }
+    }
+    // One shared trigram is noise unless the token has little else.
+    const minShared = token.length <= 4 ? 1 : 2;
+    const best: number[] = [];
+    for (const id of seen) {
+      const count = gramCount[id];
+      if (count < minShared) continue;
+      if (best.length === FUZZY_CANDIDATES && count <= gramCount[best[FUZZY_CANDIDATES - 1]]) continue;
+      let at = best.length === FUZZY_CANDIDATES ? FUZZY_CANDIDATES - 1 : best.length;
+      while (at > 0 && count > gramCount[best[at - 1]]) {
+        best[at] = best[at - 1];
+        at--;
+      }
+      best[at] = id;
+    }
+    return best;
+  }
+
+  // Optimal string alignment distance between `a` and the first `bLength`
+  // characters of `b`, or max + 1 once it must exceed `max`.
+  private distance(a: string, b: string, bLength: number, max: number): number {
+    if (Math.abs(a.length - bLength) > max) return max + 1;
+    let [prev2, prev, cur] = this.rows;
+    for (let j = 0; j <= bLength; j++) prev[j] = j;
+    for (let i = 1; i <= a.length; i++) {
+      cur[0] = i;
+      let rowMin = i;
+      const ca = a.charCodeAt(i - 1);
+      for (let j = 1; j <= bLength; j++) {
+        const cb = b.charCodeAt(j - 1);
+        let d = Math.min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca === cb ? 0 : 1));
+        if (i > 1 && j > 1 && ca === b.charCodeAt(j - 2) && a.charCodeAt(i - 2) === cb) {
+          d = Math.min(d, prev2[j - 2] + 1);
+        }
+        cur[j] = d;
+        if (d < rowMin) rowMin = d;
+      }
+      if (rowMin > max) return max + 1;
+      const spare = prev2;
+      prev2 = prev;
+      prev = cur;
+      cur = spare;
+    }
+    return prev[bLength];
+  }
+}
+
+// The best `limit` items offered so far, best first; on a tie the earlier offer
+// stays ahead.
+class TopK {
+  readonly items: number[] = [];
+  private readonly scores: number[] = [];
+
+  constructor(private readonly limit: number) {}
+
+  /** Whether an item scoring `score` would make the list. */
+  admits(score: number): boolean {
+    return this.items.length < this.limit || score > this.scores[this.limit - 1];
+  }
+
+  offer(item: number, score: number): void {
+    if (!this.admits(score)) return;
+    const { items, scores } = this;
+    let at = items.length === this.limit ? this.limit - 1 : items.length;
+    while (at > 0 && score > scores[at - 1]) {
+      items[at] = items[at - 1];
+      scores[at] = scores[at - 1];
+      at--;
+    }
+    items[at] = item;
+    scores[at] = score;
+  }
+
+  /** Offer `item` again at a higher score, whether or not it is listed. */
+  raise(item: number, score: number): void {
+    const at = this.items.indexOf(item);
+    if (at !== -1) {
+      this.items.splice(at, 1);
+      this.scores.splice(at, 1);
+    }
+    this.offer(item, score);
+  }
+}
+
+// First position in sorted `xs` not less than `x`.
+function lowerBound<T extends string | number>(xs: T[], x: T): number {
+  let lo = 0;
+  let hi = xs.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (xs[mid] < x) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
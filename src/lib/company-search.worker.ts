@@ -0,0 +1,75 @@
+import {
+  CompanySearch,
+  CompanySearchIndex,
+  buildCompanySearchIndex,
+  createCompanySearch,
+} from './company-search';
+import { idbGet, idbPut } from './idb-cache';
+import { StockItem } from './types';
+
+// Worker half of `./company-search-client`: owns the company list and its
+// search index and answers queries off the main thread, so neither indexing
+// nor scoring ever competes with input handling or the dashboard's rendering.
+// The page sends the items only. The index is revived from IndexedDB when the
+// one stored there was built for the same items, and built here (then stored)
+// otherwise. Answers are list positions; the main thread maps them back to its
+// own copy of the items.
+
+export type SearchRequest =
+  | { kind: 'list'; items: StockItem[] }
+  | { kind: 'search'; id: number; query: string; limit: number };
+
+// `ranked` is null when the worker couldn't answer (the list failed to load).
+export type SearchResponse = { id: number; ranked: number[] | null };
+
+// The one persisted index, and the items it was built for (see listKey).
+const INDEX_KEY = 'index';
+type PersistedIndex = { key: string; index: CompanySearchIndex };
+
+// Identifies a list by its length and an FNV-1a hash of every item's fields,
+// so an unchanged list revives its index whatever refresh handed it over.
+function listKey(items: StockItem[]): string {
+  let h = 0x811c9dc5;
+  const mix = (text: string) => {
+    for (let i = 0; i < text.length; i++) h = Math.imul(h ^ text.charCodeAt(i), 0x01000193);
+    h = Math.imul(h ^ 0x1f, 0x01000193); // a separator, so fields can't run together
+  };
+  for (const item of items) {
+    h = Math.imul(h ^ (item.cik ?? -1), 0x01000193);
+    mix(item.ticker);
+    mix(item.companyName);
+    for (const exchange of item.listedExchange ?? []) mix(exchange);
+    h = Math.imul(h ^ 0x1e, 0x01000193);
+  }
+  return `${items.length}:${(h >>> 0).toString(36)}`;
+}
+
+async function load(items: StockItem[]): Promise<CompanySearch> {
+  const key = listKey(items);
+  const persisted = await idbGet<PersistedIndex>('companySearch', INDEX_KEY);
+  if (persisted?.key === key) return createCompanySearch(items, persisted.index);
+  const index = buildCompanySearchIndex(items);
+  void idbPut('companySearch', INDEX_KEY, { key, index } satisfies PersistedIndex);
+  return createCompanySearch(items, index);
+}
+
+// Queries wait for the list that was current when they arrived.
+let search: Promise<CompanySearch | null> = Promise.resolve(null);
+
+self.addEventListener('message', async (e: MessageEvent<SearchRequest>) => {
+  if (e.data.kind === 'list') {
+    search = load(e.data.items);
+    // A failed load is reported to each query that waits on it.
+    search.catch(() => {});
+    return;
+  }
+  const { id, query, limit } = e.data;
+  let ranked: number[] | null;
+  try {
+    const current = await search;
+    ranked = current ? current.rank(query, limit) : [];
+  } catch {
+    ranked = null;
+  }
+  self.postMessage({ id, ranked } satisfies SearchResponse);
+});
@@ -0,0 +1,164 @@
+// Persistent (IndexedDB) second tier beneath the in-memory warehouse caches.
+// Filings are immutable once accepted, so a filing's line items fetched today
+// are still correct next week; keeping them on disk lets a reload or a revisit
+// paint without any warehouse round trip. Everything here is best-effort: when
+// IndexedDB is unavailable (SSR, private mode, quota) reads miss and writes are
+// dropped, and callers fall through to the network as before. The company
+// search worker keeps its index here too (see ./company-search.worker).
+
+import { approxBytes } from './lru-cache';
+
+const DB_NAME = 'ff-warehouse';
+
+// Shape version of the persisted records. Bumping it drops every store on the
+// next open, so a release that changes what we persist never reads old rows.
+const SCHEMA_VERSION = 6;
+
+// Total persisted payload (estimated, see approxBytes) before the least
+// recently used entries are evicted.
+const MAX_BYTES = 100 * 1024 * 1024; // 100 MB
+
+export type IdbStore = 'lineItems' | 'filings' | 'overview' | 'companySearch';
+
+const STORES: IdbStore[] = ['lineItems', 'filings', 'overview', 'companySearch'];
+
+// Size + last-access bookkeeping for every entry across all stores, kept apart
+// from the payloads so eviction can scan it without loading any rows.
+const LRU_STORE = 'lru';
+
+type Entry<T> = { value: T; ts: number };
+type LruMeta = { id: string; bytes: number; atime: number };
+
+let dbPromise: Promise<IDBDatabase | null> | null = null;
+
+// Running total of the bytes in LRU_STORE, summed once per session and then
+// kept current by puts and evictions, so a put only scans the store when the
+// budget is actually exceeded. Writes from other tabs go unseen until the next
+// eviction (or session) rescans.
+let totalBytes: Promise<number> | null = null;
+
+function openDb(): Promise<IDBDatabase | null> {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve) => {
+      if (typeof indexedDB === 'undefined') return resolve(null);
+      let req: IDBOpenDBRequest;
+      try {
+        req = indexedDB.open(DB_NAME, SCHEMA_VERSION);
+      } catch {
+        return resolve(null);
+      }
+      req.onupgradeneeded = () => {
+        const db = req.result;
+        for (const name of Array.from(db.objectStoreNames)) db.deleteObjectStore(name);
+        for (const name of STORES) db.createObjectStore(name);
+        db.createObjectStore(LRU_STORE, { keyPath: 'id' });
+      };
+      req.onsuccess = () => resolve(req.result);
+      req.onerror = () => resolve(null);
+      req.onblocked = () => resolve(null);
+    });
+  }
+  return dbPromise;
+}
+
+function request<T>(req: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => reject(req.error);
+  });
+}
+
+function done(tx: IDBTransaction): Promise<void> {
+  return new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+}
+
+const lruId = (store: IdbStore, key: string) => `${store}:${key}`;
+
+/**
+ * Persisted value for `key`, or null on a miss. `maxAgeMs` treats entries
+ * written longer ago than that as misses (for data that can change, unlike
+ * per-filing rows). A hit refreshes the entry's LRU position.
+ */
+export async function idbGet<T>(store: IdbStore, key: string, maxAgeMs?: number): Promise<T | null> {
+  const db = await openDb();
+  if (!db) return null;
+  try {
+    const entry = (await request(db.transaction(store).objectStore(store).get(key))) as
+      | Entry<T>
+      | undefined;
+    if (!entry) return null;
+    if (maxAgeMs !== undefined && Date.now() - entry.ts > maxAgeMs) return null;
+    void touch(db, lruId(store, key));
+    return entry.value;
+  } catch {
+    return null;
+  }
+}
+
+/** Persist `value` under `key`, then evict LRU entries past the size budget. */
+export async function idbPut<T>(store: IdbStore, key: string, value: T): Promise<void> {
+  const db = await openDb();
+  if (!db) return;
+  try {
+    const now = Date.now();
+    const id = lruId(store, key);
+    const bytes = approxBytes(value);
+    const tx = db.transaction([store, LRU_STORE], 'readwrite');
+    const lru = tx.objectStore(LRU_STORE);
+    tx.objectStore(store).put({ value, ts: now } satisfies Entry<T>, key);
+    const prev = (await request(lru.get(id))) as LruMeta | undefined;
+    lru.put({ id, bytes, atime: now } satisfies LruMeta);
+    await done(tx);
+    // The first put of the session sums the store, this entry included.
+    const delta = bytes - (prev?.bytes ?? 0);
+    totalBytes = totalBytes ? totalBytes.then((n) => n + delta) : sumBytes(db);
+    if ((await totalBytes) > MAX_BYTES) await (totalBytes = evict(db));
+  } catch {
+    // quota / clone errors: the disk tier is best-effort
+    totalBytes = null;
+  }
+}
+
+async function touch(db: IDBDatabase, id: string): Promise<void> {
+  try {
+    const tx = db.transaction(LRU_STORE, 'readwrite');
+    const lru = tx.objectStore(LRU_STORE);
+    const meta = (await request(lru.get(id))) as LruMeta | undefined;
+    if (meta) lru.put({ ...meta, atime: Date.now() });
+    await done(tx);
+  } catch {
+    // a lost access-time update only makes eviction slightly less accurate
+  }
+}
+
+function readMetas(db: IDBDatabase): Promise<LruMeta[]> {
+  return request(db.transaction(LRU_STORE).objectStore(LRU_STORE).getAll()) as Promise<LruMeta[]>;
+}
+
+async function sumBytes(db: IDBDatabase): Promise<number> {
+  return (await readMetas(db)).reduce((n, m) => n + m.bytes, 0);
+}
+
+// Evicts least recently used entries until the total is within budget, and
+// returns the new total.
+async function evict(db: IDBDatabase): Promise<number> {
+  const metas = await readMetas(db);
+  let total = metas.reduce((n, m) => n + m.bytes, 0);
+  if (total <= MAX_BYTES) return total;
+
+  metas.sort((a, b) => a.atime - b.atime);
+  const tx = db.transaction([...STORES, LRU_STORE], 'readwrite');
+  for (const meta of metas) {
+    if (total <= MAX_BYTES) break;
+    const sep = meta.id.indexOf(':');
+    tx.objectStore(meta.id.slice(0, sep)).delete(meta.id.slice(sep + 1));
+    tx.objectStore(LRU_STORE).delete(meta.id);
+    total -= meta.bytes;
+  }
+  await done(tx);
+  return total;
+}
@@ -0,0 +1,455 @@
+// Compact columnar storage for one filing's line_item rows. A row-per-object
+// array repeats long tag strings (`NetCashProvidedByUsedInOperatingActivities`),
+// `uom`, `stmt` and ISO dates on every row; here numbers live in typed arrays
+// and strings are interned once per StringTable, so a cached filing costs a
+// fraction of the heap and tag scans compare small integers. The `./xbrl`
+// derivation consumes this shape directly; rows are only materialized as
+// LineItemRow objects for display.
+
+import { LineItemRow } from './types';
+
+/** Interned strings; ids are dense indices into `strings`. */
+export class StringTable {
+  readonly strings: string[] = [];
+  private readonly ids = new Map<string, number>();
+
+  intern(s: string): number {
+    let id = this.ids.get(s);
+    if (id === undefined) {
+      id = this.strings.length;
+      this.strings.push(s);
+      this.ids.set(s, id);
+    }
+    return id;
+  }
+}
+
+// Shared by every filing cached in this session, so the same tags and labels
+// across a company's filings are stored once. Strings are never released;
+// the table is bounded by the distinct tags/labels/units actually viewed.
+export const sessionStrings = new StringTable();
+
+// Statement codes as stored in the `stmt` column (index into this list).
+export const STMT_CODES = ['IS', 'BS', 'CF', 'EQ'] as const;
+const UNKNOWN_STMT = 255;
+
+export interface LineItemColumns {
+  length: number;
+  table: StringTable;
+  stmt: Uint8Array; // index into STMT_CODES, UNKNOWN_STMT otherwise
+  line: Int32Array;
+  tag: Uint32Array; // string id
+  plabel: Int32Array; // string id, -1 = null
+  uom: Uint32Array; // string id
+  value: Float64Array; // nearest float; NaN = null
+  exact: BigInt64Array; // exact value × 10^scale; INEXACT = null or out of range
+  scale: Uint8Array; // decimal places of `exact`, 0-4; 0 = whole, never INEXACT
+  qtrs: Uint8Array;
+  ddate: Int32Array; // YYYYMMDD; orders the same as the ISO string
+}
+
+// A line row as it arrives from PostgREST (numerics may be strings).
+export type LineSourceRow = {
+  stmt: string;
+  line: number | string;
+  plabel: string | null;
+  tag: string;
+  value: number | string | null;
+  uom: string;
+  qtrs: number | string;
+  ddate: string;
+};
+
+export function stmtIndex(code: string): number {
+  const i = (STMT_CODES as readonly string[]).indexOf(code);
+  return i === -1 ? UNKNOWN_STMT : i;
+}
+
+/** 'YYYY-MM-DD' -> YYYYMMDD (0 if unparseable). */
+export function ddateOrdinal(ddate: string): number {
+  const n = parseInt(String(ddate).slice(0, 10).replace(/-/g, ''), 10);
+  return Number.isNaN(n) ? 0 : n;
+}
+
+export function ddateString(ordinal: number): string {
+  const y = Math.floor(ordinal / 10000);
+  const m = Math.floor(ordinal / 100) % 100;
+  const d = ordinal % 100;
+  return `${String(y).padStart(4, '0')}-${String(m).padStart(2, '0')}-${String(d).padStart(2, '0')}`;
+}
+
+/** Zero-filled columns for `n` rows, for callers that fill them in place. */
+export function allocColumns(n: number, table: StringTable = sessionStrings): LineItemColumns {
+  return {
+    length: n,
+    table,
+    stmt: new Uint8Array(n),
+    line: new Int32Array(n),
+    tag: new Uint32Array(n),
+    plabel: new Int32Array(n),
+    uom: new Uint32Array(n),
+    value: new Float64Array(n),
+    exact: new BigInt64Array(n),
+    scale: new Uint8Array(n),
+    qtrs: new Uint8Array(n),
+    ddate: new Int32Array(n),
+  };
+}
+
+/**
+ * Bytes held by the columns' typed arrays, for cache budgets. The string table
+ * is left out: it is shared across the session, not owned by one filing.
+ */
+export function columnsBytes(cols: LineItemColumns): number {
+  return (
+    cols.stmt.byteLength +
+    cols.line.byteLength +
+    cols.tag.byteLength +
+    cols.plabel.byteLength +
+    cols.uom.byteLength +
+    cols.value.byteLength +
+    cols.exact.byteLength +
+    cols.scale.byteLength +
+    cols.qtrs.byteLength +
+    cols.ddate.byteLength
+  );
+}
+
+// --- Values ---
+//
+// `numeric(28,4)` values are kept twice: as the nearest float (`value`, which
+// the UI formats and ratios divide) and exactly, as an int64 mantissa with a
+// per-row decimal scale (`exact` / 10^`scale`, scale 0-4). Whole values get
+// scale 0, other short ones scale 4; longer ones have trailing zeros stripped.
+// As reported amounts are whole units, the mantissa holds them exactly up to
+// ±9.2 × 10^18, well past the 2^53 where floats start rounding (large JPY or
+// KRW totals), and sums over them (see `./xbrl`) stay exact. Nulls, and the
+// rare value that doesn't fit, are INEXACT: only the float is kept. The
+// warehouse sends values as text so nothing is lost in JSON parsing on the way.
+
+const MAX_SCALE = 4;
+
+// int64 bounds; the minimum doubles as the marker for "no exact value".
+export const INEXACT = BigInt.asIntN(64, BigInt(1) << BigInt(63));
+const MAX_EXACT = BigInt.asIntN(64, (BigInt(1) << BigInt(63)) - BigInt(1));
+
+const SCALE_4 = 10 ** MAX_SCALE;
+// 15 digits and the point, and the bound under which those fit at scale 4:
+// see parseShortDecimal.
+const SHORT_LENGTH = 16;
+const SHORT_LIMIT = 1e11;
+const TWO_32 = 4294967296;
+// Whole parts below this still fit a safe integer at scale 4.
+const SCALE_4_LIMIT = Math.floor(Number.MAX_SAFE_INTEGER / SCALE_4);
+const LITTLE_ENDIAN = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+// The parsers below return the scale of an exact mantissa that is a safe
+// integer (scale 0: the value itself; scale 4: the value × 10^4), or NOT_SHORT,
+// so that the common case allocates nothing.
+const NOT_SHORT = -1;
+
+// A float as a whole amount, or at the full scale: exact when v × 10^4 is a
+// safe integer that converts back to v.
+function floatScale(v: number): number {
+  if (Number.isSafeInteger(v)) return 0;
+  const m = Math.round(v * SCALE_4);
+  return Number.isSafeInteger(m) && m / SCALE_4 === v ? MAX_SCALE : NOT_SHORT;
+}
+
+// Decimal text `s`, already parsed to `v` by Number(). Decimals of up to 15
+// digits are distinct doubles, so:
+//  - below 10^11, where every v × 10^4 mantissa also has at most 15 digits, a
+//    `v` that round-trips at scale 4 means the text had at most 4 decimals
+//    and that mantissa is exactly its value (a whole `v`, the text was whole);
+//  - above, text that is a whole number of at most 15 digits (the point and
+//    its zeros aside) is exactly `v`, at scale 0.
+// Anything else is left to parseLongDecimal.
+function shortScale(s: string, v: number): number {
+  const sign = s.charCodeAt(0) === 45 /* - */ ? 1 : 0;
+  if (Math.abs(v) < SHORT_LIMIT) return s.length - sign <= SHORT_LENGTH ? floatScale(v) : NOT_SHORT;
+  if (!Number.isSafeInteger(v)) return NOT_SHORT;
+  let end = s.length;
+  while (s.charCodeAt(end - 1) === 48 /* 0 */) end--;
+  if (s.charCodeAt(end - 1) !== 46 /* . */) end = s.length;
+  else end--;
+  return end - sign < SHORT_LENGTH ? 0 : NOT_SHORT;
+}
+
+const DECIMAL = /^-?\d+(\.\d+)?$/;
+
+// Any plain decimal with at most 4 significant fractional digits that fits
+// int64, through BigInt. Trailing zeros are stripped, so whole amounts get
+// scale 0 and the whole int64 range.
+function parseLongDecimal(s: string): { mantissa: bigint; scale: number } | null {
+  if (!DECIMAL.test(s)) return null;
+  const dot = s.indexOf('.');
+  let end = s.length;
+  if (dot !== -1) while (end > dot + 1 && s.charCodeAt(end - 1) === 48 /* 0 */) end--;
+  const scale = dot === -1 ? 0 : end - dot - 1;
+  if (scale > MAX_SCALE) return null;
+  const mantissa = BigInt(dot === -1 ? s : s.slice(0, dot) + s.slice(dot + 1, end));
+  return mantissa > INEXACT && mantissa <= MAX_EXACT ? { mantissa, scale } : null;
+}
+
+/**
+ * Writer for the value columns of `cols`. Takes a numeric(28,4) as text (as
+ * the warehouse sends it), a number, or null. Text in the warehouse's own
+ * layout with a whole part of up to 18 digits, so nearly all of it, is read
+ * digit by digit into both the float and, while the mantissa is a safe
+ * integer, straight into the int64 words, which costs no more than Number()
+ * alone; only larger whole amounts go through a BigInt. Other decimals of up
+ * to 15 digits take their mantissa from the float Number() parsed.
+ */
+export function valueWriter(
+  cols: LineItemColumns
+): (i: number, raw: number | string | null | undefined) => void {
+  const { value, exact, scale } = cols;
+  const words = new Int32Array(exact.buffer, exact.byteOffset, cols.length * 2);
+  const lo = LITTLE_ENDIAN ? 0 : 1;
+  const hi = 1 - lo;
+
+  // Words of the safe integer m.
+  const writeSafe = (i: number, m: number) => {
+    if ((m | 0) === m) {
+      words[2 * i + lo] = m;
+      words[2 * i + hi] = m >> 31;
+      return;
+    }
+    const high = Math.floor(m / TWO_32);
+    words[2 * i + lo] = m - high * TWO_32; // stored mod 2^32
+    words[2 * i + hi] = high;
+  };
+
+  // Text as the warehouse sends it, `-?\d+\.\d{4}`, or false to leave it to
+  // the general path. The whole part is read as two 9-digit halves; top × 10^9
+  // is exact (10^9 = 2^9 × 1953125, so the product has at most 51 significant
+  // bits), and one addition then rounds the whole part exactly as Number()
+  // rounds its text. A fraction is exact at scale 4 while the mantissa is a
+  // safe integer, and IEEE division by 10^4 rounds it as Number() would too.
+  const writeText = (i: number, s: string): boolean => {
+    const n = s.length;
+    const start = s.charCodeAt(0) === 45 /* - */ ? 1 : 0;
+    const point = n - 1 - MAX_SCALE;
+    if (point <= start || point - start > 18 || s.charCodeAt(point) !== 46 /* . */) return false;
+    let fraction = 0;
+    for (let j = point + 1; j < n; j++) {
+      const d = s.charCodeAt(j) - 48;
+      if (d < 0 || d > 9) return false;
+      fraction = fraction * 10 + d;
+    }
+    const split = point - 9 > start ? point - 9 : start;
+    let top = 0;
+    for (let j = start; j < split; j++) {
+      const d = s.charCodeAt(j) - 48;
+      if (d < 0 || d > 9) return false;
+      top = top * 10 + d;
+    }
+    let low = 0;
+    for (let j = split; j < point; j++) {
+      const d = s.charCodeAt(j) - 48;
+      if (d < 0 || d > 9) return false;
+      low = low * 10 + d;
+    }
+    const whole = top * 1e9 + low;
+    if (fraction === 0) {
+      value[i] = start ? -whole : whole;
+      if (whole <= Number.MAX_SAFE_INTEGER) writeSafe(i, start ? -whole : whole);
+      else exact[i] = BigInt(s.slice(0, point));
+      scale[i] = 0;
+      return true;
+    }
+    if (whole > SCALE_4_LIMIT) return false;
+    const m = whole * SCALE_4 + fraction;
+    value[i] = (start ? -m : m) / SCALE_4;
+    writeSafe(i, start ? -m : m);
+    scale[i] = MAX_SCALE;
+    return true;
+  };
+
+  return (i, raw) => {
+    if (raw === null || raw === undefined) {
+      value[i] = NaN;
+      exact[i] = INEXACT;
+      scale[i] = MAX_SCALE;
+      return;
+    }
+    if (typeof raw === 'string' && writeText(i, raw)) return;
+    const v = typeof raw === 'number' ? raw : Number(raw);
+    value[i] = v;
+    const k = typeof raw === 'number' ? floatScale(v) : shortScale(raw, v);
+    if (k !== NOT_SHORT) {
+      writeSafe(i, k === 0 ? v : Math.round(v * SCALE_4));
+      scale[i] = k;
+      return;
+    }
+    const long = typeof raw === 'string' ? parseLongDecimal(raw) : null;
+    exact[i] = long ? long.mantissa : INEXACT;
+    scale[i] = long ? long.scale : MAX_SCALE;
+  };
+}
+
+/** Columnar copy of `rows`, in the same order. */
+export function columnsFromRows(
+  rows: LineSourceRow[],
+  table: StringTable = sessionStrings
+): LineItemColumns {
+  const n = rows.length;
+  const cols = allocColumns(n, table);
+  const setValue = valueWriter(cols);
+  for (let i = 0; i < n; i++) {
+    const r = rows[i];
+    cols.stmt[i] = stmtIndex(r.stmt);
+    cols.line[i] = Number(r.line);
+    cols.tag[i] = table.intern(r.tag);
+    cols.plabel[i] = r.plabel == null ? -1 : table.intern(r.plabel);
+    cols.uom[i] = table.intern(r.uom);
+    setValue(i, r.value);
+    cols.qtrs[i] = Number(r.qtrs);
+    cols.ddate[i] = ddateOrdinal(r.ddate);
+  }
+  return cols;
+}
+
+/** Row `i` as a plain LineItemRow (for rendering). */
+export function rowAt(cols: LineItemColumns, i: number): LineItemRow {
+  const { strings } = cols.table;
+  const value = cols.value[i];
+  const plabel = cols.plabel[i];
+  return {
+    line: cols.line[i],
+    plabel: plabel === -1 ? null : strings[plabel],
+    tag: strings[cols.tag[i]],
+    value: Number.isNaN(value) ? null : value,
+    uom: strings[cols.uom[i]],
+    qtrs: cols.qtrs[i],
+    ddate: ddateString(cols.ddate[i]),
+  };
+}
+
+// --- Persistence ---
+
+// String ids are only meaningful within their StringTable, so persisted
+// columns carry their own compact table and are re-interned on load.
+export type PackedColumns = Omit<LineItemColumns, 'table'> & { strings: string[] };
+
+export function packColumns(cols: LineItemColumns): PackedColumns {
+  const local = new StringTable();
+  const { strings } = cols.table;
+  return {
+    length: cols.length,
+    strings: local.strings,
+    stmt: cols.stmt,
+    line: cols.line,
+    tag: cols.tag.map((id) => local.intern(strings[id])),
+    plabel: cols.plabel.map((id) => (id === -1 ? -1 : local.intern(strings[id]))),
+    uom: cols.uom.map((id) => local.intern(strings[id])),
+    value: cols.value,
+    exact: cols.exact,
+    scale: cols.scale,
+    qtrs: cols.qtrs,
+    ddate: cols.ddate,
+  };
+}
+
+export function unpackColumns(
+  packed: PackedColumns,
+  table: StringTable = sessionStrings
+): LineItemColumns {
+  const ids = packed.strings.map((s) => table.intern(s));
+  return {
+    length: packed.length,
+    table,
+    stmt: packed.stmt,
+    line: packed.line,
+    tag: packed.tag.map((id) => ids[id]),
+    plabel: packed.plabel.map((id) => (id === -1 ? -1 : ids[id])),
+    uom: packed.uom.map((id) => ids[id]),
+    value: packed.value,
+    exact: packed.exact,
+    scale: packed.scale,
+    qtrs: packed.qtrs,
+    ddate: packed.ddate,
+  };
+}
+
+// PackedColumns as JSON, for the prebuilt Overview bundles: each typed array as
+// a plain array, and the value columns as one: decimal text where the value is
+// exact (valueWriter reads back the same float and mantissa), the bare float
+// where it is not.
+export type JsonColumns = {
+  strings: string[];
+  stmt: number[];
+  line: number[];
+  tag: number[];
+  plabel: number[];
+  uom: number[];
+  value: (string | number | null)[];
+  qtrs: number[];
+  ddate: number[];
+};
+
+// The exact value of row `i` as decimal text, the float when there is none.
+function valueText(packed: PackedColumns, i: number): string | number | null {
+  const v = packed.value[i];
+  if (Number.isNaN(v)) return null;
+  const m = packed.exact[i];
+  if (m === INEXACT) return v;
+  const k = packed.scale[i];
+  if (k === 0) return m.toString();
+  const negative = m < BigInt(0);
+  const digits = (negative ? -m : m).toString().padStart(k + 1, '0');
+  return `${negative ? '-' : ''}${digits.slice(0, -k)}.${digits.slice(-k)}`;
+}
+
+export function columnsToJson(packed: PackedColumns): JsonColumns {
+  const value = new Array<string | number | null>(packed.length);
+  for (let i = 0; i < packed.length; i++) value[i] = valueText(packed, i);
+  return {
+    strings: packed.strings,
+    stmt: Array.from(packed.stmt),
+    line: Array.from(packed.line),
+    tag: Array.from(packed.tag),
+    plabel: Array.from(packed.plabel),
+    uom: Array.from(packed.uom),
+    value,
+    qtrs: Array.from(packed.qtrs),
+    ddate: Array.from(packed.ddate),
+  };
+}
+
+export function columnsFromJson(json: JsonColumns): PackedColumns {
+  const n = json.stmt.length;
+  const cols = allocColumns(n, new StringTable());
+  cols.stmt.set(json.stmt);
+  cols.line.set(json.line);
+  cols.tag.set(json.tag);
+  cols.plabel.set(json.plabel);
+  cols.uom.set(json.uom);
+  cols.qtrs.set(json.qtrs);
+  cols.ddate.set(json.ddate);
+  const setValue = valueWriter(cols);
+  for (let i = 0; i < n; i++) {
+    const raw = json.value[i];
+    if (typeof raw !== 'number') {
+      setValue(i, raw);
+    } else {
+      cols.value[i] = raw;
+      cols.exact[i] = INEXACT;
+      cols.scale[i] = MAX_SCALE;
+    }
+  }
+  return {
+    length: n,
+    strings: json.strings,
+    stmt: cols.stmt,
+    line: cols.line,
+    tag: cols.tag,
+    plabel: cols.plabel,
+    uom: cols.uom,
+    value: cols.value,
+    exact: cols.exact,
+    scale: cols.scale,
+    qtrs: cols.qtrs,
+    ddate: cols.ddate,
+  };
+}
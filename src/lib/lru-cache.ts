@@ -0,0 +1,104 @@
+// Byte-budgeted LRU map for the in-session warehouse caches. Entry count is a
+// poor bound here (one filing can be 50 rows or 5,000), so each entry is
+// weighed with an estimated heap size and the least recently used entries are
+// evicted once the total passes the budget.
+
+/**
+ * Rough heap footprint of a structured-cloneable value, in bytes. Only used to
+ * budget caches, so it trades precision for a single cheap walk.
+ */
+export function approxBytes(value: unknown): number {
+  if (value === null || value === undefined) return 8;
+  switch (typeof value) {
+    case 'string':
+      return 16 + value.length * 2;
+    case 'number':
+    case 'boolean':
+      return 8;
+    case 'object': {
+      if (ArrayBuffer.isView(value)) return 64 + value.byteLength;
+      if (Array.isArray(value)) {
+        let n = 16;
+        for (const v of value) n += 8 + approxBytes(v);
+        return n;
+      }
+      let n = 32;
+      for (const v of Object.values(value)) n += 8 + approxBytes(v);
+      return n;
+    }
+    default:
+      return 8;
+  }
+}
+
+export type CacheStats = {
+  entries: number;
+  bytes: number;
+  maxBytes: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+};
+
+export class LruCache<K, V> {
+  // Map iteration order is insertion order, so re-inserting on access keeps the
+  // least recently used entry first.
+  private readonly entries = new Map<K, { value: V; bytes: number }>();
+  private bytes = 0;
+  private hits = 0;
+  private misses = 0;
+  private evictions = 0;
+
+  constructor(
+    private readonly maxBytes: number,
+    private readonly sizeOf: (value: V) => number = approxBytes
+  ) {}
+
+  /** Value for `key` (marking it most recently used), counted as a hit or miss. */
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+    this.hits++;
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  /** Presence check that neither counts nor refreshes recency. */
+  has(key: K): boolean {
+    return this.entries.has(key);
+  }
+
+  set(key: K, value: V): void {
+    const existing = this.entries.get(key);
+    if (existing) {
+      this.bytes -= existing.bytes;
+      this.entries.delete(key);
+    }
+    const bytes = this.sizeOf(value);
+    this.entries.set(key, { value, bytes });
+    this.bytes += bytes;
+
+    // Never evict the entry just written, even if it alone exceeds the budget.
+    for (const [k, e] of this.entries) {
+      if (this.bytes <= this.maxBytes || k === key) break;
+      this.entries.delete(k);
+      this.bytes -= e.bytes;
+      this.evictions++;
+    }
+  }
+
+  stats(): CacheStats {
+    return {
+      entries: this.entries.size,
+      bytes: this.bytes,
+      maxBytes: this.maxBytes,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+    };
+  }
+}
@@ -0,0 +1,203 @@
+// Priority scheduling for warehouse requests. Every PostgREST request the app
+// issues goes through `schedule`, tagged with a priority class:
+//
+//   critical  what the user is looking at (the Overview, an open statement)
+//   prefetch  speculative warm-ups that are likely to be needed soon
+//   idle      background upkeep (cache refreshes, filings warm-up)
+//
+// A lower class only starts while no higher-class request is queued, and idle
+// work only while nothing else is in flight, so warm-ups never sit in front of
+// the request the user is waiting on. Each class also has its own concurrency
+// cap. Requests carry their class to `fetch` as a priority hint (see
+// `./supabase`). The page runs the only scheduler: the warehouse worker hands
+// admission for its requests to the page (see `admitThrough`), so both share
+// one set of queues and caps.
+
+export type Priority = 'critical' | 'prefetch' | 'idle';
+
+const PRIORITIES: Priority[] = ['critical', 'prefetch', 'idle'];
+
+// Requests in flight per class.
+const LIMITS: Record<Priority, number> = { critical: 6, prefetch: 2, idle: 1 };
+
+// Request header carrying the class from `schedule` to the client's fetch,
+// which strips it before the request leaves the browser.
+export const PRIORITY_HEADER = 'x-ff-priority';
+
+/** The fetch() `priority` hint for a class. */
+export function fetchPriority(priority: Priority): 'high' | 'low' {
+  return priority === 'critical' ? 'high' : 'low';
+}
+
+/**
+ * The class a group of requests runs under. Mutable: `raise` moves a whole
+ * load (including requests already queued) up when a more urgent caller joins
+ * it, e.g. the dashboard mounting on a company that was only being prefetched.
+ */
+export type Lane = { priority: Priority };
+
+export function lane(priority: Priority = 'critical'): Lane {
+  return { priority };
+}
+
+const rank = (p: Priority) => PRIORITIES.indexOf(p);
+
+export function raise(target: Lane, priority: Priority): void {
+  if (rank(priority) >= rank(target.priority)) return;
+  target.priority = priority;
+  pump();
+}
+
+type Task = {
+  lane: Lane;
+  run: (priority: Priority) => PromiseLike<unknown>;
+  resolve: (value: unknown) => void;
+  reject: (err: unknown) => void;
+  enqueued: number;
+  detach?: () => void; // removes the abort listener once the task leaves the queue
+};
+
+const queue: Task[] = [];
+const active: Record<Priority, number> = { critical: 0, prefetch: 0, idle: 0 };
+
+type Counters = { started: number; maxQueued: number; totalWaitMs: number; maxWaitMs: number };
+
+const counters: Record<Priority, Counters> = {
+  critical: { started: 0, maxQueued: 0, totalWaitMs: 0, maxWaitMs: 0 },
+  prefetch: { started: 0, maxQueued: 0, totalWaitMs: 0, maxWaitMs: 0 },
+  idle: { started: 0, maxQueued: 0, totalWaitMs: 0, maxWaitMs: 0 },
+};
+
+export type SchedulerStats = Record<
+  Priority,
+  Counters & { queued: number; active: number; avgWaitMs: number }
+>;
+
+const queued = (p: Priority) => queue.filter((t) => t.lane.priority === p).length;
+
+/**
+ * Queue depth, concurrency and queueing delay per class, for debugging (e.g.
+ * from the browser console while switching companies).
+ */
+export function getSchedulerStats(): SchedulerStats {
+  const out = {} as SchedulerStats;
+  for (const p of PRIORITIES) {
+    const c = counters[p];
+    out[p] = {
+      ...c,
+      queued: queued(p),
+      active: active[p],
+      avgWaitMs: c.started ? c.totalWaitMs / c.started : 0,
+    };
+  }
+  return out;
+}
+
+/** A request slot granted by another context's scheduler. */
+export type Grant = { priority: Priority; release: () => void };
+
+export type Admit = (target: Lane, signal?: AbortSignal) => Promise<Grant>;
+
+let remoteAdmit: Admit | null = null;
+
+/**
+ * Admit this context's requests through another scheduler (the warehouse
+ * worker's, through the page's): `schedule` waits for a Grant from `admit`
+ * instead of queueing locally, runs under its class and releases it when the
+ * request settles. `admit` rejects if `signal` aborts first.
+ */
+export function admitThrough(admit: Admit): void {
+  remoteAdmit = admit;
+}
+
+async function runGranted<T>(
+  admit: Admit,
+  target: Lane,
+  run: (priority: Priority) => PromiseLike<T>,
+  signal?: AbortSignal
+): Promise<T> {
+  const grant = await admit(target, signal);
+  try {
+    return await run(grant.priority);
+  } finally {
+    grant.release();
+  }
+}
+
+/**
+ * Run `run` once its lane's class may start a request. `run` receives the
+ * class it actually started under (a lane can be raised while queued). Aborting
+ * `signal` while queued drops the task and rejects with the abort reason.
+ */
+export function schedule<T>(
+  target: Lane,
+  run: (priority: Priority) => PromiseLike<T>,
+  signal?: AbortSignal
+): Promise<T> {
+  if (signal?.aborted) return Promise.reject(signal.reason);
+  if (remoteAdmit) return runGranted(remoteAdmit, target, run, signal);
+  return new Promise<T>((resolve, reject) => {
+    const task: Task = {
+      lane: target,
+      run,
+      resolve: resolve as (value: unknown) => void,
+      reject,
+      enqueued: performance.now(),
+    };
+    queue.push(task);
+    const c = counters[target.priority];
+    c.maxQueued = Math.max(c.maxQueued, queued(target.priority));
+    if (signal) {
+      // Once started, the request itself sees the signal.
+      const onAbort = () => {
+        queue.splice(queue.indexOf(task), 1);
+        reject(signal.reason);
+      };
+      signal.addEventListener('abort', onAbort, { once: true });
+      task.detach = () => signal.removeEventListener('abort', onAbort);
+    }
+    pump();
+  });
+}
+
+function canStart(priority: Priority): boolean {
+  if (active[priority] >= LIMITS[priority]) return false;
+  const higher = PRIORITIES.slice(0, rank(priority));
+  if (queue.some((t) => higher.includes(t.lane.priority))) return false;
+  if (priority === 'idle' && (active.critical > 0 || active.prefetch > 0)) return false;
+  return true;
+}
+
+function pump(): void {
+  for (const p of PRIORITIES) {
+    while (canStart(p)) {
+      const i = queue.findIndex((t) => t.lane.priority === p);
+      if (i === -1) break;
+      const [task] = queue.splice(i, 1);
+      start(task, p);
+    }
+  }
+}
+
+function start(task: Task, priority: Priority): void {
+  task.detach?.();
+  const wait = performance.now() - task.enqueued;
+  const c = counters[priority];
+  c.started++;
+  c.totalWaitMs += wait;
+  c.maxWaitMs = Math.max(c.maxWaitMs, wait);
+  active[priority]++;
+
+  let result: PromiseLike<unknown>;
+  try {
+    result = task.run(priority);
+  } catch (err) {
+    result = Promise.reject(err);
+  }
+  Promise.resolve(result)
+    .then(task.resolve, task.reject)
+    .finally(() => {
+      active[priority]--;
+      pump();
+    });
+}
@@ -1,4 +1,5 @@
 import { createClient } from '@supabase/supabase-js';
+import { PRIORITY_HEADER, Priority, fetchPriority } from './scheduler';
 
 // Client-side Supabase client for the SEC fundamentals warehouse.
 // Uses the public anon key (safe to expose in the browser).
@@ -11,4 +12,17 @@ if (!supabaseUrl || !supabaseAnonKey) {
   );
 }
 
-export const supabase = createClient(supabaseUrl, supabaseAnonKey);
+// Turns the scheduler's priority header (see ./scheduler) into the fetch()
+// priority hint. The header itself never goes on the wire: it isn't in the
+// API's CORS allow-list.
+const prioritizedFetch: typeof fetch = (input, init) => {
+  const headers = new Headers(init?.headers);
+  const priority = headers.get(PRIORITY_HEADER) as Priority | null;
+  if (!priority) return fetch(input, init);
+  headers.delete(PRIORITY_HEADER);
+  return fetch(input, { ...init, headers, priority: fetchPriority(priority) } as RequestInit);
+};
+
+export const supabase = createClient(supabaseUrl, supabaseAnonKey, {
+  global: { fetch: prioritizedFetch },
+});
@@ -0,0 +1,486 @@
+// Binary ticker index: the SEC ticker file (data/company_tickers_exchange.json)
+// compiled at build time into sorted arrays that are binary-searched in place
+// through typed-array views. `encodeTickerIndex` runs during `next build` (see
+// src/app/data/tickers.bin/route.ts); the client fetches the result as one
+// ArrayBuffer and `TickerIndex` answers lookups from it directly, with no row
+// parsed or copied up front.
+//
+// Layout (little-endian), widest elements first so every view is aligned:
+//
+//   u32  header          MAGIC, VERSION, tickers, companies, tokens,
+//                        exchanges, name bytes, string bytes, CIK bytes,
+//                        other primaries, ticker bytes
+//   u32  stringOffset    [2 × tokens + exchanges + 1] into the string bytes:
+//                        token keys, then their forms, then exchange names
+//   u16  tickerCompany   [tickers] company of each ticker
+//   u16  otherPrimary    [2 × other primaries] company, ticker: a primary
+//                        listing whose ticker maps to another company (one
+//                        listed under it later), which the bit set can't hold
+//   u8   tickerPrimary   [⌈tickers / 8⌉] bit set: the ticker is its company's
+//                        primary listing
+//   u8   companyExchange [companies] exchange name index, NO_EXCHANGE = null
+//   u8   nameLength      [companies] UTF-8 bytes of each name
+//   u8   CIK bytes       companies' CIKs, ascending, as LEB128 deltas
+//   u8   ticker bytes    tickers, sorted and front-coded: the length of the
+//                        prefix shared with the previous one, the rest in
+//                        ASCII, then NUL
+//   u8   name bytes      UTF-8
+//   u8   string bytes    UTF-8
+//
+// Those coded columns are what compresses: stored plainly (u32 CIKs and name
+// offsets, u16 primary tickers, 8-byte ticker slots) they made up half of the
+// gzipped index. The constructor expands them into the arrays lookups search
+// (`companyCik`, `nameOffset`, `companyTicker`, NUL-padded `tickerSlots`) in
+// one pass each, about a millisecond in all; everything else is used in place.
+//
+// The file itself is served gzipped (see `gzipTickerIndex`), which no static
+// host can skip: the default content type for a .bin file is one that CDNs
+// such as Cloudflare do not compress on their own.
+//
+// Token keys (lowercase name tokens with a canonical spelling) are sorted and
+// ASCII, like tickers, so both are compared byte-for-char against the query.
+//
+// Resolving a ?ticker= URL only needs ticker -> CIK, so that part is also cut
+// into one small shard per first letter (`TickerShard`, a few KB each) that the
+// dashboard can fetch before the full index:
+//
+//   u32  header          SHARD_MAGIC, VERSION, tickers
+//   u32  tickerCik       [tickers]
+//   u8   tickerSlots     [tickers × 8] as above
+
+export const TICKER_INDEX_MAGIC = 0x49544646; // "FFTI"
+export const TICKER_SHARD_MAGIC = 0x53544646; // "FFTS"
+export const TICKER_INDEX_VERSION = 2;
+export const TICKER_SLOT = 8;
+export const NO_EXCHANGE = 255;
+const MAX_NAME_BYTES = 255;
+const HEADER_WORDS = 11;
+const SHARD_HEADER_WORDS = 3;
+
+/** Every shard key: a ticker's lowercased first letter, or "_" for the rest. */
+export const TICKER_SHARD_KEYS = [...'abcdefghijklmnopqrstuvwxyz', '_'];
+
+export function tickerShardKey(ticker: string): string {
+  const c = ticker.charAt(0).toLowerCase();
+  return c >= 'a' && c <= 'z' ? c : '_';
+}
+
+export type TickerInfo = { ticker: string; exchange: string | null; name: string };
+
+// Each row of the SEC file is [cik, name, ticker, exchange].
+export type TickerRow = [number, string, string, string | null];
+
+const utf8 = new TextDecoder();
+
+export class TickerIndex {
+  private readonly companyCik: Uint32Array;
+  private readonly nameOffset: Uint32Array;
+  private readonly stringOffset: Uint32Array;
+  private readonly tickerCompany: Uint16Array;
+  private readonly companyTicker: Uint16Array;
+  private readonly tickerSlots: Uint8Array;
+  private readonly companyExchange: Uint8Array;
+  private readonly names: Uint8Array;
+  private readonly strings: Uint8Array;
+  private readonly tokens: number;
+  // Decoded on first use; the UI asks for the same few companies repeatedly.
+  private readonly infoCache = new Map<number, TickerInfo | null>();
+
+  constructor(buffer: ArrayBuffer) {
+    const header = new Uint32Array(buffer, 0, HEADER_WORDS);
+    if (header[0] !== TICKER_INDEX_MAGIC || header[1] !== TICKER_INDEX_VERSION) {
+      throw new Error('Unrecognized ticker index');
+    }
+    const [, , tickers, companies, tokens, exchanges, nameBytes, stringBytes, cikBytes, others, tickerBytes] =
+      header;
+    let offset = HEADER_WORDS * 4;
+    const view = <T>(Type: new (b: ArrayBuffer, o: number, n: number) => T, n: number, width: number) => {
+      const v = new Type(buffer, offset, n);
+      offset += n * width;
+      return v;
+    };
+    this.stringOffset = view(Uint32Array, 2 * tokens + exchanges + 1, 4);
+    this.tickerCompany = view(Uint16Array, tickers, 2);
+    const otherPrimary = view(Uint16Array, 2 * others, 2);
+    const primary = view(Uint8Array, Math.ceil(tickers / 8), 1);
+    this.companyExchange = view(Uint8Array, companies, 1);
+    const nameLength = view(Uint8Array, companies, 1);
+    const cikDeltas = view(Uint8Array, cikBytes, 1);
+    const tickerText = view(Uint8Array, tickerBytes, 1);
+    this.names = view(Uint8Array, nameBytes, 1);
+    this.strings = view(Uint8Array, stringBytes, 1);
+    this.tokens = tokens;
+
+    this.companyCik = new Uint32Array(companies);
+    this.nameOffset = new Uint32Array(companies + 1);
+    let cik = 0;
+    let at = 0;
+    for (let i = 0; i < companies; i++) {
+      let delta = 0;
+      let shift = 0;
+      let byte: number;
+      do {
+        byte = cikDeltas[at++];
+        delta += (byte & 0x7f) * 2 ** shift;
+        shift += 7;
+      } while (byte & 0x80);
+      this.companyCik[i] = cik += delta;
+      this.nameOffset[i + 1] = this.nameOffset[i] + nameLength[i];
+    }
+    this.tickerSlots = new Uint8Array(tickers * TICKER_SLOT);
+    for (let i = 0, at = 0; i < tickers; i++) {
+      const slot = i * TICKER_SLOT;
+      const shared = tickerText[at++];
+      if (shared) this.tickerSlots.copyWithin(slot, slot - TICKER_SLOT, slot - TICKER_SLOT + shared);
+      for (let k = shared; tickerText[at] !== 0; k++) this.tickerSlots[slot + k] = tickerText[at++];
+      at++;
+    }
+    this.companyTicker = new Uint16Array(companies);
+    for (let i = 0; i < tickers; i++) {
+      if (primary[i >>> 3] & (1 << (i & 7))) this.companyTicker[this.tickerCompany[i]] = i;
+    }
+    for (let i = 0; i < others; i++) this.companyTicker[otherPrimary[2 * i]] = otherPrimary[2 * i + 1];
+  }
+
+  /** CIK listed under `ticker` (already upper-cased), or null. */
+  cik(ticker: string): number | null {
+    const i = searchSlots(this.tickerSlots, ticker);
+    return i === -1 ? null : this.companyCik[this.tickerCompany[i]];
+  }
+
+  /** Primary listing of `cik`, or null. */
+  info(cik: number): TickerInfo | null {
+    let info = this.infoCache.get(cik);
+    if (info !== undefined) return info;
+    const i = searchNumber(this.companyCik, cik);
+    if (i === -1) {
+      info = null;
+    } else {
+      const exchange = this.companyExchange[i];
+      info = {
+        ticker: slotString(this.tickerSlots, this.companyTicker[i]),
+        exchange: exchange === NO_EXCHANGE ? null : this.string(2 * this.tokens + exchange),
+        name: utf8.decode(this.names.subarray(this.nameOffset[i], this.nameOffset[i + 1])),
+      };
+    }
+    this.infoCache.set(cik, info);
+    return info;
+  }
+
+  /** Canonical spelling of a lowercase name token, or null. */
+  tokenCase(key: string): string | null {
+    let lo = 0;
+    let hi = this.tokens - 1;
+    while (lo <= hi) {
+      const mid = (lo + hi) >>> 1;
+      const start = this.stringOffset[mid];
+      const c = compareBytes(this.strings, start, this.stringOffset[mid + 1] - start, key);
+      if (c === 0) return this.string(this.tokens + mid);
+      if (c < 0) lo = mid + 1;
+      else hi = mid - 1;
+    }
+    return null;
+  }
+
+  private string(id: number): string {
+    return utf8.decode(this.strings.subarray(this.stringOffset[id], this.stringOffset[id + 1]));
+  }
+}
+
+/** The ticker -> CIK entries of one shard key; see the layout above. */
+export class TickerShard {
+  private readonly tickerCik: Uint32Array;
+  private readonly tickerSlots: Uint8Array;
+
+  constructor(buffer: ArrayBuffer) {
+    const header = new Uint32Array(buffer, 0, SHARD_HEADER_WORDS);
+    if (header[0] !== TICKER_SHARD_MAGIC || header[1] !== TICKER_INDEX_VERSION) {
+      throw new Error('Unrecognized ticker shard');
+    }
+    const tickers = header[2];
+    this.tickerCik = new Uint32Array(buffer, SHARD_HEADER_WORDS * 4, tickers);
+    this.tickerSlots = new Uint8Array(buffer, (SHARD_HEADER_WORDS + tickers) * 4, tickers * TICKER_SLOT);
+  }
+
+  /** CIK listed under `ticker` (already upper-cased), or null. */
+  cik(ticker: string): number | null {
+    const i = searchSlots(this.tickerSlots, ticker);
+    return i === -1 ? null : this.tickerCik[i];
+  }
+}
+
+// Compares the ASCII bytes at [start, start + len) with `s`, in the order
+// Array.prototype.sort gives strings.
+function compareBytes(bytes: Uint8Array, start: number, len: number, s: string): number {
+  const n = Math.min(len, s.length);
+  for (let k = 0; k < n; k++) {
+    const d = bytes[start + k] - s.charCodeAt(k);
+    if (d !== 0) return d;
+  }
+  return len - s.length;
+}
+
+function slotLength(slots: Uint8Array, i: number): number {
+  const start = i * TICKER_SLOT;
+  let len = 0;
+  while (len < TICKER_SLOT && slots[start + len] !== 0) len++;
+  return len;
+}
+
+function slotString(slots: Uint8Array, i: number): string {
+  const start = i * TICKER_SLOT;
+  return String.fromCharCode(...slots.subarray(start, start + slotLength(slots, i)));
+}
+
+// Position of `ticker` in sorted ticker slots, or -1.
+function searchSlots(slots: Uint8Array, ticker: string): number {
+  if (ticker.length > TICKER_SLOT) return -1;
+  let lo = 0;
+  let hi = slots.length / TICKER_SLOT - 1;
+  while (lo <= hi) {
+    const mid = (lo + hi) >>> 1;
+    const c = compareBytes(slots, mid * TICKER_SLOT, slotLength(slots, mid), ticker);
+    if (c === 0) return mid;
+    if (c < 0) lo = mid + 1;
+    else hi = mid - 1;
+  }
+  return -1;
+}
+
+function searchNumber(sorted: Uint32Array, n: number): number {
+  let lo = 0;
+  let hi = sorted.length - 1;
+  while (lo <= hi) {
+    const mid = (lo + hi) >>> 1;
+    if (sorted[mid] === n) return mid;
+    if (sorted[mid] < n) lo = mid + 1;
+    else hi = mid - 1;
+  }
+  return -1;
+}
+
+// --- Build ---
+
+// Proper-casing for stylized (camelCase) company names: SEC filing names are
+// usually ALL CAPS, which naive title-casing renders as e.g. "Blackrock". The
+// ticker file, however, stores the correct casing for hundreds of camelCase
+// brands ("BlackRock", "PayPal", ...), so the index keeps the dominant
+// clean-camelCase spelling of each token for the UI to restore. CLEAN_CAMEL
+// intentionally skips non-standard stylizations (e.g. "BlockchAIn", "iMAGE",
+// "AIxCrypto") so ordinary words are never mangled.
+const CLEAN_CAMEL = /^[A-Za-z][a-z]*([A-Z][a-z]+)+$/;
+
+/** A name token with surrounding punctuation removed, as tokens are keyed. */
+export const stripEnds = (w: string) => w.replace(/^[^A-Za-z0-9]+|[^A-Za-z0-9.&]+$/g, '');
+
+function tokenCases(rows: TickerRow[]): Map<string, string> {
+  const formCounts = new Map<string, Map<string, number>>();
+  for (const row of rows) {
+    const name = row[1];
+    if (!name) continue;
+    for (const raw of name.split(/\s+/)) {
+      const word = stripEnds(raw);
+      if (!word || !/[a-z][A-Z]/.test(word) || !CLEAN_CAMEL.test(word)) continue;
+      const key = word.toLowerCase();
+      let forms = formCounts.get(key);
+      if (!forms) {
+        forms = new Map();
+        formCounts.set(key, forms);
+      }
+      forms.set(word, (forms.get(word) ?? 0) + 1);
+    }
+  }
+  // Keep the most common spelling for each token, the first seen on a tie.
+  const cases = new Map<string, string>();
+  for (const [key, forms] of formCounts) {
+    let best = '';
+    let bestCount = -1;
+    for (const [form, count] of forms) {
+      if (count > bestCount) {
+        best = form;
+        bestCount = count;
+      }
+    }
+    cases.set(key, best);
+  }
+  return cases;
+}
+
+// Keys are compared byte-for-char against UTF-16 queries, which only agree on
+// ASCII.
+function ascii(s: string): string {
+  if (!/^[\x00-\x7f]*$/.test(s)) throw new Error(`Non-ASCII key in ticker index: ${s}`);
+  return s;
+}
+
+const utf8Encoder = new TextEncoder();
+
+// Concatenated UTF-8 strings plus their [n + 1] start offsets.
+function stringBlob(strings: string[]): { offsets: Uint32Array; bytes: Uint8Array } {
+  const encoded = strings.map((s) => utf8Encoder.encode(s));
+  const offsets = new Uint32Array(strings.length + 1);
+  for (let i = 0; i < encoded.length; i++) offsets[i + 1] = offsets[i] + encoded[i].length;
+  const bytes = new Uint8Array(offsets[strings.length]);
+  for (let i = 0; i < encoded.length; i++) bytes.set(encoded[i], offsets[i]);
+  return { offsets, bytes };
+}
+
+// Ticker -> CIK (a ticker listed more than once maps to its last row's CIK)
+// and each company's first row as its primary listing.
+function listings(rows: TickerRow[]): {
+  tickerToCik: Map<string, number>;
+  cikToInfo: Map<number, TickerInfo>;
+} {
+  const tickerToCik = new Map<string, number>();
+  const cikToInfo = new Map<number, TickerInfo>();
+  for (const [cik, name, ticker, exchange] of rows) {
+    if (!ticker) continue;
+    const t = ticker.toUpperCase();
+    const c = Number(cik);
+    tickerToCik.set(t, c);
+    if (!cikToInfo.has(c)) cikToInfo.set(c, { ticker: t, exchange: exchange ?? null, name });
+  }
+  return { tickerToCik, cikToInfo };
+}
+
+// Sorted tickers as NUL-padded slots. Default sort is UTF-16 code unit order,
+// the order compareBytes assumes.
+function encodeSlots(tickers: string[]): Uint8Array {
+  const slots = new Uint8Array(tickers.length * TICKER_SLOT);
+  tickers.forEach((t, i) => {
+    if (t.length > TICKER_SLOT) throw new Error(`Ticker too long for the index: ${t}`);
+    slots.set(utf8Encoder.encode(ascii(t)), i * TICKER_SLOT);
+  });
+  return slots;
+}
+
+// Sorted tickers front-coded: per ticker, the length of the prefix it shares
+// with the one before, the rest of it, and a NUL.
+function encodeTickers(tickers: string[]): Uint8Array {
+  const bytes: number[] = [];
+  let prev = '';
+  for (const t of tickers) {
+    if (t.length > TICKER_SLOT) throw new Error(`Ticker too long for the index: ${t}`);
+    let shared = 0;
+    while (shared < t.length && t[shared] === prev[shared]) shared++;
+    bytes.push(shared, ...utf8Encoder.encode(ascii(t.slice(shared))), 0);
+    prev = t;
+  }
+  return new Uint8Array(bytes);
+}
+
+// Ascending numbers as LEB128-coded differences from the previous one.
+function encodeDeltas(sorted: number[]): Uint8Array {
+  const bytes: number[] = [];
+  let prev = 0;
+  for (const n of sorted) {
+    let delta = n - prev;
+    prev = n;
+    while (delta >= 0x80) {
+      bytes.push((delta % 0x80) | 0x80);
+      delta = Math.floor(delta / 0x80);
+    }
+    bytes.push(delta);
+  }
+  return new Uint8Array(bytes);
+}
+
+function concat(sections: ArrayBufferView[]): Uint8Array {
+  const out = new Uint8Array(sections.reduce((n, s) => n + s.byteLength, 0));
+  let at = 0;
+  for (const s of sections) {
+    out.set(new Uint8Array(s.buffer, s.byteOffset, s.byteLength), at);
+    at += s.byteLength;
+  }
+  return out;
+}
+
+/** Compile SEC ticker rows into the index `TickerIndex` reads. */
+export function encodeTickerIndex(rows: TickerRow[]): Uint8Array {
+  const { tickerToCik, cikToInfo } = listings(rows);
+  const cases = tokenCases(rows);
+
+  const tickers = [...tickerToCik.keys()].sort();
+  const ciks = [...cikToInfo.keys()].sort((a, b) => a - b);
+  const tokens = [...cases.keys()].map(ascii).sort();
+  const exchanges = [
+    ...new Set([...cikToInfo.values()].map((i) => i.exchange).filter((e): e is string => e !== null)),
+  ];
+  if (ciks.length > 0xffff || tickers.length > 0xffff || exchanges.length >= NO_EXCHANGE) {
+    throw new Error('Ticker index overflow');
+  }
+  const companyAt = new Map(ciks.map((c, i) => [c, i]));
+  const names = stringBlob(ciks.map((c) => cikToInfo.get(c)!.name));
+  const strings = stringBlob([...tokens, ...tokens.map((k) => cases.get(k)!), ...exchanges]);
+  const cikDeltas = encodeDeltas(ciks);
+  const tickerText = encodeTickers(tickers);
+
+  const tickerAt = new Map(tickers.map((t, i) => [t, i]));
+  const primary = new Uint8Array(Math.ceil(tickers.length / 8));
+  const otherPrimary: number[] = [];
+  ciks.forEach((c, company) => {
+    const t = cikToInfo.get(c)!.ticker;
+    const i = tickerAt.get(t)!;
+    if (tickerToCik.get(t) === c) primary[i >>> 3] |= 1 << (i & 7);
+    else otherPrimary.push(company, i);
+  });
+  const nameLength = ciks.map((_, i) => names.offsets[i + 1] - names.offsets[i]);
+  if (nameLength.some((n) => n > MAX_NAME_BYTES)) throw new Error('Company name too long for the index');
+
+  return concat([
+    new Uint32Array([
+      TICKER_INDEX_MAGIC,
+      TICKER_INDEX_VERSION,
+      tickers.length,
+      ciks.length,
+      tokens.length,
+      exchanges.length,
+      names.bytes.length,
+      strings.bytes.length,
+      cikDeltas.length,
+      otherPrimary.length / 2,
+      tickerText.length,
+    ]),
+    strings.offsets,
+    new Uint16Array(tickers.map((t) => companyAt.get(tickerToCik.get(t)!)!)),
+    new Uint16Array(otherPrimary),
+    primary,
+    new Uint8Array(ciks.map((c) => {
+      const { exchange } = cikToInfo.get(c)!;
+      return exchange === null ? NO_EXCHANGE : exchanges.indexOf(exchange);
+    })),
+    new Uint8Array(nameLength),
+    cikDeltas,
+    tickerText,
+    names.bytes,
+    strings.bytes,
+  ]);
+}
+
+/** `index` gzipped, as tickers.bin is served. */
+export function gzipTickerIndex(index: Uint8Array): Promise<ArrayBuffer> {
+  const stream = new Blob([index as Uint8Array<ArrayBuffer>]).stream();
+  return new Response(stream.pipeThrough(new CompressionStream('gzip'))).arrayBuffer();
+}
+
+/**
+ * The index in a fetched tickers.bin: inflated, unless something on the way
+ * (a host that sent it with Content-Encoding: gzip) already did.
+ */
+export function readTickerIndexFile(file: ArrayBuffer): Promise<ArrayBuffer> {
+  const head = new Uint8Array(file, 0, Math.min(2, file.byteLength));
+  if (head[0] !== 0x1f || head[1] !== 0x8b) return Promise.resolve(file);
+  const stream = new Blob([file]).stream();
+  return new Response(stream.pipeThrough(new DecompressionStream('gzip'))).arrayBuffer();
+}
+
+/** Compile the `TickerShard` holding every ticker under shard `key`. */
+export function encodeTickerShard(rows: TickerRow[], key: string): Uint8Array {
+  const { tickerToCik } = listings(rows);
+  const tickers = [...tickerToCik.keys()].filter((t) => tickerShardKey(t) === key).sort();
+  return concat([
+    new Uint32Array([TICKER_SHARD_MAGIC, TICKER_INDEX_VERSION, tickers.length]),
+    new Uint32Array(tickers.map((t) => tickerToCik.get(t)!)),
+    encodeSlots(tickers),
+  ]);
+}
@@ -2,34 +2,52 @@
 // (https://www.sec.gov/files/company_tickers_exchange.json). Lets the
 // ticker-based search/URLs work against the warehouse, which is keyed by CIK.
 //
-// The JSON is ~500 KB, so it is pulled in with a dynamic import() — its own lazy
-// chunk — instead of being statically bundled into every route's initial load.
-// Callers either `await loadTickerData()` (and gate on `tickerDataReady()`) or
-// use the sync accessors, which return null until the data has loaded and kick
-// off the load in the background.
+// The JSON is ~500 KB and only a handful of lookups are ever made, so it is
+// never shipped: the build compiles it into a gzipped binary index (see
+// ./ticker-index), which is fetched once, inflated and queried in place. Callers either
+// `await loadTickerData()` (and gate on `tickerDataReady()`) or use the sync
+// accessors, which return null until the index has loaded and kick off the
+// load in the background. `resolveTicker` answers ticker -> CIK from a
+// per-letter shard of a few KB instead, for when that one lookup is all that
+// stands between a page and its first query.
 
-// Each row is [cik, name, ticker, exchange].
-type TickerRow = [number, string, string, string | null];
+import {
+  TickerIndex,
+  TickerInfo,
+  TickerShard,
+  readTickerIndexFile,
+  stripEnds,
+  tickerShardKey,
+} from './ticker-index';
 
-export type TickerInfo = { ticker: string; exchange: string | null; name: string };
+export type { TickerInfo };
 
-let rows: TickerRow[] = [];
-let tickerToCikMap: Map<string, number> | null = null;
-let cikToInfoMap: Map<number, TickerInfo> | null = null;
-let tokenCaseMap: Map<string, string> | null = null;
+const TICKER_INDEX_PATH = '/data/tickers.bin';
+
+function tickerShardPath(key: string): string {
+  return `/data/tickers/${key}.bin`;
+}
+
+let index: TickerIndex | null = null;
 let loadPromise: Promise<void> | null = null;
+const shards = new Map<string, Promise<TickerShard>>();
+
+async function fetchBuffer(path: string): Promise<ArrayBuffer> {
+  const res = await fetch(path);
+  if (!res.ok) throw new Error(`Ticker data fetch failed: ${path} ${res.status}`);
+  return res.arrayBuffer();
+}
 
 /**
- * Load and index the SEC ticker dataset (memoized). Resolves once the maps are
- * built; safe to call repeatedly. Resets on failure so a later call can retry.
+ * Load the prebuilt ticker index (memoized). Resolves once it is ready to
+ * query; safe to call repeatedly. Resets on failure so a later call can retry.
  */
 export function loadTickerData(): Promise<void> {
   if (!loadPromise) {
-    loadPromise = import('./data/company_tickers_exchange.json')
-      .then((mod) => {
-        rows = (mod.default as unknown as { fields: string[]; data: TickerRow[] }).data;
-        build();
-        buildTokenCase();
+    loadPromise = fetchBuffer(TICKER_INDEX_PATH)
+      .then(readTickerIndexFile)
+      .then((buffer) => {
+        index = new TickerIndex(buffer);
       })
       .catch((err) => {
         loadPromise = null;
@@ -39,83 +57,49 @@ export function loadTickerData(): Promise<void> {
   return loadPromise;
 }
 
-/** Whether the ticker maps have finished loading and are ready to query. */
-export function tickerDataReady(): boolean {
-  return cikToInfoMap != null;
+// Background load for the sync accessors. A failure (or a relative fetch
+// during prerendering, where there is no origin) just leaves them returning
+// null; the next call retries.
+function loadInBackground(): void {
+  loadTickerData().catch(() => {});
 }
 
-function build() {
-  tickerToCikMap = new Map();
-  cikToInfoMap = new Map();
-  for (const [cik, name, ticker, exchange] of rows) {
-    if (!ticker) continue;
-    const t = ticker.toUpperCase();
-    const c = Number(cik);
-    tickerToCikMap.set(t, c);
-    // Keep the first listing seen as the primary ticker for a CIK.
-    if (!cikToInfoMap.has(c)) {
-      cikToInfoMap.set(c, { ticker: t, exchange: exchange ?? null, name });
-    }
-  }
+/** Whether the ticker index has finished loading and is ready to query. */
+export function tickerDataReady(): boolean {
+  return index != null;
 }
 
 export function tickerToCik(ticker: string): number | null {
-  if (!tickerToCikMap) {
-    void loadTickerData();
+  if (!index) {
+    loadInBackground();
     return null;
   }
-  return tickerToCikMap.get(ticker.trim().toUpperCase()) ?? null;
+  return index.cik(ticker.trim().toUpperCase());
 }
 
-export function cikToTicker(cik: number): TickerInfo | null {
-  if (!cikToInfoMap) {
-    void loadTickerData();
-    return null;
+/**
+ * CIK listed under `ticker`, from the full index if it has loaded and otherwise
+ * from the ticker's shard (memoized; a failed fetch is retried next call).
+ */
+export async function resolveTicker(ticker: string): Promise<number | null> {
+  const t = ticker.trim().toUpperCase();
+  if (index) return index.cik(t);
+  const key = tickerShardKey(t);
+  let shard = shards.get(key);
+  if (!shard) {
+    shard = fetchBuffer(tickerShardPath(key)).then((buffer) => new TickerShard(buffer));
+    shards.set(key, shard);
+    shard.catch(() => shards.delete(key));
   }
-  return cikToInfoMap.get(Number(cik)) ?? null;
+  return (await shard).cik(t);
 }
 
-// --- Proper-casing for stylized (camelCase) company names ---
-//
-// SEC filing names are usually ALL CAPS, which naive title-casing renders as
-// e.g. "Blackrock". The ticker file, however, stores the correct casing for
-// hundreds of camelCase brands ("BlackRock", "PayPal", ...). We harvest the
-// dominant clean-camelCase spelling of each token so the UI can restore it.
-// CLEAN_CAMEL intentionally skips non-standard stylizations (e.g. "BlockchAIn",
-// "iMAGE", "AIxCrypto") so ordinary words are never mangled.
-const CLEAN_CAMEL = /^[A-Za-z][a-z]*([A-Z][a-z]+)+$/;
-const stripEnds = (w: string) => w.replace(/^[^A-Za-z0-9]+|[^A-Za-z0-9.&]+$/g, '');
-
-function buildTokenCase() {
-  const formCounts = new Map<string, Map<string, number>>();
-  for (const row of rows) {
-    const name = row[1];
-    if (!name) continue;
-    for (const raw of name.split(/\s+/)) {
-      const word = stripEnds(raw);
-      if (!word || !/[a-z][A-Z]/.test(word) || !CLEAN_CAMEL.test(word)) continue;
-      const key = word.toLowerCase();
-      let forms = formCounts.get(key);
-      if (!forms) {
-        forms = new Map();
-        formCounts.set(key, forms);
-      }
-      forms.set(word, (forms.get(word) ?? 0) + 1);
-    }
-  }
-  // Keep the most common spelling for each token.
-  tokenCaseMap = new Map();
-  for (const [key, forms] of formCounts) {
-    let best = '';
-    let bestCount = -1;
-    for (const [form, count] of forms) {
-      if (count > bestCount) {
-        best = form;
-        bestCount = count;
-      }
-    }
-    tokenCaseMap.set(key, best);
+export function cikToTicker(cik: number): TickerInfo | null {
+  if (!index) {
+    loadInBackground();
+    return null;
   }
+  return index.info(Number(cik));
 }
 
 /**
@@ -123,10 +107,9 @@ function buildTokenCase() {
  * "BlackRock") if the SEC ticker data knows one, else null.
  */
 export function properCaseToken(word: string): string | null {
-  if (!tokenCaseMap) {
-    void loadTickerData();
+  if (!index) {
+    loadInBackground();
     return null;
   }
-  const key = stripEnds(word).toLowerCase();
-  return tokenCaseMap.get(key) ?? null;
+  return index.tokenCase(stripEnds(word).toLowerCase());
 }
@@ -1,4 +1,5 @@
 export type StockItem = {
+  cik?: number; // set for warehouse companies
   ticker: string;
   companyName: string;
   listedExchange?: string[] | null;
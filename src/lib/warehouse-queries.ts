@@ -0,0 +1,524 @@
+import { supabase } from './supabase';
+import { Lane, PRIORITY_HEADER, lane as newLane, schedule } from './scheduler';
+import { FilingMeta, AnnualOverview, CanonicalField, CanonicalYearFacts } from './types';
+import { STATEMENT_CODES, buildAnnualOverview, mergeCanonicalFacts } from './xbrl';
+import {
+  LineItemColumns,
+  LineSourceRow,
+  PackedColumns,
+  StringTable,
+  allocColumns,
+  columnsFromRows,
+  packColumns,
+  sessionStrings,
+  stmtIndex,
+  valueWriter,
+} from './line-columns';
+
+// Stateless warehouse reads: paging helpers, the per-filing line item query and
+// the company snapshot load, each returning plain or columnar results. Nothing
+// here touches the session caches or browser storage, so the same code runs on
+// the main thread, in `./warehouse.worker` and in the build-time bundle job;
+// `./warehouse` owns caching and decides where each read executes.
+
+const OVERVIEW_STMT_CODES = [...STATEMENT_CODES, 'EQ'] as const;
+
+export const PAGE_SIZE = 1000;
+
+// Page requests kept in flight at once by `fetchAllRows` in parallel mode.
+// Enough to collapse a large filer's pages into ~2 round trips without
+// flooding the browser's per-host connection pool.
+const PAGE_FANOUT = 4;
+
+type Page<T> = { data: T[] | null; error: unknown; count?: number | null };
+
+// How a read runs: `signal` cancels it (queued requests are dropped, in-flight
+// ones aborted) and `lane` sets its scheduling class (see ./scheduler;
+// critical when omitted).
+export type ReadOptions = { signal?: AbortSignal; lane?: Lane };
+
+// The PostgREST builder surface runQuery needs.
+type Query<R> = PromiseLike<R> & {
+  abortSignal(signal: AbortSignal): Query<R>;
+  setHeader(name: string, value: string): Query<R>;
+};
+
+/**
+ * One PostgREST request, built when the scheduler lets it start, so its
+ * priority header reflects the class it actually runs under.
+ */
+export function runQuery<R>(build: () => Query<R>, opts: ReadOptions = {}): Promise<R> {
+  const { signal, lane = newLane() } = opts;
+  return schedule(
+    lane,
+    (priority) => {
+      const q = build().setHeader(PRIORITY_HEADER, priority);
+      return signal ? q.abortSignal(signal) : q;
+    },
+    signal
+  );
+}
+
+// PostgREST caps every response at a fixed number of rows (1000 by default), and
+// it does so silently — no error. Any query that can exceed that must page with
+// `.range()` or it will quietly drop data. `buildPage` must apply a
+// deterministic (total) ordering so rows don't shift between page requests.
+//
+// 'serial' pages until a short page comes back. 'parallel' asks for an exact
+// row count alongside the first page (`buildPage` must pass
+// `{ count: 'exact' }` to `.select()` when `withCount` is set), then fetches the
+// remaining pages concurrently, at most PAGE_FANOUT at a time, and reassembles
+// them in order; the first page to fail aborts the others. Every page goes
+// through runQuery under `opts`.
+export async function fetchAllRows<T>(
+  buildPage: (from: number, to: number, withCount: boolean) => Query<Page<T>>,
+  mode: 'serial' | 'parallel' = 'serial',
+  opts: ReadOptions = {}
+): Promise<T[]> {
+  const page = (from: number, withCount: boolean, pageOpts = opts) =>
+    runQuery(() => buildPage(from, from + PAGE_SIZE - 1, withCount), pageOpts);
+
+  const first = await page(0, mode === 'parallel');
+  if (first.error) throw first.error;
+  const all: T[] = first.data ?? [];
+  if (all.length < PAGE_SIZE) return all;
+
+  let from = PAGE_SIZE;
+  if (mode === 'parallel' && typeof first.count === 'number') {
+    const offsets: number[] = [];
+    for (let o = PAGE_SIZE; o < first.count; o += PAGE_SIZE) offsets.push(o);
+    const pages: T[][] = new Array(offsets.length);
+    // Aborted by the caller's signal or by the first failed page, so no
+    // sibling starts or finishes a page once the result is lost anyway.
+    const pool = new AbortController();
+    const stop = () => pool.abort(opts.signal?.reason);
+    opts.signal?.addEventListener('abort', stop, { once: true });
+    let next = 0;
+    const worker = async () => {
+      while (next < offsets.length && !pool.signal.aborted) {
+        const i = next++;
+        const { data, error } = await page(offsets[i], false, { ...opts, signal: pool.signal });
+        if (error) throw error;
+        pages[i] = data ?? [];
+      }
+    };
+    try {
+      await Promise.all(
+        Array.from({ length: Math.min(PAGE_FANOUT, offsets.length) }, () =>
+          worker().catch((err) => {
+            pool.abort();
+            throw err;
+          })
+        )
+      );
+      // The caller aborted while the last pages were already settling.
+      pool.signal.throwIfAborted();
+    } finally {
+      opts.signal?.removeEventListener('abort', stop);
+    }
+    for (const page of pages) all.push(...page);
+    // Rows ingested after the count was taken land past the last counted page;
+    // only a full final page can have more behind it.
+    const last = pages[pages.length - 1];
+    if (last && last.length < PAGE_SIZE) return all;
+    from = PAGE_SIZE * (offsets.length + 1);
+  }
+
+  for (; ; from += PAGE_SIZE) {
+    const { data, error } = await page(from, false);
+    if (error) throw error;
+    if (!data || data.length === 0) break;
+    all.push(...data);
+    if (data.length < PAGE_SIZE) break;
+  }
+  return all;
+}
+
+// Resume point for keyset paging: a leading-column lower bound (so Postgres can
+// seek the index) plus the PostgREST `or` filter for "strictly after the last
+// row" across all the ordering columns.
+type KeysetCursor = { column: string; value: string | number; filter: string };
+
+// PostgREST filter literal; strings are double-quoted so reserved characters
+// (`,.:()`) in values like `uom` can't break the expression.
+function keysetLiteral(value: unknown): string {
+  if (typeof value === 'number') return String(value);
+  return `"${String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"')}"`;
+}
+
+function keysetCursor<T extends Record<string, unknown>>(
+  keys: (keyof T & string)[],
+  row: T
+): KeysetCursor {
+  const clauses = keys.map((key, i) => {
+    const gt = `${key}.gt.${keysetLiteral(row[key])}`;
+    if (i === 0) return gt;
+    const eqs = keys.slice(0, i).map((k) => `${k}.eq.${keysetLiteral(row[k])}`);
+    return `and(${[...eqs, gt].join(',')})`;
+  });
+  const lead = row[keys[0]];
+  return {
+    column: keys[0],
+    value: typeof lead === 'number' ? lead : String(lead),
+    filter: clauses.join(','),
+  };
+}
+
+// Keyset ("seek") mode of fetchAllRows. Each page resumes strictly after the
+// last row of the previous one on `keys`, which must be the query's full
+// ascending `.order()` and non-null. Deep OFFSET pages make Postgres re-scan and
+// discard every earlier row, so long table walks get quadratically slower;
+// keyset pages are each a bounded index range scan. Pages are inherently
+// sequential, so small per-company reads are better served by 'parallel'.
+// `buildPage` applies the cursor (`.gte(column, value).or(filter)`) when given
+// one, plus `.limit(PAGE_SIZE)`.
+export async function fetchAllRowsKeyset<T extends Record<string, unknown>>(
+  keys: (keyof T & string)[],
+  buildPage: (after: KeysetCursor | null) => Query<Page<T>>,
+  opts: ReadOptions = {}
+): Promise<T[]> {
+  const all: T[] = [];
+  let after: KeysetCursor | null = null;
+  for (;;) {
+    const cursor = after;
+    const { data, error } = await runQuery(() => buildPage(cursor), opts);
+    if (error) throw error;
+    if (!data || data.length === 0) break;
+    all.push(...data);
+    if (data.length < PAGE_SIZE) break;
+    after = keysetCursor(keys, data[data.length - 1]);
+  }
+  return all;
+}
+
+// Shape of the raw rows returned by the overview query below, before xbrl
+// normalization. Columns can arrive as strings (numeric(28,4)) so widen those.
+type AnnualQueryRow = LineSourceRow & {
+  adsh: string;
+  form: string;
+  period: string | null;
+  fy: number | null;
+  fp: string | null;
+  filed: string | null;
+};
+
+type FundamentalRow = {
+  field: string;
+  ddate: string;
+  value: number | string | null;
+  qtrs: number | string;
+};
+
+const CANONICAL_FIELDS: CanonicalField[] = [
+  'revenue',
+  'operating_expenses',
+  'net_income',
+  'total_assets',
+  'operating_cash_flow',
+];
+
+function yearFromFundamentalRow(row: FundamentalRow): number | null {
+  const year = parseInt(String(row.ddate).slice(0, 4), 10);
+  return Number.isNaN(year) ? null : year;
+}
+
+/** Canonical KPIs keyed by fact year — CIK-scoped, latest restatement already resolved. */
+async function fetchCanonicalByYear(
+  cik: number,
+  opts: ReadOptions
+): Promise<Map<number, CanonicalYearFacts>> {
+  const data = await fetchAllRows<FundamentalRow>(
+    (from, to, withCount) =>
+      supabase
+        .from('fundamentals')
+        .select('field, ddate, value, qtrs', { count: withCount ? 'exact' : undefined })
+        .eq('cik', cik)
+        .in('field', CANONICAL_FIELDS)
+        .in('qtrs', [0, 4])
+        .order('ddate')
+        .order('field')
+        .range(from, to),
+    'parallel',
+    opts
+  );
+  return canonicalByYear(data);
+}
+
+function canonicalByYear(data: FundamentalRow[]): Map<number, CanonicalYearFacts> {
+  const byYear = new Map<number, CanonicalYearFacts>();
+  for (const row of data) {
+    const year = yearFromFundamentalRow(row);
+    if (year === null) continue;
+
+    const field = row.field as CanonicalField;
+    const qtrs = Number(row.qtrs);
+    const isAssets = field === 'total_assets';
+    if (isAssets ? qtrs !== 0 : qtrs !== 4) continue;
+
+    const value =
+      row.value === null || row.value === undefined ? null : Number(row.value);
+
+    const facts = byYear.get(year) ?? {};
+    facts[field] = value;
+    byYear.set(year, facts);
+  }
+  return byYear;
+}
+
+// --- Per-filing line items ---
+
+/** One filing's IS/BS/CF line items, as columns interned into `strings`. */
+export async function fetchLineItemColumns(
+  adsh: string,
+  strings: StringTable = sessionStrings,
+  opts: ReadOptions = {}
+): Promise<LineItemColumns> {
+  const data = await fetchAllRows<LineSourceRow>(
+    (from, to, withCount) =>
+      supabase
+        .from('line_item')
+        .select('stmt, line, plabel, tag, value::text, uom, qtrs, ddate', {
+          count: withCount ? 'exact' : undefined,
+        })
+        .eq('adsh', adsh)
+        .in('stmt', STATEMENT_CODES)
+        .order('line')
+        .order('ddate')
+        .order('tag')
+        .order('uom')
+        .order('qtrs')
+        .range(from, to),
+    'parallel',
+    opts
+  );
+  return columnsFromRows(data, strings);
+}
+
+// --- Company snapshot: Overview, filings and name ---
+
+// Everything a cold dashboard load needs for one company. `filings` and `name`
+// are absent when the source couldn't supply them (the per-table fallback
+// queries); getFilings / getCompanyName then query for themselves. `annual`
+// lists the filings the Overview was derived from, whose line items the
+// browser keeps for the Statements tab.
+export type CompanySnapshot = {
+  overview: AnnualOverview[];
+  filings?: FilingMeta[];
+  name?: string | null;
+  annual?: string[];
+};
+
+// The Overview line items as `company_bundle` sends them. A flat select
+// repeats the filing columns and the long tag/label strings on every row; here
+// each filing and each distinct tag/label/unit string is sent once and rows are
+// tuples of indices into them (ddate as YYYYMMDD), decoded straight into
+// columns by annualFromTuples.
+type AnnualRowTuple = [
+  filing: number,
+  stmt: string,
+  line: number,
+  plabel: number | null,
+  tag: number,
+  value: number | string | null,
+  uom: number,
+  qtrs: number,
+  ddate: number,
+];
+
+type NormalizedAnnualRows = {
+  filings: [
+    adsh: string,
+    form: string,
+    period: string | null,
+    fy: number | null,
+    fp: string | null,
+    filed: string | null,
+  ][];
+  strings: string[];
+  rows: AnnualRowTuple[];
+};
+
+// Response of the `company_bundle(p_cik)` Postgres function (see
+// supabase/company-bundle.sql): the four dashboard payloads in one round trip.
+type CompanyBundleResponse = {
+  overview: NormalizedAnnualRows | null;
+  canonical: FundamentalRow[] | null;
+  filings: FilingMeta[] | null;
+  name: string | null;
+};
+
+export type LoadedSnapshot = {
+  snapshot: CompanySnapshot;
+  lineItems: Map<string, LineItemColumns>;
+};
+
+// A LoadedSnapshot in transferable form: the line items as packed columns,
+// which carry their own strings and cross a worker boundary or go straight to
+// IndexedDB.
+export type PackedSnapshot = {
+  snapshot: CompanySnapshot;
+  lineItems: [adsh: string, cols: PackedColumns][];
+};
+
+export function packSnapshot({ snapshot, lineItems }: LoadedSnapshot): PackedSnapshot {
+  return {
+    snapshot,
+    lineItems: Array.from(lineItems, ([adsh, cols]) => [adsh, packColumns(cols)]),
+  };
+}
+
+// PostgREST's "function not in the schema cache" or Postgres'
+// undefined_function: the RPC isn't deployed, as opposed to deployed and
+// failing.
+function isMissingFunction(error: { code?: string }): boolean {
+  return error.code === 'PGRST202' || error.code === '42883';
+}
+
+// Query + derive the snapshot. Each annual filing's rows come back alongside,
+// in columnar form, for the browser path to backfill `lineItemsCache` (they
+// include the EQ rows, which groupStatements ignores). `strings` interns those
+// rows; the bundle job passes a fresh table per company so a full build doesn't
+// accumulate every label in the warehouse.
+export async function loadCompanySnapshot(
+  cik: number,
+  strings: StringTable = sessionStrings,
+  opts: ReadOptions = {}
+): Promise<LoadedSnapshot> {
+  const { data, error } = await runQuery(
+    () => supabase.rpc('company_bundle', { p_cik: cik }),
+    opts
+  );
+  opts.signal?.throwIfAborted();
+  if (error && !isMissingFunction(error)) throw error;
+  if (!error && data) {
+    const bundle = data as CompanyBundleResponse;
+    const { overview, lineItems } = deriveOverview(
+      bundle.overview ? annualFromTuples(bundle.overview, strings) : [],
+      canonicalByYear(bundle.canonical ?? [])
+    );
+    return {
+      snapshot: {
+        overview,
+        filings: bundle.filings ?? [],
+        name: bundle.name?.trim() || null,
+        annual: [...lineItems.keys()],
+      },
+      lineItems,
+    };
+  }
+
+  // `company_bundle` isn't deployed: fall back to the per-table queries.
+  const [rows, canonical] = await Promise.all([
+    fetchAllRows<AnnualQueryRow>(
+      (from, to, withCount) =>
+        supabase
+          .from('annual_line_items')
+          .select(
+            'adsh, form, period, fy, fp, filed, stmt, line, plabel, tag, value::text, uom, qtrs, ddate',
+            { count: withCount ? 'exact' : undefined }
+          )
+          .eq('cik', cik)
+          .in('stmt', [...OVERVIEW_STMT_CODES])
+          .order('line')
+          .order('ddate')
+          .order('adsh')
+          .order('tag')
+          .order('uom')
+          .order('qtrs')
+          .range(from, to),
+      'parallel',
+      opts
+    ),
+    fetchCanonicalByYear(cik, opts).catch(() => new Map<number, CanonicalYearFacts>()),
+  ]);
+  const { overview, lineItems } = deriveOverview(annualFromRows(rows, strings), canonical);
+  return { snapshot: { overview, annual: [...lineItems.keys()] }, lineItems };
+}
+
+type AnnualFiling = { filing: FilingMeta; cols: LineItemColumns };
+
+// Flat annual_line_items rows, grouped back into one column set per filing.
+function annualFromRows(data: AnnualQueryRow[], strings: StringTable): AnnualFiling[] {
+  const byAdsh = new Map<string, { filing: FilingMeta; rows: AnnualQueryRow[] }>();
+  for (const raw of data) {
+    const adsh = String(raw.adsh);
+    let entry = byAdsh.get(adsh);
+    if (!entry) {
+      entry = {
+        filing: {
+          adsh,
+          form: raw.form,
+          period: raw.period ?? null,
+          fy: raw.fy ?? null,
+          fp: raw.fp ?? null,
+          filed: raw.filed ?? null,
+        },
+        rows: [],
+      };
+      byAdsh.set(adsh, entry);
+    }
+    entry.rows.push(raw);
+  }
+  return Array.from(byAdsh.values(), ({ filing, rows }) => ({
+    filing,
+    cols: columnsFromRows(rows, strings),
+  }));
+}
+
+// The normalized payload, decoded without materializing a row object per line
+// item: one pass counts rows per filing, a second fills the typed arrays.
+function annualFromTuples(payload: NormalizedAnnualRows, strings: StringTable): AnnualFiling[] {
+  const ids = payload.strings.map((s) => strings.intern(s));
+  const counts = new Array<number>(payload.filings.length).fill(0);
+  for (const r of payload.rows) counts[r[0]]++;
+
+  const out = payload.filings.map(([adsh, form, period, fy, fp, filed], f) => ({
+    filing: { adsh, form, period, fy, fp, filed },
+    cols: allocColumns(counts[f], strings),
+  }));
+  const setValue = out.map(({ cols }) => valueWriter(cols));
+  const fill = new Array<number>(out.length).fill(0);
+  for (const [f, stmt, line, plabel, tag, value, uom, qtrs, ddate] of payload.rows) {
+    const cols = out[f].cols;
+    const i = fill[f]++;
+    cols.stmt[i] = stmtIndex(stmt);
+    cols.line[i] = line;
+    cols.tag[i] = ids[tag];
+    cols.plabel[i] = plabel === null ? -1 : ids[plabel];
+    cols.uom[i] = ids[uom];
+    setValue[f](i, value);
+    cols.qtrs[i] = qtrs;
+    cols.ddate[i] = ddate;
+  }
+  return out;
+}
+
+// Per-filing columns -> per-year Overview, with each filing's columns keyed by
+// accession for the caller to cache.
+function deriveOverview(
+  filings: AnnualFiling[],
+  canonical: Map<number, CanonicalYearFacts>
+): { overview: AnnualOverview[]; lineItems: Map<string, LineItemColumns> } {
+  const lineItems = new Map<string, LineItemColumns>();
+
+  // Newest filing first so that when two filings report the same fiscal year,
+  // dedup below keeps the most recent one (matches the old getFilings order).
+  const entries = [...filings].sort(
+    (a, b) =>
+      (b.filing.period ?? '').localeCompare(a.filing.period ?? '') ||
+      (b.filing.filed ?? '').localeCompare(a.filing.filed ?? '')
+  );
+
+  const byYear = new Map<number, AnnualOverview>();
+  for (const { filing, cols } of entries) {
+    lineItems.set(filing.adsh, cols);
+    const o = buildAnnualOverview(filing, cols);
+    if (!o) continue;
+    const merged = mergeCanonicalFacts(o, canonical.get(o.year));
+    if (!byYear.has(merged.year)) byYear.set(merged.year, merged);
+  }
+  return {
+    overview: Array.from(byYear.values()).sort((a, b) => a.year - b.year),
+    lineItems,
+  };
+}
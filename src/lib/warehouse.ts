@@ -2,213 +2,485 @@ import { supabase } from './supabase';
 import { cikToTicker, loadTickerData } from './tickers';
 import {
   StockItem,
-  StatementCode,
   FilingMeta,
   Statements,
   AnnualOverview,
 } from './types';
+import { groupStatements } from './xbrl';
+import { idbGet, idbPut } from './idb-cache';
+import { LruCache, CacheStats } from './lru-cache';
+import { Lane, Priority, lane, raise, schedule } from './scheduler';
 import {
-  RawLineItem,
-  STATEMENT_CODES,
-  groupStatements,
-  buildAnnualOverview,
-  mergeCanonicalFacts,
-} from './xbrl';
-import type { OverviewRow } from './xbrl';
-import { CanonicalField, CanonicalYearFacts } from './types';
+  JsonColumns,
+  LineItemColumns,
+  PackedColumns,
+  StringTable,
+  columnsBytes,
+  columnsFromJson,
+  columnsToJson,
+  packColumns,
+  unpackColumns,
+} from './line-columns';
+import {
+  CompanySnapshot,
+  PAGE_SIZE,
+  PackedSnapshot,
+  ReadOptions,
+  fetchAllRows,
+  fetchAllRowsKeyset,
+  fetchLineItemColumns,
+  loadCompanySnapshot,
+  packSnapshot,
+  runQuery,
+} from './warehouse-queries';
+import type {
+  WorkerAdmission,
+  WorkerCall,
+  WorkerControl,
+  WorkerRequest,
+  WorkerResponse,
+} from './warehouse.worker';
 
 // Data access for the SEC fundamentals warehouse. This module owns *where rows
 // come from* (Supabase queries + per-session caching); turning rows into
-// statements and metrics lives in the pure `./xbrl` module.
-
-const OVERVIEW_STMT_CODES = [...STATEMENT_CODES, 'EQ'] as const;
-
-const PAGE_SIZE = 1000;
-
-// PostgREST caps every response at a fixed number of rows (1000 by default), and
-// it does so silently — no error. Any query that can exceed that must page with
-// `.range()` or it will quietly drop data. This pages until a short page comes
-// back. `buildPage` must apply a deterministic (total) ordering so rows don't
-// shift between page requests.
-async function fetchAllRows<T>(
-  buildPage: (from: number, to: number) => PromiseLike<{ data: T[] | null; error: unknown }>
-): Promise<T[]> {
-  const all: T[] = [];
-  for (let from = 0; ; from += PAGE_SIZE) {
-    const { data, error } = await buildPage(from, from + PAGE_SIZE - 1);
-    if (error) throw error;
-    if (!data || data.length === 0) break;
-    all.push(...data);
-    if (data.length < PAGE_SIZE) break;
-  }
-  return all;
-}
-
-// Shapes of the raw rows returned by the line-item queries below, before xbrl
-// normalization. Columns can arrive as strings (numeric(28,4)) so widen those.
-type LineQueryRow = {
-  stmt: string;
-  line: number | string;
-  plabel: string | null;
-  tag: string;
-  value: number | string | null;
-  uom: string;
-  qtrs: number | string;
-  ddate: string;
-};
-type AnnualQueryRow = LineQueryRow & {
-  adsh: string;
-  form: string;
-  period: string | null;
-  fy: number | null;
-  fp: string | null;
-  filed: string | null;
+// statements and metrics lives in the pure `./xbrl` module, and the stateless
+// queries behind the heavy reads in `./warehouse-queries`.
+
+// --- Off-main-thread reads ---
+
+// A large filer's snapshot or filing is thousands of rows; parsing them and
+// deriving the Overview on the main thread shows up as long tasks during a
+// company switch. Where Workers exist those reads run in `./warehouse.worker`
+// and only packed columns cross back, their buffers transferred. Elsewhere
+// (SSR, the build) and after a worker failure they run inline. The worker's
+// requests are still admitted by this thread's scheduler, under the lane of
+// the call they belong to, so they queue against the page's own; a granted
+// slot is held until the worker releases it.
+type WorkerCallState = {
+  resolve: (result: unknown) => void;
+  reject: (err: Error) => void;
+  inline: () => Promise<unknown>;
+  lane: Lane;
+  signal: AbortSignal;
 };
 
-type FundamentalRow = {
-  field: string;
-  ddate: string;
-  value: number | string | null;
-  qtrs: number | string;
+let worker: Worker | null | undefined;
+let nextCallId = 0;
+const workerCalls = new Map<number, WorkerCallState>();
+const workerGrants = new Map<number, () => void>();
+
+function admitWorkerRequest(w: Worker, id: number, ticket: number): void {
+  const call = workerCalls.get(id);
+  if (!call) return; // aborted: the worker drops the request too
+  schedule(
+    call.lane,
+    (priority) =>
+      new Promise<void>((release) => {
+        if (worker !== w) return release(); // failed while queued; its calls rerun inline
+        workerGrants.set(ticket, release);
+        w.postMessage({ kind: 'grant', ticket, priority } satisfies WorkerControl);
+      }),
+    call.signal
+  ).catch(() => {});
+}
+
+function releaseWorkerRequest(ticket: number): void {
+  workerGrants.get(ticket)?.();
+  workerGrants.delete(ticket);
+}
+
+function getWorker(): Worker | null {
+  if (worker !== undefined) return worker;
+  worker = null;
+  if (typeof window === 'undefined' || typeof Worker === 'undefined') return null;
+  try {
+    const w = new Worker(new URL('./warehouse.worker.ts', import.meta.url));
+    w.onmessage = (e: MessageEvent<WorkerResponse | WorkerAdmission>) => {
+      if (e.data.kind === 'admit') return admitWorkerRequest(w, e.data.id, e.data.ticket);
+      if (e.data.kind === 'release') return releaseWorkerRequest(e.data.ticket);
+      const call = workerCalls.get(e.data.id);
+      if (!call) return;
+      workerCalls.delete(e.data.id);
+      if (e.data.ok) call.resolve(e.data.result);
+      else call.reject(new Error(e.data.error));
+    };
+    w.onerror = () => {
+      // Failed to load or crashed: stop using it and rerun its calls inline.
+      worker = null;
+      w.terminate();
+      for (const ticket of [...workerGrants.keys()]) releaseWorkerRequest(ticket);
+      for (const call of workerCalls.values()) call.inline().then(call.resolve, call.reject);
+      workerCalls.clear();
+    };
+    worker = w;
+  } catch {
+    worker = null;
+  }
+  return worker;
+}
+
+// Run `call` in the worker, or `inline` (which must produce the same packed
+// result) when there is none. The call's requests are admitted under `lane`
+// (so they follow it when raised), and cancelled if `signal` aborts.
+function offThread<R>(
+  call: WorkerCall,
+  inline: () => Promise<R>,
+  { signal, lane: target }: Required<ReadOptions>
+): Promise<R> {
+  const w = getWorker();
+  if (!w) return inline();
+  if (signal.aborted) return Promise.reject(signal.reason);
+  const id = nextCallId++;
+  return new Promise<R>((resolve, reject) => {
+    const onAbort = () => {
+      if (!workerCalls.delete(id)) return;
+      w.postMessage({ kind: 'abort', id } satisfies WorkerControl);
+      reject(signal.reason);
+    };
+    const settle =
+      <T>(done: (value: T) => void) =>
+      (value: T) => {
+        signal.removeEventListener('abort', onAbort);
+        done(value);
+      };
+    workerCalls.set(id, {
+      resolve: settle(resolve as (result: unknown) => void),
+      reject: settle(reject),
+      inline,
+      lane: target,
+      signal,
+    });
+    w.postMessage({ ...call, id } satisfies WorkerRequest);
+    signal.addEventListener('abort', onAbort, { once: true });
+  });
+}
+
+// --- Data version ---
+
+// `warehouse_version` (see supabase/warehouse-version.sql) publishes a version
+// per CIK that changes whenever any of the company's rows is written, and
+// `warehouse_version_latest` the newest of them, for the whole warehouse.
+// Persisted caches are stamped with both when written. On read, an unchanged
+// warehouse version proves the entry current with no further query; otherwise
+// one single-row read of the company's version decides. If the table isn't
+// deployed, entries fall back to a plain TTL.
+const UNVERSIONED_TTL_MS = 24 * 60 * 60 * 1000; // 24h
+
+type VersionStamp = {
+  global: string | null;
+  cik: string | null;
+  at: number; // write time, for the unversioned TTL
 };
 
-const CANONICAL_FIELDS: CanonicalField[] = [
-  'revenue',
-  'operating_expenses',
-  'net_income',
-  'total_assets',
-  'operating_cash_flow',
-];
-
-function yearFromFundamentalRow(row: FundamentalRow): number | null {
-  const year = parseInt(String(row.ddate).slice(0, 4), 10);
-  return Number.isNaN(year) ? null : year;
-}
-
-/** Canonical KPIs keyed by fact year — CIK-scoped, latest restatement already resolved. */
-async function fetchCanonicalByYear(cik: number): Promise<Map<number, CanonicalYearFacts>> {
-  const data = await fetchAllRows<FundamentalRow>((from, to) =>
-    supabase
-      .from('fundamentals')
-      .select('field, ddate, value, qtrs')
-      .eq('cik', cik)
-      .in('field', CANONICAL_FIELDS)
-      .in('qtrs', [0, 4])
-      .order('ddate')
-      .order('field')
-      .range(from, to)
+type Stamped<T> = { value: T; stamp: VersionStamp };
+
+// A version read runs under the lane of the load that first asked for it,
+// raised when a more urgent one waits on it too. It is never aborted: every
+// later caller in the session shares it.
+type VersionRead = { promise: Promise<string | null>; lane: Lane };
+
+let globalVersion: VersionRead | null = null;
+const cikVersions = new Map<number, VersionRead>();
+
+// Versions are compared as strings, so stamps persisted before they became
+// numbers simply read as outdated once.
+async function fetchVersion(cik: number | null, target: Lane): Promise<string | null> {
+  const { data, error } = await runQuery(
+    () => {
+      if (cik === null) return supabase.from('warehouse_version_latest').select('version').limit(1);
+      return supabase.from('warehouse_version').select('version').eq('cik', cik).limit(1);
+    },
+    { lane: target }
   );
+  if (error) throw error;
+  const version = data?.[0]?.version;
+  return version === null || version === undefined ? null : String(version);
+}
 
-  const byYear = new Map<number, CanonicalYearFacts>();
-  for (const row of data) {
-    const year = yearFromFundamentalRow(row);
-    if (year === null) continue;
+function readVersion(
+  read: VersionRead | null | undefined,
+  cik: number | null,
+  target: Lane
+): VersionRead {
+  if (read) {
+    raise(read.lane, target.priority);
+    return read;
+  }
+  return { promise: fetchVersion(cik, target).catch(() => null), lane: target };
+}
 
-    const field = row.field as CanonicalField;
-    const qtrs = Number(row.qtrs);
-    const isAssets = field === 'total_assets';
-    if (isAssets ? qtrs !== 0 : qtrs !== 4) continue;
+// Read once per session (a tab open across an ingest keeps its view of the
+// data until reload, like the in-memory caches). Null when unavailable.
+function getGlobalVersion(target: Lane): Promise<string | null> {
+  globalVersion = readVersion(globalVersion, null, target);
+  return globalVersion.promise;
+}
 
-    const value =
-      row.value === null || row.value === undefined ? null : Number(row.value);
+function getCikVersion(cik: number, target: Lane): Promise<string | null> {
+  const read = readVersion(cikVersions.get(cik), cik, target);
+  cikVersions.set(cik, read);
+  return read.promise;
+}
 
-    const facts = byYear.get(year) ?? {};
-    facts[field] = value;
-    byYear.set(year, facts);
+async function currentStamp(cik: number, target: Lane): Promise<VersionStamp> {
+  const [global, version] = await Promise.all([
+    getGlobalVersion(target),
+    getCikVersion(cik, target),
+  ]);
+  return { global, cik: version, at: Date.now() };
+}
+
+// The stamp to keep for an entry written under `stamp`: the same object when
+// it's current as is, a refreshed one when the warehouse moved but this company
+// didn't (so the next session skips the per-company read), or null when the
+// entry is out of date. `unversionedMaxAgeMs` applies when versions are
+// unavailable.
+async function revalidateStamp(
+  cik: number,
+  stamp: VersionStamp | undefined,
+  target: Lane,
+  unversionedMaxAgeMs = UNVERSIONED_TTL_MS
+): Promise<VersionStamp | null> {
+  if (!stamp) return null;
+  const global = await getGlobalVersion(target);
+  if (global === null || stamp.global === null || stamp.cik === null) {
+    return Date.now() - stamp.at <= unversionedMaxAgeMs ? stamp : null;
   }
-  return byYear;
+  if (stamp.global === global) return stamp;
+  const version = await getCikVersion(cik, target);
+  return version === stamp.cik ? { ...stamp, global } : null;
 }
 
 // --- Company search list ---
 
-// The search list rarely changes (only when a new quarter is ingested), but it
-// requires paging the whole `filing` table. Cache it in localStorage so a page
-// refresh shows the search immediately instead of waiting on ~12 round-trips,
-// and dedupe concurrent callers within a session via a shared in-flight promise.
-const COMPANIES_CACHE_KEY = 'ff:companies:v2';
-const COMPANIES_TTL_MS = 24 * 60 * 60 * 1000; // 24h
+// The search list rarely changes (only when a new quarter is ingested). It is
+// served in one request from the precomputed `company_directory` (see
+// supabase/company-directory.sql); cache it in localStorage anyway so a page
+// refresh shows the search immediately, and dedupe concurrent callers within a
+// session via a shared in-flight promise. An outdated cached list is still
+// served (stale-while-revalidate) while a fresh one loads in the background.
+//
+// Refreshes are deltas: the cache remembers the newest `filing.filed` it has
+// seen, and a refresh only reads filings on or after that date and merges
+// their companies in. A full directory read still happens every
+// COMPANIES_FULL_REFRESH_MS to pick up anything a delta can't see (a company
+// removed from the warehouse). The cache is also stamped with the warehouse
+// version, so it is only refreshed once something was ingested; the TTL
+// applies when the version isn't available.
+//
+// The list's search index is kept by the search worker, which builds and
+// persists it from the items alone (see ./company-search-client).
+//
+// The previous release cached the list under LEGACY_COMPANIES_CACHE_KEY, in a
+// shape this one doesn't read; it is cleared on the next write.
+const COMPANIES_CACHE_KEY = 'ff:companies:v4';
+const LEGACY_COMPANIES_CACHE_KEY = 'ff:companies:v2';
+const COMPANIES_TTL_MS = UNVERSIONED_TTL_MS;
+const COMPANIES_FULL_REFRESH_MS = 30 * 24 * 60 * 60 * 1000; // 30d
 let companiesPromise: Promise<StockItem[]> | null = null;
 
-function readCompaniesCache(): StockItem[] | null {
+type CompaniesCache = {
+  ts: number; // last refresh (full or delta)
+  fullTs: number; // last full directory read
+  since: string | null; // newest `filed` seen; null forces a full read
+  version: string | null; // warehouse version at the last refresh
+  items: StockItem[];
+};
+
+function readCompaniesCache(): CompaniesCache | null {
   if (typeof window === 'undefined') return null;
   try {
     const raw = window.localStorage.getItem(COMPANIES_CACHE_KEY);
     if (!raw) return null;
-    const parsed = JSON.parse(raw) as { ts: number; items: StockItem[] };
+    const parsed = JSON.parse(raw) as CompaniesCache;
     if (!parsed?.items?.length) return null;
-    if (Date.now() - parsed.ts > COMPANIES_TTL_MS) return null;
-    return parsed.items;
+    return parsed;
   } catch {
     return null;
   }
 }
 
-function writeCompaniesCache(items: StockItem[]): void {
+async function companiesOutdated(cache: CompaniesCache, target: Lane): Promise<boolean> {
+  const version = await getGlobalVersion(target);
+  if (version === null || cache.version === null) {
+    return Date.now() - cache.ts > COMPANIES_TTL_MS;
+  }
+  return version !== cache.version;
+}
+
+function writeCompaniesCache(cache: CompaniesCache): void {
   if (typeof window === 'undefined') return;
   try {
-    window.localStorage.setItem(
-      COMPANIES_CACHE_KEY,
-      JSON.stringify({ ts: Date.now(), items })
-    );
+    window.localStorage.removeItem(LEGACY_COMPANIES_CACHE_KEY);
+    window.localStorage.setItem(COMPANIES_CACHE_KEY, JSON.stringify(cache));
   } catch {
     // ignore quota / serialization errors; cache is best-effort
   }
 }
 
-// One distinct company per CIK, sourced from `filing` (one row per submission,
-// ~4x smaller than the `fundamentals` view) and enriched with ticker/exchange
-// from the SEC map.
-async function fetchCompanies(): Promise<StockItem[]> {
-  // Load the ticker map first; the sync cikToTicker() returns null until it's
-  // ready, which would otherwise fall back to showing a CIK as the ticker.
-  await loadTickerData().catch(() => {});
-
-  const seen = new Map<number, StockItem>();
-  let from = 0;
-
-  for (;;) {
-    const { data, error } = await supabase
-      .from('filing')
-      .select('cik, name')
-      .order('cik', { ascending: true })
-      .range(from, from + PAGE_SIZE - 1);
-
-    if (error) throw error;
-    if (!data || data.length === 0) break;
-
-    for (const row of data) {
-      const cik = Number(row.cik);
-      if (seen.has(cik)) continue;
-      const info = cikToTicker(cik);
-      seen.set(cik, {
-        ticker: info?.ticker ?? String(cik),
-        companyName: (row.name ?? info?.name ?? 'Unknown').trim(),
-        listedExchange: info?.exchange ? [info.exchange] : null,
-      });
-    }
-
-    if (data.length < PAGE_SIZE) break;
-    from += PAGE_SIZE;
+// One warehouse company: CIK, display name from its latest filing, and the
+// newest filing date on record (null when read via the fallback walk).
+type DirectoryEntry = { cik: number; name: string | null; latestFiled: string | null };
+
+// Tuple shape returned by the `get_company_directory()` function.
+type DirectoryTuple = [number | string, string | null, string | null];
+
+// Every company in the warehouse, one entry per CIK, in a single request. If
+// the directory function isn't deployed yet, fall back to walking `filing`.
+async function fetchDirectory(opts: ReadOptions = {}): Promise<DirectoryEntry[]> {
+  const { data, error } = await runQuery(() => supabase.rpc('get_company_directory'), opts);
+  if (!error && Array.isArray(data)) {
+    return (data as DirectoryTuple[]).map(([cik, name, latestFiled]) => ({
+      cik: Number(cik),
+      name,
+      latestFiled,
+    }));
   }
+  return walkFilingDirectory(opts);
+}
 
+// Distinct CIKs straight from `filing` (one row per submission, ~4x smaller
+// than the `fundamentals` view). Keyset on `cik` alone: each page resumes after
+// the last CIK seen, which both avoids deep OFFSET scans and skips that
+// company's remaining filings.
+async function walkFilingDirectory(opts: ReadOptions): Promise<DirectoryEntry[]> {
+  type CompanyRow = { cik: number | string; name: string | null };
+  const data = await fetchAllRowsKeyset<CompanyRow>(
+    ['cik'],
+    (after) => {
+      const q = supabase.from('filing').select('cik, name');
+      return (after ? q.gte(after.column, after.value).or(after.filter) : q)
+        .order('cik', { ascending: true })
+        .limit(PAGE_SIZE);
+    },
+    opts
+  );
+
+  const seen = new Map<number, DirectoryEntry>();
+  for (const row of data) {
+    const cik = Number(row.cik);
+    if (!seen.has(cik)) seen.set(cik, { cik, name: row.name, latestFiled: null });
+  }
   return Array.from(seen.values());
 }
 
+// Companies with a filing on or after `since`, each with the name from its
+// newest such filing. Only the filings of the days since the last refresh, so
+// this is normally a single short page.
+async function fetchDirectoryDelta(since: string, opts: ReadOptions): Promise<DirectoryEntry[]> {
+  type DeltaRow = { cik: number | string; name: string | null; filed: string | null };
+  const data = await fetchAllRows<DeltaRow>(
+    (from, to) =>
+      supabase
+        .from('filing')
+        .select('cik, name, filed')
+        .gte('filed', since)
+        .order('filed', { ascending: true })
+        .order('adsh', { ascending: true })
+        .range(from, to),
+    'serial',
+    opts
+  );
+
+  // Ascending by filed: later rows overwrite, leaving each company's newest.
+  const byCik = new Map<number, DirectoryEntry>();
+  for (const row of data) {
+    const cik = Number(row.cik);
+    byCik.set(cik, { cik, name: row.name, latestFiled: row.filed });
+  }
+  return Array.from(byCik.values());
+}
+
+function newestFiled(entries: DirectoryEntry[], since: string | null): string | null {
+  let newest = since;
+  for (const { latestFiled } of entries) {
+    if (latestFiled && (!newest || latestFiled > newest)) newest = latestFiled;
+  }
+  return newest;
+}
+
+// A directory entry enriched with ticker/exchange from the SEC map (which the
+// caller must have loaded).
+function toStockItem({ cik, name }: DirectoryEntry): StockItem {
+  const info = cikToTicker(cik);
+  return {
+    cik,
+    ticker: info?.ticker ?? String(cik),
+    companyName: (name ?? info?.name ?? 'Unknown').trim(),
+    listedExchange: info?.exchange ? [info.exchange] : null,
+  };
+}
+
+// The search list, updated from `prev` by a delta when possible and otherwise
+// read in full.
+async function fetchCompanies(
+  prev: CompaniesCache | null,
+  opts: ReadOptions
+): Promise<CompaniesCache> {
+  const now = Date.now();
+  // Read before the list so a concurrent ingest can only leave the stamp older
+  // than the data (forcing one extra refresh), never newer.
+  const version = await getGlobalVersion(opts.lane ?? lane());
+  // Wait for the ticker map too; the sync cikToTicker() returns null until it's
+  // ready, which would otherwise fall back to showing a CIK as the ticker.
+  const tickers = loadTickerData().catch(() => {});
+
+  if (prev?.since && now - prev.fullTs < COMPANIES_FULL_REFRESH_MS) {
+    const delta = await fetchDirectoryDelta(prev.since, opts);
+    if (delta.length === 0) return { ...prev, ts: now, version };
+    await tickers;
+    const byCik = new Map<number, StockItem>();
+    for (const item of prev.items) if (item.cik !== undefined) byCik.set(item.cik, item);
+    for (const entry of delta) byCik.set(entry.cik, toStockItem(entry));
+    return {
+      ts: now,
+      fullTs: prev.fullTs,
+      since: newestFiled(delta, prev.since),
+      version,
+      items: Array.from(byCik.values()).sort((a, b) => (a.cik ?? 0) - (b.cik ?? 0)),
+    };
+  }
+
+  const [directory] = await Promise.all([fetchDirectory(opts), tickers]);
+  return {
+    ts: now,
+    fullTs: now,
+    version,
+    // Null when read via the fallback walk, which has no filing dates: the
+    // next refresh is then a full read again.
+    since: newestFiled(directory, null),
+    items: directory.map(toStockItem),
+  };
+}
+
 /**
  * Distinct companies present in the warehouse, enriched with ticker/exchange
- * from the SEC map. Drives the search list so users only pick companies that
- * actually have data loaded. Served from localStorage when available so the
- * search works immediately on a page refresh (any route).
+ * from the SEC map. Drives the search list so users
+ * only pick companies that actually have data loaded. Served from localStorage
+ * when available so the search works immediately on a page refresh (any route).
+ * The cached copy is always returned as is; when the warehouse has changed
+ * since it was written it is refreshed in the background and `onUpdate`
+ * receives the new list once it arrives (not called if the refresh fails; the
+ * cached list stands).
  */
-export async function getCompanies(): Promise<StockItem[]> {
+export async function getCompanies(
+  onUpdate?: (items: StockItem[]) => void
+): Promise<StockItem[]> {
   const cached = readCompaniesCache();
-  if (cached) return cached;
+  if (!cached) return refreshCompanies(null, 'critical');
+  // With a list already on screen the refresh is background upkeep.
+  companiesOutdated(cached, lane('idle'))
+    .then((outdated) => (outdated ? refreshCompanies(cached, 'idle').then(onUpdate) : undefined))
+    .catch(() => {});
+  return cached.items;
+}
 
+function refreshCompanies(prev: CompaniesCache | null, priority: Priority): Promise<StockItem[]> {
   if (!companiesPromise) {
-    companiesPromise = fetchCompanies()
-      .then((items) => {
-        writeCompaniesCache(items);
-        return items;
+    companiesPromise = fetchCompanies(prev, { lane: lane(priority) })
+      .then((cache) => {
+        writeCompaniesCache(cache);
+        return cache.items;
       })
       .catch((err) => {
         companiesPromise = null; // allow retry on next mount
@@ -222,61 +494,206 @@ export async function getCompanies(): Promise<StockItem[]> {
  * The company's display name as stored in the warehouse `fundamentals` table.
  * Used by the dashboard so companies missing from the SEC ticker map (which is
  * keyed on listed tickers) still show their real name instead of a bare CIK.
- * Returns null if no named row exists.
+ * Returns null if no named row exists. Usually answered by the company
+ * snapshot that getAnnualOverview loads, without a query of its own.
  */
-export async function getCompanyName(cik: number): Promise<string | null> {
-  const { data, error } = await supabase
-    .from('fundamentals')
-    .select('name')
-    .eq('cik', cik)
-    .not('name', 'is', null)
-    .limit(1)
-    .maybeSingle();
+export async function getCompanyName(
+  cik: number,
+  signal?: AbortSignal,
+  priority: Priority = 'critical'
+): Promise<string | null> {
+  if (companyNames.has(cik)) return companyNames.get(cik) ?? null;
+  const loading = snapshotInflight.get(cik);
+  if (loading) {
+    await joinLoad(loading, signal, priority).catch(() => {});
+    if (companyNames.has(cik)) return companyNames.get(cik) ?? null;
+  }
+
+  const { data, error } = await runQuery(
+    () =>
+      supabase
+        .from('fundamentals')
+        .select('name')
+        .eq('cik', cik)
+        .not('name', 'is', null)
+        .limit(1),
+    { signal, lane: lane(priority) }
+  );
 
   if (error) throw error;
-  const name = data?.name?.trim();
-  return name ? name : null;
+  const name = data?.[0]?.name?.trim() || null;
+  companyNames.set(cik, name);
+  return name;
 }
 
 // --- Per-session caches ---
 
 // Switching tabs or revisiting a company shouldn't re-hit the warehouse. The
 // in-flight maps dedupe concurrent callers (e.g. the Overview load and the
-// StatementsView mount racing for the same filing's rows).
-const filingsCache = new Map<number, FilingMeta[]>();
-const filingsInflight = new Map<number, Promise<FilingMeta[]>>();
-const lineItemsCache = new Map<string, RawLineItem[]>();
-const lineItemsInflight = new Map<string, Promise<RawLineItem[]>>();
+// StatementsView mount racing for the same filing's rows); see shareLoad for
+// how cancellation works across them. Beneath these Maps
+// sits the IndexedDB tier (./idb-cache), consulted before the network so a
+// reload or a later visit paints from disk.
+//
+// The Overview backfills every annual filing of every company visited, so on
+// a kiosk left open all day the row cache would grow without limit; both caches
+// are byte-budgeted LRUs instead (see getCacheStats). Line items are weighed by
+// their typed arrays alone, as the string table is shared by every entry.
+const LINE_ITEMS_CACHE_BYTES = 64 * 1024 * 1024; // 64 MB
+const FILINGS_CACHE_BYTES = 4 * 1024 * 1024; // 4 MB
+
+const filingsCache = new LruCache<number, FilingMeta[]>(FILINGS_CACHE_BYTES);
+const filingsInflight = new Map<number, SharedLoad<FilingMeta[]>>();
+const lineItemsCache = new LruCache<string, LineItemColumns>(LINE_ITEMS_CACHE_BYTES, columnsBytes);
+const lineItemsInflight = new Map<string, SharedLoad<LineItemColumns>>();
+const companyNames = new Map<number, string | null>();
+// Company snapshot loads in flight (see getAnnualOverview). getFilings and
+// getCompanyName wait on these rather than racing them with their own queries.
+const snapshotInflight = new Map<number, SharedLoad<AnnualOverview[]>>();
+
+// An in-flight load shared by every caller asking for the same key. The load
+// runs under its own AbortSignal, which fires (dropping the entry so the next
+// caller starts afresh) only once every caller waiting on it has aborted; a
+// caller that passed no signal keeps it alive. Each caller's own promise
+// rejects as soon as its signal aborts. The load's scheduling lane runs at the
+// most urgent priority any caller has asked for.
+type SharedLoad<T> = { promise: Promise<T>; waiters: number; lane: Lane; abort: () => void };
+
+function shareLoad<K, T>(
+  inflight: Map<K, SharedLoad<T>>,
+  key: K,
+  start: (opts: Required<ReadOptions>) => Promise<T>,
+  signal: AbortSignal | undefined,
+  priority: Priority
+): Promise<T> {
+  if (signal?.aborted) return Promise.reject(signal.reason);
+  let load = inflight.get(key);
+  if (!load) {
+    const controller = new AbortController();
+    const target = lane(priority);
+    const entry: SharedLoad<T> = {
+      promise: start({ signal: controller.signal, lane: target }),
+      waiters: 0,
+      lane: target,
+      abort: () => {
+        controller.abort();
+        drop();
+      },
+    };
+    const drop = () => {
+      if (inflight.get(key) === entry) inflight.delete(key);
+    };
+    entry.promise.then(drop, drop);
+    inflight.set(key, entry);
+    load = entry;
+  }
+  return joinLoad(load, signal, priority);
+}
+
+function joinLoad<T>(
+  load: SharedLoad<T>,
+  signal: AbortSignal | undefined,
+  priority: Priority
+): Promise<T> {
+  if (signal?.aborted) return Promise.reject(signal.reason);
+  raise(load.lane, priority);
+  load.waiters++;
+  if (!signal) return load.promise;
+  return new Promise<T>((resolve, reject) => {
+    const onAbort = () => {
+      reject(signal.reason);
+      if (--load.waiters === 0) load.abort();
+    };
+    signal.addEventListener('abort', onAbort, { once: true });
+    load.promise.then(
+      (value) => {
+        signal.removeEventListener('abort', onAbort);
+        resolve(value);
+      },
+      (err) => {
+        signal.removeEventListener('abort', onAbort);
+        reject(err);
+      }
+    );
+  });
+}
+
+/**
+ * Size and hit/miss/eviction counters for the in-session caches, for debugging
+ * memory use (e.g. from the browser console on a long-lived kiosk).
+ */
+export function getCacheStats(): { filings: CacheStats; lineItems: CacheStats } {
+  return { filings: filingsCache.stats(), lineItems: lineItemsCache.stats() };
+}
+
+// Queue depth and wait times per request priority class, alongside the cache
+// counters above.
+export { getSchedulerStats } from './scheduler';
+
+// Per-filing rows never change once accepted, but a company's filing list and
+// Overview grow with each ingest, so their persisted copies are stamped with
+// the data version (see revalidateStamp). Even a current entry is refetched
+// after this long, bounding how long a missed invalidation can linger.
+const PERSISTED_MAX_AGE_MS = 30 * 24 * 60 * 60 * 1000; // 30d
+
+// A company-scoped persisted entry, or null if missing or out of date.
+async function idbGetCurrent<T>(
+  store: 'filings' | 'overview',
+  cik: number,
+  target: Lane
+): Promise<T | null> {
+  const key = String(cik);
+  const entry = await idbGet<Stamped<T>>(store, key, PERSISTED_MAX_AGE_MS);
+  if (!entry) return null;
+  const stamp = await revalidateStamp(cik, entry.stamp, target);
+  if (!stamp) return null;
+  if (stamp !== entry.stamp) void idbPut(store, key, { value: entry.value, stamp });
+  return entry.value;
+}
 
 /**
  * Filings for a company (most recent first), used to drive the statement
  * filing picker. Cached per cik for the session.
  */
-export async function getFilings(cik: number): Promise<FilingMeta[]> {
+export async function getFilings(
+  cik: number,
+  signal?: AbortSignal,
+  priority: Priority = 'critical'
+): Promise<FilingMeta[]> {
   const cached = filingsCache.get(cik);
   if (cached) return cached;
-  const existing = filingsInflight.get(cik);
-  if (existing) return existing;
-
-  const p = fetchAllRows<FilingMeta>((from, to) =>
-    supabase
-      .from('filing')
-      .select('adsh, form, period, fy, fp, filed')
-      .eq('cik', cik)
-      .order('period', { ascending: false, nullsFirst: false })
-      .order('filed', { ascending: false })
-      .order('adsh', { ascending: true })
-      .range(from, to)
-  );
+  const loading = snapshotInflight.get(cik);
+  if (loading && !filingsInflight.has(cik)) {
+    await joinLoad(loading, signal, priority).catch(() => {});
+    signal?.throwIfAborted();
+    const hydrated = filingsCache.get(cik);
+    if (hydrated) return hydrated;
+  }
+  return shareLoad(filingsInflight, cik, (opts) => loadFilings(cik, opts), signal, priority);
+}
 
-  filingsInflight.set(cik, p);
-  try {
-    const rows = await p;
-    filingsCache.set(cik, rows);
-    return rows;
-  } finally {
-    filingsInflight.delete(cik);
+async function loadFilings(cik: number, opts: Required<ReadOptions>): Promise<FilingMeta[]> {
+  let rows = await idbGetCurrent<FilingMeta[]>('filings', cik, opts.lane);
+  if (!rows) {
+    const stamp = currentStamp(cik, opts.lane);
+    const fetched = await fetchAllRows<FilingMeta>(
+      (from, to) =>
+        supabase
+          .from('filing')
+          .select('adsh, form, period, fy, fp, filed')
+          .eq('cik', cik)
+          .order('period', { ascending: false, nullsFirst: false })
+          .order('filed', { ascending: false })
+          .order('adsh', { ascending: true })
+          .range(from, to),
+      'serial',
+      opts
+    );
+    void stamp.then((st) => idbPut('filings', String(cik), { value: fetched, stamp: st }));
+    rows = fetched;
   }
+  filingsCache.set(cik, rows);
+  return rows;
 }
 
 /**
@@ -285,48 +702,32 @@ export async function getFilings(cik: number): Promise<FilingMeta[]> {
  * Statements tab, so a filing's rows are fetched at most once per session no
  * matter which view asks first.
  */
-async function fetchLineItems(adsh: string): Promise<RawLineItem[]> {
+async function fetchLineItems(
+  adsh: string,
+  signal: AbortSignal | undefined,
+  priority: Priority
+): Promise<LineItemColumns> {
   const cached = lineItemsCache.get(adsh);
   if (cached) return cached;
-  const existing = lineItemsInflight.get(adsh);
-  if (existing) return existing;
+  return shareLoad(lineItemsInflight, adsh, (opts) => loadLineItems(adsh, opts), signal, priority);
+}
 
-  const p = (async () => {
-    const data = await fetchAllRows<LineQueryRow>((from, to) =>
-      supabase
-        .from('line_item')
-        .select('stmt, line, plabel, tag, value, uom, qtrs, ddate')
-        .eq('adsh', adsh)
-        .in('stmt', STATEMENT_CODES)
-        .order('line')
-        .order('ddate')
-        .order('tag')
-        .order('uom')
-        .order('qtrs')
-        .range(from, to)
+async function loadLineItems(adsh: string, opts: Required<ReadOptions>): Promise<LineItemColumns> {
+  const persisted = await idbGet<PackedColumns>('lineItems', adsh);
+  let cols: LineItemColumns;
+  if (persisted) {
+    cols = unpackColumns(persisted);
+  } else {
+    const packed = await offThread<PackedColumns>(
+      { kind: 'lineItems', adsh },
+      async () => packColumns(await fetchLineItemColumns(adsh, new StringTable(), opts)),
+      opts
     );
-
-    return data.map((raw) => ({
-      line: Number(raw.line),
-      plabel: raw.plabel ?? null,
-      tag: raw.tag,
-      // numeric(28,4) may arrive as a string; coerce for formatting.
-      value: raw.value === null || raw.value === undefined ? null : Number(raw.value),
-      uom: raw.uom,
-      qtrs: Number(raw.qtrs),
-      ddate: String(raw.ddate),
-      stmt: raw.stmt as StatementCode,
-    })) as RawLineItem[];
-  })();
-
-  lineItemsInflight.set(adsh, p);
-  try {
-    const rows = await p;
-    lineItemsCache.set(adsh, rows);
-    return rows;
-  } finally {
-    lineItemsInflight.delete(adsh);
+    void idbPut('lineItems', adsh, packed);
+    cols = unpackColumns(packed);
   }
+  lineItemsCache.set(adsh, cols);
+  return cols;
 }
 
 /**
@@ -335,9 +736,12 @@ async function fetchLineItems(adsh: string): Promise<RawLineItem[]> {
  * per-filing row cache, so opening the Statements tab is instant once the
  * Overview (or a prior visit) has loaded that filing.
  */
-export async function getStatements(adsh: string): Promise<Statements> {
-  const rows = await fetchLineItems(adsh);
-  return groupStatements(rows);
+export async function getStatements(
+  adsh: string,
+  signal?: AbortSignal,
+  priority: Priority = 'critical'
+): Promise<Statements> {
+  return groupStatements(await fetchLineItems(adsh, signal, priority));
 }
 
 /**
@@ -351,91 +755,180 @@ export function peekFilings(cik: number): FilingMeta[] | null {
 }
 
 export function peekStatements(adsh: string): Statements | null {
-  const rows = lineItemsCache.get(adsh);
-  return rows ? groupStatements(rows) : null;
+  const cols = lineItemsCache.get(adsh);
+  return cols ? groupStatements(cols) : null;
+}
+
+// --- Prebuilt Overview bundles ---
+
+// `next build` runs the derivation below once per CIK (see
+// `src/app/data/overview/[file]/route.ts`) and writes the result into the
+// static export, so a cold dashboard load is one CDN-cached GET instead of
+// warehouse queries plus the derivation. Bump the version whenever the
+// snapshot shape or derivation changes so stale bundles are ignored. Each
+// bundle carries the data version it was built from, so a company that gained
+// a filing since the deploy is read live instead. The Overview's line items
+// ride along, as the live read's do, so the Statements tab opens on them.
+export const OVERVIEW_BUNDLE_VERSION = 4;
+
+export type OverviewBundle = CompanySnapshot & {
+  v: number;
+  cik: number;
+  generatedAt: string;
+  stamp: VersionStamp;
+  lineItems: [adsh: string, cols: JsonColumns][];
+};
+
+export function overviewBundlePath(cik: number): string {
+  return `/data/overview/${cik}.json`;
+}
+
+/**
+ * Every CIK with at least one filing in the warehouse. Build-time only: it
+ * enumerates the bundles to prerender.
+ */
+export async function listWarehouseCiks(): Promise<number[]> {
+  const directory = await fetchDirectory();
+  return directory.map((d) => d.cik);
+}
+
+/** The Overview bundle for one company, straight from the warehouse. */
+export async function buildOverviewBundle(cik: number): Promise<OverviewBundle> {
+  const stamp = await currentStamp(cik, lane());
+  const { snapshot, lineItems } = await loadCompanySnapshot(cik, new StringTable());
+  return {
+    ...snapshot,
+    v: OVERVIEW_BUNDLE_VERSION,
+    cik,
+    generatedAt: new Date().toISOString(),
+    stamp,
+    lineItems: Array.from(lineItems, ([adsh, cols]) => [adsh, columnsToJson(packColumns(cols))]),
+  };
+}
+
+// Prebuilt bundle for a company, or null on any miss (CIK added after the last
+// deploy, company data newer than the bundle, stale format, dev server) so the
+// caller falls back to the warehouse.
+async function readOverviewBundle(
+  cik: number,
+  { signal, lane: target }: Required<ReadOptions>
+): Promise<(Stamped<CompanySnapshot> & Pick<OverviewBundle, 'lineItems'>) | null> {
+  // `next dev` would run the route handler (and its full-table CIK walk) on
+  // demand; read live data there instead.
+  if (typeof window === 'undefined' || process.env.NODE_ENV !== 'production') return null;
+  try {
+    const res = await fetch(overviewBundlePath(cik), { signal });
+    if (!res.ok) return null;
+    const bundle = (await res.json()) as OverviewBundle;
+    if (bundle?.v !== OVERVIEW_BUNDLE_VERSION || bundle.cik !== cik) return null;
+    if (!Array.isArray(bundle.overview) || !Array.isArray(bundle.lineItems)) return null;
+    // Without a data version a bundle stays valid until the next deploy.
+    const stamp = await revalidateStamp(cik, bundle.stamp, target, Infinity);
+    if (!stamp) return null;
+    return {
+      value: {
+        overview: bundle.overview,
+        filings: bundle.filings,
+        name: bundle.name,
+        annual: bundle.annual,
+      },
+      stamp,
+      lineItems: bundle.lineItems,
+    };
+  } catch {
+    return null;
+  }
 }
 
 /**
  * Per-year Overview metrics for a company, one row per fact year.
  * Line-item tags fill most metrics; the five warehouse canonical fields overlay
- * from `fundamentals` when present (CIK-scoped, latest restatement).
+ * from `fundamentals` when present (CIK-scoped, latest restatement). Served
+ * from the IndexedDB tier or the prebuilt bundle before querying the warehouse,
+ * and the company's filings list and name ride along to warm getFilings and
+ * getCompanyName.
  */
-export async function getAnnualOverview(cik: number): Promise<AnnualOverview[]> {
-  // Warm the full filings list in the background (parallel, non-blocking) so the
-  // Statements tab's filing picker is ready without its own round trip. The
-  // annual view only carries annual forms, so the picker still needs this.
-  void getFilings(cik).catch(() => {});
-
-  const [data, canonicalByYear] = await Promise.all([
-    fetchAllRows<AnnualQueryRow>((from, to) =>
-      supabase
-        .from('annual_line_items')
-        .select('adsh, form, period, fy, fp, filed, stmt, line, plabel, tag, value, uom, qtrs, ddate')
-        .eq('cik', cik)
-        .in('stmt', [...OVERVIEW_STMT_CODES])
-        .order('line')
-        .order('ddate')
-        .order('adsh')
-        .order('tag')
-        .order('uom')
-        .order('qtrs')
-        .range(from, to)
-    ),
-    fetchCanonicalByYear(cik).catch(() => new Map<number, CanonicalYearFacts>()),
-  ]);
+export function getAnnualOverview(
+  cik: number,
+  signal?: AbortSignal,
+  priority: Priority = 'critical'
+): Promise<AnnualOverview[]> {
+  return shareLoad(snapshotInflight, cik, (opts) => loadOverview(cik, opts), signal, priority);
+}
 
-  if (data.length === 0) return [];
-
-  // Group the flat result back into one bundle per filing.
-  const byAdsh = new Map<string, { filing: FilingMeta; rows: OverviewRow[] }>();
-  for (const raw of data) {
-    const adsh = String(raw.adsh);
-    let entry = byAdsh.get(adsh);
-    if (!entry) {
-      entry = {
-        filing: {
-          adsh,
-          form: raw.form,
-          period: raw.period ?? null,
-          fy: raw.fy ?? null,
-          fp: raw.fp ?? null,
-          filed: raw.filed ?? null,
-        },
-        rows: [],
-      };
-      byAdsh.set(adsh, entry);
+/**
+ * Warm a company's Overview (and with it the filings list and name) at prefetch
+ * priority, e.g. for the search result the user is about to pick. Errors are
+ * ignored. Aborting `signal` cancels the warm-up unless the dashboard has
+ * already joined it.
+ */
+export function prefetchOverview(cik: number, signal?: AbortSignal): void {
+  getAnnualOverview(cik, signal, 'prefetch').catch(() => {});
+}
+
+async function loadOverview(cik: number, opts: Required<ReadOptions>): Promise<AnnualOverview[]> {
+  const key = String(cik);
+  let snapshot = await idbGetCurrent<CompanySnapshot>('overview', cik, opts.lane);
+  let stamp: VersionStamp | null = null;
+
+  if (!snapshot) {
+    const bundle = await readOverviewBundle(cik, opts);
+    if (bundle) {
+      ({ value: snapshot, stamp } = bundle);
+      keepLineItems(
+        bundle.lineItems
+          .filter(([adsh]) => !lineItemsCache.has(adsh))
+          .map(([adsh, json]): [string, PackedColumns] => [adsh, columnsFromJson(json)])
+      );
+    } else {
+      // Stamp before reading so an ingest in between leaves the entry looking
+      // older than its data (one extra refetch), never newer.
+      const stamped = currentStamp(cik, opts.lane);
+      const loaded = await offThread<PackedSnapshot>(
+        { kind: 'snapshot', cik },
+        async () => packSnapshot(await loadCompanySnapshot(cik, new StringTable(), opts)),
+        opts
+      );
+      snapshot = loaded.snapshot;
+      stamp = await stamped;
+      keepLineItems(loaded.lineItems);
     }
-    entry.rows.push({
-      line: Number(raw.line),
-      plabel: raw.plabel ?? null,
-      tag: raw.tag,
-      // numeric(28,4) may arrive as a string; coerce for formatting.
-      value: raw.value === null || raw.value === undefined ? null : Number(raw.value),
-      uom: raw.uom,
-      qtrs: Number(raw.qtrs),
-      ddate: String(raw.ddate),
-      stmt: String(raw.stmt),
-    });
+    void idbPut('overview', key, { value: snapshot, stamp });
+  } else if (snapshot.annual) {
+    void restoreLineItems(snapshot.annual);
   }
 
-  // Newest filing first so that when two filings report the same fiscal year,
-  // dedup below keeps the most recent one (matches the old getFilings order).
-  const entries = Array.from(byAdsh.values()).sort(
-    (a, b) =>
-      (b.filing.period ?? '').localeCompare(a.filing.period ?? '') ||
-      (b.filing.filed ?? '').localeCompare(a.filing.filed ?? '')
-  );
+  if (snapshot.name !== undefined) companyNames.set(cik, snapshot.name);
+  if (snapshot.filings) {
+    filingsCache.set(cik, snapshot.filings);
+    if (stamp) void idbPut('filings', key, { value: snapshot.filings, stamp });
+  } else {
+    // Warm the full filings list in the background so the Statements tab's
+    // filing picker is ready without its own round trip. The annual view only
+    // carries annual forms, so the picker still needs this.
+    void getFilings(cik, undefined, 'idle').catch(() => {});
+  }
+  return snapshot.overview;
+}
 
-  const byYear = new Map<number, AnnualOverview>();
-  for (const { filing, rows } of entries) {
-    const statementRows = rows.filter((r): r is RawLineItem =>
-      STATEMENT_CODES.includes(r.stmt as (typeof STATEMENT_CODES)[number])
-    );
-    if (!lineItemsCache.has(filing.adsh)) lineItemsCache.set(filing.adsh, statementRows);
-    const o = buildAnnualOverview(filing, rows);
-    if (!o) continue;
-    const merged = mergeCanonicalFacts(o, canonicalByYear.get(o.year));
-    if (!byYear.has(merged.year)) byYear.set(merged.year, merged);
+// The Overview's per-filing line items, kept in memory and on disk so the
+// Statements tab opens on them without a fetch of its own.
+function keepLineItems(lineItems: [adsh: string, packed: PackedColumns][]): void {
+  for (const [adsh, packed] of lineItems) {
+    if (lineItemsCache.has(adsh)) continue;
+    lineItemsCache.set(adsh, unpackColumns(packed));
+    void idbPut('lineItems', adsh, packed);
   }
-  return Array.from(byYear.values()).sort((a, b) => a.year - b.year);
+}
+
+// After an Overview served from disk, the line items persisted beside it (any
+// evicted since are fetched on demand as usual).
+async function restoreLineItems(adshs: string[]): Promise<void> {
+  await Promise.all(
+    adshs.map(async (adsh) => {
+      if (lineItemsCache.has(adsh) || lineItemsInflight.has(adsh)) return;
+      const packed = await idbGet<PackedColumns>('lineItems', adsh);
+      if (packed && !lineItemsCache.has(adsh)) lineItemsCache.set(adsh, unpackColumns(packed));
+    })
+  );
 }
@@ -0,0 +1,122 @@
+import { PackedColumns, StringTable, packColumns } from './line-columns';
+import { Grant, Lane, Priority, admitThrough, lane } from './scheduler';
+import {
+  PackedSnapshot,
+  ReadOptions,
+  fetchLineItemColumns,
+  loadCompanySnapshot,
+  packSnapshot,
+} from './warehouse-queries';
+
+// Worker half of `./warehouse`: runs the expensive part of a warehouse read
+// (PostgREST JSON parse, row -> column conversion, the Overview derivation) off
+// the main thread. Results go back as packed columns with their typed-array
+// buffers transferred rather than copied. Each call interns into its own
+// StringTable; the main thread re-interns into the session table on unpack.
+// Its requests are admitted by the page's scheduler, under the lane of the call
+// they belong to (see `admitThrough`): 'admit' asks for a slot, 'grant' hands
+// one over with the class to run under, and 'release' returns it.
+
+export type WorkerCall =
+  | { kind: 'snapshot'; cik: number }
+  | { kind: 'lineItems'; adsh: string };
+
+export type WorkerRequest = WorkerCall & { id: number };
+
+// Control messages: every caller waiting on a running call has aborted, or a
+// request slot was granted.
+export type WorkerControl =
+  | { kind: 'abort'; id: number }
+  | { kind: 'grant'; ticket: number; priority: Priority };
+
+export type WorkerResponse =
+  | { kind: 'done'; id: number; ok: true; result: PackedSnapshot | PackedColumns }
+  | { kind: 'done'; id: number; ok: false; error: string };
+
+// A request of call `id` asking for a slot, and a finished request giving it back.
+export type WorkerAdmission =
+  | { kind: 'admit'; id: number; ticket: number }
+  | { kind: 'release'; ticket: number };
+
+function buffers(cols: PackedColumns): ArrayBuffer[] {
+  const { stmt, line, tag, plabel, uom, value, exact, scale, qtrs, ddate } = cols;
+  return [stmt, line, tag, plabel, uom, value, exact, scale, qtrs, ddate].map(
+    (a) => a.buffer as ArrayBuffer
+  );
+}
+
+async function run(
+  call: WorkerCall,
+  opts: ReadOptions
+): Promise<{ result: PackedSnapshot | PackedColumns; transfer: ArrayBuffer[] }> {
+  if (call.kind === 'snapshot') {
+    const loaded = await loadCompanySnapshot(call.cik, new StringTable(), opts);
+    const result = packSnapshot(loaded);
+    return { result, transfer: result.lineItems.flatMap(([, cols]) => buffers(cols)) };
+  }
+  const cols = await fetchLineItemColumns(call.adsh, new StringTable(), opts);
+  const result = packColumns(cols);
+  return { result, transfer: buffers(result) };
+}
+
+const running = new Map<number, { controller: AbortController }>();
+
+// Each call's requests share a lane, so admission can name the call.
+const laneCalls = new WeakMap<Lane, number>();
+const pendingGrants = new Map<number, (priority: Priority) => void>();
+let nextTicket = 0;
+
+function send(msg: WorkerAdmission): void {
+  self.postMessage(msg);
+}
+
+admitThrough((target, signal) => {
+  if (signal?.aborted) return Promise.reject(signal.reason);
+  const ticket = nextTicket++;
+  return new Promise<Grant>((resolve, reject) => {
+    const onAbort = () => {
+      pendingGrants.delete(ticket);
+      reject(signal?.reason);
+    };
+    pendingGrants.set(ticket, (priority) => {
+      signal?.removeEventListener('abort', onAbort);
+      resolve({ priority, release: () => send({ kind: 'release', ticket }) });
+    });
+    signal?.addEventListener('abort', onAbort, { once: true });
+    send({ kind: 'admit', id: laneCalls.get(target) ?? -1, ticket });
+  });
+});
+
+self.addEventListener('message', (e: MessageEvent<WorkerRequest | WorkerControl>) => {
+  if (e.data.kind === 'abort') {
+    running.get(e.data.id)?.controller.abort();
+    return;
+  }
+  if (e.data.kind === 'grant') {
+    const { ticket, priority } = e.data;
+    const grant = pendingGrants.get(ticket);
+    // Granted after its request was aborted: hand the slot straight back.
+    if (!grant) return send({ kind: 'release', ticket });
+    pendingGrants.delete(ticket);
+    grant(priority);
+    return;
+  }
+  const { id } = e.data;
+  const call = { controller: new AbortController(), lane: lane() };
+  laneCalls.set(call.lane, id);
+  running.set(id, { controller: call.controller });
+  run(e.data, { signal: call.controller.signal, lane: call.lane })
+    .finally(() => running.delete(id))
+    .then(
+      ({ result, transfer }) => {
+        const response: WorkerResponse = { kind: 'done', id, ok: true, result };
+        self.postMessage(response, { transfer });
+      },
+      (err: unknown) => {
+        const message =
+          err instanceof Error ? err.message : String((err as { message?: unknown })?.message ?? err);
+        const response: WorkerResponse = { kind: 'done', id, ok: false, error: message };
+        self.postMessage(response);
+      }
+    );
+});
@@ -3,7 +3,8 @@
 // where the rows come from (Supabase, a fixture, a precompute job) — callers
 // hand it rows, it hands back meaning. Keeping this seam pure makes it the test
 // surface for the warehouse's most bug-prone logic (tag matching, GAAP vs IFRS,
-// the derivation fallbacks) without touching the network.
+// the derivation fallbacks) without touching the network. Rows arrive in the
+// columnar form from `./line-columns` (fixtures go through `columnsFromRows`).
 
 import {
   StatementCode,
@@ -13,6 +14,7 @@ import {
   AnnualOverview,
   CanonicalYearFacts,
 } from './types';
+import { INEXACT, LineItemColumns, StringTable, rowAt, stmtIndex } from './line-columns';
 
 // A line_item row plus its statement code. The unit the interpreter operates on.
 export type RawLineItem = LineItemRow & { stmt: StatementCode };
@@ -41,8 +43,101 @@ function isShareRow(r: LineItemRow): boolean {
  * line to a single value: "beginning"-labelled rows keep the earliest ddate,
  * everything else keeps the latest. Rows that differ by label (e.g. BS cash
  * vs. par value sharing a line) are not merged.
+ *
+ * Rows normally arrive ordered by line, then ddate (the warehouse order). That
+ * input is collapsed in one pass with no sorting: within a line, each label's
+ * first row is its earliest and its last row its latest, and the collapsed
+ * instants are merged in after the line's duration rows. Anything else takes
+ * the sort-based path, which returns the same rows in the same order.
  */
-function collapseInstantEndpoints(rows: LineItemRow[]): LineItemRow[] {
+export function collapseInstantEndpoints(rows: LineItemRow[]): LineItemRow[] {
+  if (!isLineOrdered(rows)) return collapseUnordered(rows);
+
+  const result: LineItemRow[] = [];
+  // Per distinct label on the current line: its first and last instant row.
+  // Reused from line to line.
+  const labels: string[] = [];
+  const firsts: LineItemRow[] = [];
+  const lasts: LineItemRow[] = [];
+  let lineStart = 0;
+
+  for (let i = 0; i < rows.length; i++) {
+    const r = rows[i];
+    if (i > 0 && r.line !== rows[i - 1].line) {
+      if (labels.length) appendInstants(result, lineStart, labels, firsts, lasts);
+      lineStart = result.length;
+    }
+    if (r.qtrs !== 0) {
+      result.push(r);
+      continue;
+    }
+    const label = r.plabel ?? r.tag;
+    const g = labels.indexOf(label);
+    if (g === -1) {
+      labels.push(label);
+      firsts.push(r);
+      lasts.push(r);
+    } else {
+      lasts[g] = r;
+    }
+  }
+  if (labels.length) appendInstants(result, lineStart, labels, firsts, lasts);
+  return result;
+}
+
+// Collapse one line's instant groups and add them to `result`, whose rows from
+// `lineStart` on are that line's duration rows (in ddate order). Clears the
+// group arrays for the next line.
+function appendInstants(
+  result: LineItemRow[],
+  lineStart: number,
+  labels: string[],
+  firsts: LineItemRow[],
+  lasts: LineItemRow[]
+): void {
+  const collapsed: LineItemRow[] = [];
+  for (let g = 0; g < labels.length; g++) {
+    const first = firsts[g];
+    const r =
+      first === lasts[g] || (first.plabel ?? '').toLowerCase().includes('begin') ? first : lasts[g];
+    // Insertion sort by ddate; ties keep label order, as a stable sort would.
+    let k = collapsed.length;
+    collapsed.push(r);
+    while (k > 0 && collapsed[k - 1].ddate > r.ddate) {
+      collapsed[k] = collapsed[k - 1];
+      k--;
+    }
+    collapsed[k] = r;
+  }
+  labels.length = firsts.length = lasts.length = 0;
+
+  if (lineStart === result.length) {
+    for (const r of collapsed) result.push(r);
+    return;
+  }
+  // The line also has duration rows (rare): merge, durations first on ties.
+  const durations = result.splice(lineStart);
+  let d = 0;
+  let c = 0;
+  while (d < durations.length && c < collapsed.length) {
+    if (collapsed[c].ddate < durations[d].ddate) result.push(collapsed[c++]);
+    else result.push(durations[d++]);
+  }
+  while (d < durations.length) result.push(durations[d++]);
+  while (c < collapsed.length) result.push(collapsed[c++]);
+}
+
+// Ordered by line, then ddate (ISO dates, so string order is date order).
+function isLineOrdered(rows: LineItemRow[]): boolean {
+  for (let i = 1; i < rows.length; i++) {
+    const a = rows[i - 1];
+    const b = rows[i];
+    if (!(a.line <= b.line) || (a.line === b.line && a.ddate > b.ddate)) return false;
+  }
+  return true;
+}
+
+function collapseUnordered(rows: LineItemRow[]): LineItemRow[] {
   const groups = new Map<string, LineItemRow[]>();
   const result: LineItemRow[] = [];
 
@@ -70,11 +165,15 @@ function collapseInstantEndpoints(rows: LineItemRow[]): LineItemRow[] {
   return result.sort((a, b) => a.line - b.line || a.ddate.localeCompare(b.ddate));
 }
 
+// Column `stmt` index -> statement code, for the three rendered statements.
+const CODE_BY_STMT: (StatementCode | undefined)[] = [];
+for (const code of STATEMENT_CODES) CODE_BY_STMT[stmtIndex(code)] = code;
+
 /**
  * Group flat line_item rows into per-statement blocks, splitting share-data
  * rows out and collapsing duplicate instant endpoints. Pure and cheap.
  */
-export function groupStatements(rows: RawLineItem[]): Statements {
+export function groupStatements(cols: LineItemColumns): Statements {
   const out: Statements = {
     IS: { rows: [], shareRows: [] },
     BS: { rows: [], shareRows: [] },
@@ -82,8 +181,9 @@ export function groupStatements(rows: RawLineItem[]): Statements {
   };
 
   const byCode: Record<StatementCode, LineItemRow[]> = { IS: [], BS: [], CF: [] };
-  for (const r of rows) {
-    if (byCode[r.stmt]) byCode[r.stmt].push(r);
+  for (let i = 0; i < cols.length; i++) {
+    const code = CODE_BY_STMT[cols.stmt[i]];
+    if (code) byCode[code].push(rowAt(cols, i));
   }
 
   for (const code of STATEMENT_CODES) {
@@ -262,46 +362,226 @@ const CAPEX_PROCEEDS_TAGS = [
   'ProceedsFromSalesOfPropertyPlantAndEquipmentClassifiedAsInvestingActivities',
 ];
 
-// Build a tag -> value map for rows passing `keep` (lowest line wins).
-function buildTagMap(rows: OverviewRow[], keep: (r: OverviewRow) => boolean): Map<string, number> {
-  const m = new Map<string, number>();
-  for (const r of rows) {
-    if (r.value === null || !keep(r)) continue;
-    if (!m.has(r.tag)) m.set(r.tag, r.value);
+const IS = stmtIndex('IS');
+const BS = stmtIndex('BS');
+const CF = stmtIndex('CF');
+const EQ = stmtIndex('EQ');
+
+// --- Overview tag index ---
+//
+// The tag lists above are compiled once, at module load, into one index per
+// statement slice the Overview reads (IS and CF full-year durations, BS and EQ
+// instants). Every list becomes a run of cells in priority order and each tag
+// maps to its cells, so a filing's rows are classified in a single pass into a
+// flat value array: a cell holds the first non-null value of its tag in that
+// slice (rows arrive ordered by line, so the lowest line wins), NaN if none.
+// Picking from a list is then a scan of its run for the first filled cell.
+
+const SLICE_IS = 0;
+const SLICE_BS = 1;
+const SLICE_EQ = 2;
+const SLICE_CF = 3;
+const SLICE_COUNT = 4;
+
+// Slice a row belongs to, or -1 when the Overview doesn't read it.
+function sliceOf(stmt: number, qtrs: number): number {
+  if (qtrs === 4) return stmt === IS ? SLICE_IS : stmt === CF ? SLICE_CF : -1;
+  if (qtrs === 0) return stmt === BS ? SLICE_BS : stmt === EQ ? SLICE_EQ : -1;
+  return -1;
+}
+
+// A tag list compiled into one slice: cells [offset, offset + length).
+type TagRun = { offset: number; length: number };
+
+const cellsByTag: Map<string, number[]>[] = Array.from({ length: SLICE_COUNT }, () => new Map());
+let cellCount = 0;
+
+function compile(slice: number, tags: string[]): TagRun {
+  const offset = cellCount;
+  tags.forEach((tag, i) => {
+    const cells = cellsByTag[slice].get(tag);
+    if (cells) cells.push(offset + i);
+    else cellsByTag[slice].set(tag, [offset + i]);
+  });
+  cellCount += tags.length;
+  return { offset, length: tags.length };
+}
+
+const RUNS = {
+  revenue: compile(SLICE_IS, REVENUE_TAGS),
+  netIncome: compile(SLICE_IS, NET_INCOME_TAGS),
+  eps: compile(SLICE_IS, EPS_TAGS),
+  incomeTax: compile(SLICE_IS, INCOME_TAX_TAGS),
+  preTaxIncome: compile(SLICE_IS, PRETAX_INCOME_TAGS),
+  opexTotal: compile(SLICE_IS, OPEX_TOTAL_TAGS),
+  opexComponents: compile(SLICE_IS, OPEX_COMPONENT_TAGS),
+  isSharesOutstanding: compile(SLICE_IS, SHARES_OUTSTANDING_TAGS),
+  isSharesIssued: compile(SLICE_IS, SHARES_ISSUED_TAGS),
+
+  assets: compile(SLICE_BS, ASSETS_TAGS),
+  liabilities: compile(SLICE_BS, LIABILITIES_TAGS),
+  bsEquity: compile(SLICE_BS, EQUITY_TAGS),
+  bsEquityBeforeTreasury: compile(SLICE_BS, [EQUITY_BEFORE_TREASURY_TAG]),
+  preferredEquity: compile(SLICE_BS, PREFERRED_EQUITY_TAGS),
+  cash: compile(SLICE_BS, CASH_TAGS),
+  sti: compile(SLICE_BS, STI_TAGS),
+  bsSharesOutstanding: compile(SLICE_BS, SHARES_OUTSTANDING_TAGS),
+  bsSharesIssued: compile(SLICE_BS, SHARES_ISSUED_TAGS),
+  treasuryShares: compile(SLICE_BS, TREASURY_SHARES_TAGS),
+
+  eqEquity: compile(SLICE_EQ, EQUITY_TAGS),
+  eqEquityBeforeTreasury: compile(SLICE_EQ, [EQUITY_BEFORE_TREASURY_TAG]),
+
+  operatingCashFlow: compile(SLICE_CF, OPERATING_CF_TAGS),
+  investingCashFlow: compile(SLICE_CF, INVESTING_CF_TAGS),
+  financingCashFlow: compile(SLICE_CF, FINANCING_CF_TAGS),
+  netChangeInCash: compile(SLICE_CF, NET_CHANGE_TAGS),
+  capexOutflow: compile(SLICE_CF, CAPEX_OUTFLOW_TAGS),
+  capexProceeds: compile(SLICE_CF, CAPEX_PROCEEDS_TAGS),
+};
+
+const CELL_COUNT = cellCount;
+const COMPREHENSIVE_CASH_CELL = RUNS.cash.offset + CASH_TAGS.indexOf(COMPREHENSIVE_CASH_TAG);
+
+const NO_CELLS: readonly number[] = [];
+
+// Per StringTable and slice: string id -> cells. Filled lazily as ids are
+// seen, so each distinct tag is looked up by string once per table rather than
+// once per row.
+const cellsById = new WeakMap<StringTable, (readonly number[] | undefined)[][]>();
+
+function idIndex(table: StringTable): (readonly number[] | undefined)[][] {
+  let index = cellsById.get(table);
+  if (!index) {
+    index = Array.from({ length: SLICE_COUNT }, () => []);
+    cellsById.set(table, index);
   }
-  return m;
+  return index;
 }
 
-function pickTag(m: Map<string, number>, tags: string[]): number | null {
-  for (const t of tags) {
-    const v = m.get(t);
-    if (typeof v === 'number') return v;
+// The filled cells of one filing: the row each cell came from, -1 = empty.
+type Filled = { rows: Int32Array; cols: LineItemColumns };
+
+// First filled cell of `run`, or -1.
+function firstCell(filled: Filled, run: TagRun): number {
+  const end = run.offset + run.length;
+  for (let c = run.offset; c < end; c++) if (filled.rows[c] !== -1) return c;
+  return -1;
+}
+
+function valueAt(filled: Filled, cell: number): number {
+  return filled.cols.value[filled.rows[cell]];
+}
+
+function pick(filled: Filled, run: TagRun): number | null {
+  const c = firstCell(filled, run);
+  return c === -1 ? null : valueAt(filled, c);
+}
+
+// --- Exact sums ---
+//
+// Sums and differences of reported amounts run on the exact decimals kept by
+// `./line-columns` and become floats once, for display. So a capex netting or
+// a sum of opex components doesn't drift where floats round (past 2^53, or
+// fractional amounts). Whole amounts within 2^53, nearly all of them, stay
+// plain numbers, whose sums are exact as long as they stay safe integers;
+// the rest are BigInts at a common 10^4 scale. An operand without an exact
+// value (INEXACT) turns the rest of that computation into float math.
+
+// A whole amount (a safe integer), an amount × 10^4 exactly, or a float after
+// an inexact operand.
+type Amount = number | bigint | Inexact;
+type Inexact = { float: number };
+
+const SCALE = BigInt(10000);
+// Multiplier from a row's scale (0-4) to 10^4.
+const RESCALE = [10000, 1000, 100, 10, 1].map((n) => BigInt(n));
+
+function amountAt(cols: LineItemColumns, row: number): Amount {
+  const v = cols.value[row];
+  if (cols.scale[row] === 0 && Number.isSafeInteger(v)) return v;
+  const m = cols.exact[row];
+  return m === INEXACT ? { float: v } : m * RESCALE[cols.scale[row]];
+}
+
+function toNumber(a: Amount): number {
+  if (typeof a === 'number') return a;
+  if (typeof a === 'object') return a.float;
+  const whole = a / SCALE;
+  // Via text for fractional amounts, so the result is correctly rounded.
+  return whole * SCALE === a ? Number(whole) : Number(`${a}e-4`);
+}
+
+function toBigInt(a: number | bigint): bigint {
+  return typeof a === 'number' ? BigInt(a) * SCALE : a;
+}
+
+// a + sign × b.
+function combine(a: Amount, b: Amount, sign: 1 | -1): Amount {
+  if (typeof a === 'number' && typeof b === 'number') {
+    const r = a + sign * b;
+    if (Number.isSafeInteger(r)) return r;
   }
-  return null;
+  if (typeof a === 'object' || typeof b === 'object') return { float: toNumber(a) + sign * toNumber(b) };
+  return sign === 1 ? toBigInt(a) + toBigInt(b) : toBigInt(a) - toBigInt(b);
+}
+
+function plus(a: Amount, b: Amount): Amount {
+  return combine(a, b, 1);
+}
+
+function minus(a: Amount, b: Amount): Amount {
+  return combine(a, b, -1);
 }
 
-export type OverviewRow = LineItemRow & { stmt: string };
+function abs(a: Amount): Amount {
+  if (typeof a === 'object') return { float: Math.abs(a.float) };
+  return typeof a === 'bigint' ? (a < 0 ? -a : a) : Math.abs(a);
+}
 
-function pickEquity(bs: Map<string, number>, eq: Map<string, number>): number | null {
-  let equity = pickTag(bs, EQUITY_TAGS) ?? pickTag(eq, EQUITY_TAGS);
+function sum(filled: Filled, run: TagRun): Amount | null {
+  const { rows, cols } = filled;
+  const end = run.offset + run.length;
+  // Whole amounts add up as plain numbers while the total stays safe.
+  let whole = 0;
+  let found = false;
+  let c = run.offset;
+  for (; c < end; c++) {
+    const row = rows[c];
+    if (row === -1) continue;
+    const v = cols.value[row];
+    if (cols.scale[row] !== 0 || !Number.isSafeInteger(v) || !Number.isSafeInteger(whole + v)) break;
+    whole += v;
+    found = true;
+  }
+  let total: Amount | null = found ? whole : null;
+  for (; c < end; c++) {
+    if (rows[c] === -1) continue;
+    const a = amountAt(cols, rows[c]);
+    total = total === null ? a : plus(total, a);
+  }
+  return total;
+}
+
+function pickEquity(filled: Filled): number | null {
+  let equity = pick(filled, RUNS.bsEquity) ?? pick(filled, RUNS.eqEquity);
   if (equity !== null && equity < 0) {
     const beforeTreasury =
-      pickTag(bs, [EQUITY_BEFORE_TREASURY_TAG]) ?? pickTag(eq, [EQUITY_BEFORE_TREASURY_TAG]);
+      pick(filled, RUNS.bsEquityBeforeTreasury) ?? pick(filled, RUNS.eqEquityBeforeTreasury);
     if (beforeTreasury !== null) equity = beforeTreasury;
   }
   return equity;
 }
 
 function pickShareCount(
-  bs: Map<string, number>,
-  is: Map<string, number>,
+  filled: Filled,
   netIncome: number | null,
   eps: number | null
 ): number | null {
-  let shares = pickTag(bs, SHARES_OUTSTANDING_TAGS) ?? pickTag(is, SHARES_OUTSTANDING_TAGS);
+  let shares = pick(filled, RUNS.bsSharesOutstanding) ?? pick(filled, RUNS.isSharesOutstanding);
   if (shares === null || shares <= 0) {
-    const issued = pickTag(bs, SHARES_ISSUED_TAGS) ?? pickTag(is, SHARES_ISSUED_TAGS);
-    const treasury = pickTag(bs, TREASURY_SHARES_TAGS);
+    const issued = pick(filled, RUNS.bsSharesIssued) ?? pick(filled, RUNS.isSharesIssued);
+    const treasury = pick(filled, RUNS.treasuryShares);
     if (issued !== null && treasury !== null && issued > treasury) shares = issued - treasury;
     else if (issued !== null && treasury === null) shares = issued;
   }
@@ -311,26 +591,25 @@ function pickShareCount(
   return shares !== null && shares > 0 ? shares : null;
 }
 
-function sumTags(m: Map<string, number>, tags: string[]): number | null {
-  let sum = 0;
-  let found = false;
-  for (const t of tags) {
-    const v = m.get(t);
-    if (typeof v === 'number') {
-      sum += v;
-      found = true;
-    }
-  }
-  return found ? sum : null;
+function factYear(latestDuration: number, latestInstant: number): number | null {
+  const latest = latestDuration || latestInstant;
+  return latest ? Math.floor(latest / 10000) : null;
 }
 
 /** Fact year from statement rows — when the numbers apply, not filing.fy/period. */
-export function resolveFactYear(rows: RawLineItem[]): number | null {
-  const ddates = rows.filter((r) => r.qtrs === 4).map((r) => r.ddate);
-  const source = ddates.length > 0 ? ddates : rows.filter((r) => r.qtrs === 0).map((r) => r.ddate);
-  if (source.length === 0) return null;
-  const year = parseInt(source.sort().at(-1)!.slice(0, 4), 10);
-  return Number.isNaN(year) ? null : year;
+export function resolveFactYear(cols: LineItemColumns): number | null {
+  // Latest full-year duration date, else the latest instant.
+  let duration = 0;
+  let instant = 0;
+  for (let i = 0; i < cols.length; i++) {
+    const d = cols.ddate[i];
+    if (cols.qtrs[i] === 4) {
+      if (d > duration) duration = d;
+    } else if (cols.qtrs[i] === 0) {
+      if (d > instant) instant = d;
+    }
+  }
+  return factYear(duration, instant);
 }
 
 /** Prefer warehouse canonical facts; keep line_item-derived values as fallback. */
@@ -365,23 +644,49 @@ export function mergeCanonicalFacts(
  * filing's full statement rows. Pure: hand it the filing meta and its rows.
  * Returns null when the fiscal year can't be determined.
  */
-export function buildAnnualOverview(filing: FilingMeta, rows: OverviewRow[]): AnnualOverview | null {
-  const year = resolveFactYear(rows as RawLineItem[]);
-  if (year === null) return null;
+export function buildAnnualOverview(filing: FilingMeta, cols: LineItemColumns): AnnualOverview | null {
+  // One pass: the fact year, and every row of a read slice into its cells.
+  const rows = new Int32Array(CELL_COUNT).fill(-1);
+  const index = idIndex(cols.table);
+  const { strings } = cols.table;
+  let duration = 0;
+  let instant = 0;
+  for (let i = 0; i < cols.length; i++) {
+    const qtrs = cols.qtrs[i];
+    const d = cols.ddate[i];
+    if (qtrs === 4) {
+      if (d > duration) duration = d;
+    } else if (qtrs === 0) {
+      if (d > instant) instant = d;
+    }
+
+    const slice = sliceOf(cols.stmt[i], qtrs);
+    if (slice === -1) continue;
+    if (Number.isNaN(cols.value[i])) continue;
+    const id = cols.tag[i];
+    let cells = index[slice][id];
+    if (cells === undefined) {
+      cells = cellsByTag[slice].get(strings[id]) ?? NO_CELLS;
+      index[slice][id] = cells;
+    }
+    for (const c of cells) if (rows[c] === -1) rows[c] = i;
+  }
+  const filled: Filled = { rows, cols };
 
-  const is = buildTagMap(rows, (r) => r.stmt === 'IS' && r.qtrs === 4);
-  const bs = buildTagMap(rows, (r) => r.stmt === 'BS' && r.qtrs === 0);
-  const eq = buildTagMap(rows, (r) => r.stmt === 'EQ' && r.qtrs === 0);
-  const cf = buildTagMap(rows, (r) => r.stmt === 'CF' && r.qtrs === 4);
+  const year = factYear(duration, instant);
+  if (year === null) return null;
 
-  const revenue = pickTag(is, REVENUE_TAGS);
-  const netIncome = pickTag(is, NET_INCOME_TAGS);
-  const eps = pickTag(is, EPS_TAGS);
-  const incomeTax = pickTag(is, INCOME_TAX_TAGS);
-  const preTaxIncome = pickTag(is, PRETAX_INCOME_TAGS);
+  const revenue = pick(filled, RUNS.revenue);
+  const netIncome = pick(filled, RUNS.netIncome);
+  const eps = pick(filled, RUNS.eps);
+  const incomeTax = pick(filled, RUNS.incomeTax);
+  const preTaxIncome = pick(filled, RUNS.preTaxIncome);
 
-  let operatingExpense = pickTag(is, OPEX_TOTAL_TAGS);
-  if (operatingExpense === null) operatingExpense = sumTags(is, OPEX_COMPONENT_TAGS);
+  let operatingExpense = pick(filled, RUNS.opexTotal);
+  if (operatingExpense === null) {
+    const components = sum(filled, RUNS.opexComponents);
+    operatingExpense = components === null ? null : toNumber(components);
+  }
 
   const netProfitMargin =
     revenue && netIncome !== null ? (netIncome / revenue) * 100 : null;
@@ -390,9 +695,9 @@ export function buildAnnualOverview(filing: FilingMeta, rows: OverviewRow[]): An
       ? (incomeTax / preTaxIncome) * 100
       : null;
 
-  const totalAssets = pickTag(bs, ASSETS_TAGS);
-  let totalEquity = pickEquity(bs, eq);
-  const explicitLiabilities = pickTag(bs, LIABILITIES_TAGS);
+  const totalAssets = pick(filled, RUNS.assets);
+  let totalEquity = pickEquity(filled);
+  const explicitLiabilities = pick(filled, RUNS.liabilities);
 
   if (totalEquity === null && totalAssets !== null && explicitLiabilities !== null) {
     totalEquity = totalAssets - explicitLiabilities;
@@ -402,32 +707,36 @@ export function buildAnnualOverview(filing: FilingMeta, rows: OverviewRow[]): An
   else if (totalAssets !== null && totalEquity !== null) totalLiabilities = totalAssets - totalEquity;
   else totalLiabilities = null;
 
-  const cash = pickTag(bs, CASH_TAGS) ?? 0;
-  const usedComprehensiveCash = bs.get(COMPREHENSIVE_CASH_TAG) !== undefined &&
-    CASH_TAGS.find((t) => bs.get(t) !== undefined) === COMPREHENSIVE_CASH_TAG;
-  const sti = usedComprehensiveCash ? 0 : sumTags(bs, STI_TAGS) ?? 0;
-  const cashAndShortTermInvestments = pickTag(bs, CASH_TAGS) === null && sti === 0 ? null : cash + sti;
+  const cashCell = firstCell(filled, RUNS.cash);
+  const cash = cashCell === -1 ? 0 : amountAt(cols, rows[cashCell]);
+  const usedComprehensiveCash = cashCell === COMPREHENSIVE_CASH_CELL;
+  const sti = usedComprehensiveCash ? 0 : sum(filled, RUNS.sti) ?? 0;
+  const cashAndShortTermInvestments =
+    cashCell === -1 && toNumber(sti) === 0 ? null : toNumber(plus(cash, sti));
 
-  const preferredEquity = pickTag(bs, PREFERRED_EQUITY_TAGS) ?? 0;
-  const sharesOutstanding = pickShareCount(bs, is, netIncome, eps);
+  const preferredEquity = pick(filled, RUNS.preferredEquity) ?? 0;
+  const sharesOutstanding = pickShareCount(filled, netIncome, eps);
   const bookValuePerShare =
     totalEquity !== null && sharesOutstanding !== null && sharesOutstanding > 0
       ? (totalEquity - preferredEquity) / sharesOutstanding
       : null;
 
-  const operatingCashFlow = pickTag(cf, OPERATING_CF_TAGS);
-  const investingCashFlow = pickTag(cf, INVESTING_CF_TAGS);
-  const financingCashFlow = pickTag(cf, FINANCING_CF_TAGS);
-  const netChangeInCash = pickTag(cf, NET_CHANGE_TAGS);
+  const operatingCashFlowCell = firstCell(filled, RUNS.operatingCashFlow);
+  const operatingCashFlow = operatingCashFlowCell === -1 ? null : valueAt(filled, operatingCashFlowCell);
+  const investingCashFlow = pick(filled, RUNS.investingCashFlow);
+  const financingCashFlow = pick(filled, RUNS.financingCashFlow);
+  const netChangeInCash = pick(filled, RUNS.netChangeInCash);
 
-  const capexOutflow = sumTags(cf, CAPEX_OUTFLOW_TAGS);
-  const capexProceeds = sumTags(cf, CAPEX_PROCEEDS_TAGS);
+  const capexOutflow = sum(filled, RUNS.capexOutflow);
+  const capexProceeds = sum(filled, RUNS.capexProceeds);
   const netCapex =
     capexOutflow !== null || capexProceeds !== null
-      ? Math.abs((capexOutflow ?? 0) - (capexProceeds ?? 0))
+      ? abs(minus(capexOutflow ?? 0, capexProceeds ?? 0))
       : null;
   const freeCashFlow =
-    operatingCashFlow !== null && netCapex !== null ? operatingCashFlow - netCapex : null;
+    operatingCashFlowCell !== -1 && netCapex !== null
+      ? toNumber(minus(amountAt(cols, rows[operatingCashFlowCell]), netCapex))
+      : null;
 
   return {
     year,
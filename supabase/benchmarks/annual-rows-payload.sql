@@ -0,0 +1,53 @@
+-- Fiscal Fundamentals — Overview payload size: flat vs normalized rows.
+--
+-- Before company_bundle normalized its `overview` member, the Overview line
+-- items went over the wire as one JSON object per row, each repeating
+-- `adsh, form, period, fy, fp, filed` and the full tag/label/unit strings.
+-- This script compares the bytes of that flat encoding (as PostgREST would
+-- serialize the old `annual_line_items` select) against the normalized member
+-- `company_bundle` returns now, for the companies with the most rows.
+--
+-- Read-only; run it against a database with the warehouse loaded and
+-- company-bundle.sql applied:
+--
+--   psql -v top=5 -f supabase/benchmarks/annual-rows-payload.sql
+--
+-- Both sizes are uncompressed; the ratio after gzip/brotli is smaller but
+-- JSON.parse cost on the client tracks the uncompressed size.
+
+\set ON_ERROR_STOP on
+\if :{?top}
+\else
+  \set top 5
+\endif
+
+with largest as (
+  select cik, count(*) as line_rows
+  from public.annual_line_items
+  where stmt in ('IS', 'BS', 'CF', 'EQ')
+  group by cik
+  order by count(*) desc
+  limit :top
+),
+sized as (
+  select l.cik,
+         l.line_rows,
+         (select octet_length(json_agg(json_build_object(
+                   'adsh', a.adsh, 'form', a.form, 'period', a.period, 'fy', a.fy,
+                   'fp', a.fp, 'filed', a.filed, 'stmt', a.stmt, 'line', a.line,
+                   'plabel', a.plabel, 'tag', a.tag, 'value', a.value::text, 'uom', a.uom,
+                   'qtrs', a.qtrs, 'ddate', a.ddate
+                 ))::text)
+            from public.annual_line_items a
+           where a.cik = l.cik
+             and a.stmt in ('IS', 'BS', 'CF', 'EQ')) as flat_bytes,
+         octet_length((public.company_bundle(l.cik) -> 'overview')::text) as normalized_bytes
+  from largest l
+)
+select cik,
+       line_rows,
+       pg_size_pretty(flat_bytes::bigint)       as flat,
+       pg_size_pretty(normalized_bytes::bigint) as normalized,
+       round(100.0 * normalized_bytes / nullif(flat_bytes, 0), 1) as pct_of_flat
+from sized
+order by line_rows desc;
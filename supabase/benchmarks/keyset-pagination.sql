@@ -0,0 +1,109 @@
+-- Fiscal Fundamentals — OFFSET vs keyset pagination benchmark.
+--
+-- `fetchAllRows` (offset) and `fetchAllRowsKeyset` in src/lib/warehouse.ts walk
+-- a result set 1000 rows at a time. This script builds a large throwaway
+-- fixture shaped like `filing` and walks it end to end both ways, issuing the
+-- same SQL PostgREST generates for each strategy:
+--
+--   offset : order by cik, adsh offset N limit 1000
+--   keyset : where cik >= :cik and (cik > :cik or (cik = :cik and adsh > :adsh))
+--            order by cik, adsh limit 1000
+--
+-- Run it against a LOCAL Postgres only (it never touches the real tables; the
+-- fixture is a temp table dropped at the end of the session):
+--
+--   psql -v rows=300000 -f supabase/benchmarks/keyset-pagination.sql
+--
+-- Offset cost grows with page depth (each page re-scans every earlier row), so
+-- the gap widens quadratically with `rows`; keyset stays flat per page.
+
+\set ON_ERROR_STOP on
+\if :{?rows}
+\else
+  \set rows 300000
+\endif
+
+create temp table bench_filing as
+select (g / 8)::bigint                        as cik,
+       lpad(g::text, 10, '0') || '-24-000001' as adsh,
+       'COMPANY ' || (g / 8)                  as name
+from generate_series(1, :rows) as g;
+
+create index on bench_filing (cik, adsh);
+analyze bench_filing;
+
+
+-- 1. Full walk, both strategies ------------------------------------------------
+
+do $$
+declare
+  page_size constant int := 1000;
+  t0        timestamptz;
+  n         int;
+  total     int;
+  off       int;
+  last_cik  bigint;
+  last_adsh text;
+  r         record;
+begin
+  t0 := clock_timestamp();
+  total := 0;
+  off := 0;
+  loop
+    n := 0;
+    for r in
+      select cik, adsh from bench_filing order by cik, adsh offset off limit page_size
+    loop
+      n := n + 1;
+    end loop;
+    total := total + n;
+    off := off + page_size;
+    exit when n < page_size;
+  end loop;
+  raise notice 'offset: % rows in % ms', total,
+    round(extract(epoch from clock_timestamp() - t0) * 1000);
+
+  t0 := clock_timestamp();
+  total := 0;
+  last_cik := null;
+  loop
+    n := 0;
+    for r in
+      select cik, adsh from bench_filing
+      where last_cik is null
+         or (cik >= last_cik and (cik > last_cik or (cik = last_cik and adsh > last_adsh)))
+      order by cik, adsh
+      limit page_size
+    loop
+      n := n + 1;
+      last_cik := r.cik;
+      last_adsh := r.adsh;
+    end loop;
+    total := total + n;
+    exit when n < page_size;
+  end loop;
+  raise notice 'keyset: % rows in % ms', total,
+    round(extract(epoch from clock_timestamp() - t0) * 1000);
+end $$;
+
+
+-- 2. One deep page, both strategies -------------------------------------------
+--    The last page of the walk: offset reads and discards everything before it,
+--    keyset is an index range scan of ~1000 tuples.
+
+\set deep_offset :rows - 1000
+select cik as deep_cik, adsh as deep_adsh
+from bench_filing order by cik, adsh offset :deep_offset limit 1 \gset
+
+explain (analyze, buffers, costs off)
+select cik, adsh, name from bench_filing
+order by cik, adsh offset :deep_offset limit 1000;
+
+explain (analyze, buffers, costs off)
+select cik, adsh, name from bench_filing
+where cik >= :deep_cik
+  and (cik > :deep_cik or (cik = :deep_cik and adsh >= :'deep_adsh'))
+order by cik, adsh
+limit 1000;
+
+drop table bench_filing;
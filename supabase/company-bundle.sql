@@ -0,0 +1,131 @@
+-- Fiscal Fundamentals — single-request company snapshot for the dashboard.
+--
+-- A cold dashboard load needs four things for one CIK: the annual line items
+-- behind the Overview, the canonical KPIs from `fundamentals`, the filings list
+-- for the Statements picker and the company's display name. Read separately
+-- they are four paged query streams; this function returns all of them as one
+-- JSON value, which PostgREST doesn't row-cap, so the whole dashboard costs a
+-- single round trip.
+--
+-- Safe to run more than once (idempotent). Run it after rls-policies.sql. The
+-- function runs as the caller, so the RLS policies and view grants there still
+-- decide what it can read.
+--
+-- Each array is ordered exactly like the per-table queries in
+-- src/lib/warehouse.ts, which the app falls back to when this isn't deployed.
+
+
+create or replace function public.company_bundle(p_cik bigint)
+returns json
+language sql
+stable
+security invoker
+as $$
+  select json_build_object(
+    -- Overview line items: IS/BS/CF/EQ rows of the company's annual filings,
+    -- normalized. A flat row repeats the filing columns and the tag/label/unit
+    -- strings every time; here each filing and each distinct string is sent
+    -- once and every row is a tuple of indices into them:
+    --
+    --   filings : [adsh, form, period, fy, fp, filed]          (index = position)
+    --   strings : distinct tag / plabel / uom values            (index = position)
+    --   rows    : [filing, stmt, line, plabel|null, tag, value, uom, qtrs, ddate]
+    --
+    -- `ddate` is sent as the integer YYYYMMDD the client stores, and `value` as
+    -- text: a JSON number would be parsed as a double, losing the exact
+    -- numeric(28,4) the client keeps for sums.
+    'overview', (
+      with src as (
+        select a.*
+        from public.annual_line_items a
+        where a.cik = p_cik
+          and a.stmt in ('IS', 'BS', 'CF', 'EQ')
+      ),
+      filings as (
+        select d.*, (row_number() over (order by d.adsh) - 1)::int as idx
+        from (
+          select distinct on (adsh) adsh, form, period, fy, fp, filed
+          from src
+          order by adsh
+        ) d
+      ),
+      strs as (
+        select u.s, (row_number() over (order by u.s) - 1)::int as idx
+        from (
+          select tag as s from src
+          union
+          select uom from src
+          union
+          select plabel from src where plabel is not null
+        ) u
+      )
+      select json_build_object(
+        'filings', (
+          select coalesce(
+            json_agg(json_build_array(adsh, form, period, fy, fp, filed) order by idx),
+            '[]'::json
+          )
+          from filings
+        ),
+        'strings', (
+          select coalesce(json_agg(s order by idx), '[]'::json)
+          from strs
+        ),
+        'rows', (
+          select coalesce(
+            json_agg(json_build_array(
+              f.idx, a.stmt, a.line, p.idx, t.idx, a.value::text, u.idx, a.qtrs,
+              replace(a.ddate::text, '-', '')::int
+            ) order by a.line, a.ddate, a.adsh, a.tag, a.uom, a.qtrs),
+            '[]'::json
+          )
+          from src a
+          join filings f on f.adsh = a.adsh
+          join strs t on t.s = a.tag
+          join strs u on u.s = a.uom
+          left join strs p on p.s = a.plabel
+        )
+      )
+    ),
+
+    -- Canonical KPIs (latest restatement already resolved by the view).
+    'canonical', (
+      select coalesce(
+        json_agg(json_build_object(
+          'field', f.field, 'ddate', f.ddate, 'value', f.value, 'qtrs', f.qtrs
+        ) order by f.ddate, f.field),
+        '[]'::json
+      )
+      from public.fundamentals f
+      where f.cik = p_cik
+        and f.field in ('revenue', 'operating_expenses', 'net_income', 'total_assets', 'operating_cash_flow')
+        and f.qtrs in (0, 4)
+    ),
+
+    -- Every filing, most recent first (the Statements filing picker).
+    'filings', (
+      select coalesce(
+        json_agg(json_build_object(
+          'adsh', g.adsh, 'form', g.form, 'period', g.period, 'fy', g.fy,
+          'fp', g.fp, 'filed', g.filed
+        ) order by g.period desc nulls last, g.filed desc, g.adsh),
+        '[]'::json
+      )
+      from public.filing g
+      where g.cik = p_cik
+    ),
+
+    -- Display name as stored in `fundamentals`, for companies missing from the
+    -- SEC ticker map.
+    'name', (
+      select f.name
+      from public.fundamentals f
+      where f.cik = p_cik
+        and f.name is not null
+      limit 1
+    )
+  );
+$$;
+
+
+grant execute on function public.company_bundle(bigint) to anon, authenticated;
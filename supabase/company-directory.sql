@@ -0,0 +1,68 @@
+-- Fiscal Fundamentals — company directory for the search list.
+--
+-- The navbar search needs one row per company, but `filing` has one row per
+-- submission. Walking and de-duplicating it from the browser costs a dozen
+-- round trips on every cold visit, so keep the distinct list precomputed here
+-- and hand it out in a single request.
+--
+-- Safe to run more than once (idempotent). Run it after rls-policies.sql, then
+-- refresh the view at the end of every ingest:
+--
+--   refresh materialized view concurrently public.company_directory;
+--
+-- `concurrently` keeps the view readable during the refresh; it relies on the
+-- unique index below.
+
+
+-- 1. One row per CIK ---------------------------------------------------------
+--    Name comes from the company's most recent filing (EDGAR names change over
+--    time; the latest is what users search for). `latest_filed` is the newest
+--    filing date on record for the company.
+
+create materialized view if not exists public.company_directory as
+select distinct on (cik)
+       cik,
+       name,
+       filed as latest_filed
+from public.filing
+order by cik, filed desc nulls last, adsh desc;
+
+create unique index if not exists company_directory_cik_idx
+  on public.company_directory (cik);
+
+
+-- 2. Single-request read -----------------------------------------------------
+--    PostgREST caps row responses at 1000, so selecting the view directly would
+--    still page. A function returning one JSON value isn't capped: the whole
+--    directory arrives as a single array of [cik, name, latest_filed] tuples.
+
+create or replace function public.get_company_directory()
+returns json
+language sql
+stable
+security invoker
+as $$
+  select coalesce(
+    json_agg(json_build_array(cik, name, latest_filed) order by cik),
+    '[]'::json
+  )
+  from public.company_directory;
+$$;
+
+
+-- 3. Delta refresh index -------------------------------------------------------
+--    Browsers refresh a cached search list by reading only the filings filed on
+--    or after the newest date they have seen (`filed >= :since`); keep that a
+--    short index range instead of a scan of every submission.
+
+create index if not exists filing_filed_idx
+  on public.filing (filed, adsh);
+
+
+-- 4. Grants -----------------------------------------------------------------
+--    Materialized views can't carry RLS policies; the directory only holds
+--    public `filing` columns, so a plain read grant is the whole story.
+
+grant select on public.company_directory to anon, authenticated;
+revoke insert, update, delete, truncate on public.company_directory from anon, authenticated;
+grant execute on function public.get_company_directory() to anon, authenticated;
@@ -0,0 +1,231 @@
+-- Fiscal Fundamentals — public data version for client cache invalidation.
+--
+-- The browser caches warehouse reads (localStorage, IndexedDB, the prebuilt
+-- Overview bundles) but has no way to see when new data lands: `ingest_log` is
+-- internal and stays locked by rls-policies.sql. This table publishes a version
+-- per company, and `warehouse_version_latest` one for the whole warehouse, so
+-- caches can be keyed on them and kept until they change.
+--
+-- The versions are an ingest watermark kept by the database itself: statement
+-- triggers on the tables the app reads bump them on every write, so there is
+-- nothing for the ingest job to refresh or forget, and a re-ingested or
+-- corrected filing moves the version like a new one.
+--
+-- Safe to run more than once (idempotent). Run it after rls-policies.sql.
+
+
+-- 1. Versions ----------------------------------------------------------------
+--    A version is a value of `warehouse_version_seq`: each write statement
+--    takes the next one and stamps it on every CIK it touched. Only those
+--    companies' rows are locked, so ingest transactions for different
+--    companies never wait on each other. The warehouse-wide version is the
+--    newest company version (`warehouse_version_latest`, an index lookup);
+--    clients compare it first and only read a company's own row when it has
+--    moved.
+--
+--    Earlier revisions published this as a materialized view, then as a text
+--    column with the warehouse version under CIK 0; migrate both.
+
+do $$
+begin
+  if exists (
+    select 1 from pg_matviews
+    where schemaname = 'public' and matviewname = 'warehouse_version'
+  ) then
+    drop materialized view public.warehouse_version;
+  end if;
+end $$;
+
+create sequence if not exists public.warehouse_version_seq;
+
+create table if not exists public.warehouse_version (
+  cik        bigint primary key,
+  version    bigint not null,
+  changed_at timestamptz not null default now()
+);
+
+do $$
+begin
+  if exists (
+    select 1 from information_schema.columns
+    where table_schema = 'public' and table_name = 'warehouse_version'
+      and column_name = 'version' and data_type = 'text'
+  ) then
+    alter table public.warehouse_version alter column version type bigint using version::bigint;
+  end if;
+end $$;
+
+delete from public.warehouse_version where cik = 0;
+
+create index if not exists warehouse_version_version_idx
+  on public.warehouse_version (version);
+
+create or replace view public.warehouse_version_latest
+with (security_invoker = true) as
+  select max(version) as version from public.warehouse_version;
+
+create or replace function public.bump_warehouse_version(p_ciks bigint[])
+returns void
+language sql
+security definer
+set search_path = public
+as $$
+  with v as (select nextval('public.warehouse_version_seq') as version)
+  insert into public.warehouse_version (cik, version, changed_at)
+  select c.cik, v.version, now()
+  -- Sorted, so concurrent bumps lock shared CIKs in the same order.
+  from v, (select distinct unnest(p_ciks) as cik order by 1) c
+  on conflict (cik) do update
+    set version = excluded.version, changed_at = excluded.changed_at;
+$$;
+
+
+-- 2. Triggers ---------------------------------------------------------------
+--    One statement-level trigger per table and event, reading the touched rows
+--    from the transition table `changed`, so a bulk load bumps once per
+--    statement rather than once per row.
+--
+--    `filing` carries the CIK. It also notes the filings it stamped in a
+--    per-session temp table emptied at commit, and `line_item` statements only
+--    look up (through `filing`) the CIKs of filings not stamped earlier in the
+--    same transaction. Ingest writes a filing with its line items, so line item
+--    batches find everything already stamped and bump nothing; only a line
+--    item correction on its own pays for the lookup, once per filing.
+
+create or replace function public.warehouse_version_stamped()
+returns void
+language plpgsql
+as $$
+begin
+  if to_regclass('pg_temp.warehouse_version_stamped') is null then
+    create temp table warehouse_version_stamped (adsh text primary key)
+      on commit delete rows;
+  end if;
+end $$;
+
+create or replace function public.warehouse_version_by_filing()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare ciks bigint[];
+begin
+  perform public.warehouse_version_stamped();
+  select array_agg(distinct cik) into ciks from changed;
+  if ciks is not null then
+    perform public.bump_warehouse_version(ciks);
+    insert into pg_temp.warehouse_version_stamped (adsh)
+    select distinct adsh from changed
+    on conflict do nothing;
+  end if;
+  return null;
+end $$;
+
+create or replace function public.warehouse_version_by_cik()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare ciks bigint[];
+begin
+  select array_agg(distinct cik) into ciks from changed;
+  if ciks is not null then
+    perform public.bump_warehouse_version(ciks);
+  end if;
+  return null;
+end $$;
+
+create or replace function public.warehouse_version_by_adsh()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  pending text[];
+  ciks bigint[];
+begin
+  perform public.warehouse_version_stamped();
+  select array_agg(c.adsh) into pending
+  from (select distinct adsh from changed) c
+  where not exists (
+    select 1 from pg_temp.warehouse_version_stamped s where s.adsh = c.adsh
+  );
+  if pending is null then
+    return null;
+  end if;
+  select array_agg(distinct f.cik) into ciks
+  from public.filing f
+  where f.adsh = any (pending);
+  if ciks is not null then
+    perform public.bump_warehouse_version(ciks);
+  end if;
+  insert into pg_temp.warehouse_version_stamped (adsh)
+  select unnest(pending)
+  on conflict do nothing;
+  return null;
+end $$;
+
+--    `canonical_fact` is keyed by whichever of `cik` or `adsh` it has; its
+--    columns aren't defined in this repo, so they are looked up here.
+do $$
+declare
+  t record;
+  ev text;
+  fact_fn text;
+begin
+  select case
+    when bool_or(column_name = 'cik') then 'warehouse_version_by_cik'
+    when bool_or(column_name = 'adsh') then 'warehouse_version_by_adsh'
+  end into fact_fn
+  from information_schema.columns
+  where table_schema = 'public' and table_name = 'canonical_fact';
+  if fact_fn is null then
+    raise notice 'canonical_fact has neither cik nor adsh; its writes will not move versions';
+  end if;
+
+  for t in
+    select * from (values
+      ('filing', 'warehouse_version_by_filing'),
+      ('canonical_fact', fact_fn),
+      ('line_item', 'warehouse_version_by_adsh')
+    ) as x(tbl, fn)
+  loop
+    foreach ev in array array['insert', 'update', 'delete'] loop
+      execute format('drop trigger if exists %I on public.%I', 'warehouse_version_' || ev, t.tbl);
+      continue when t.fn is null;
+      execute format(
+        'create trigger %I after %s on public.%I referencing %s table as changed '
+          'for each statement execute function public.%I()',
+        'warehouse_version_' || ev, ev, t.tbl,
+        case ev when 'delete' then 'old' else 'new' end, t.fn
+      );
+    end loop;
+  end loop;
+end $$;
+
+-- Seed every company already loaded (first run only).
+select public.bump_warehouse_version(array(select distinct cik from public.filing))
+where not exists (select 1 from public.warehouse_version);
+
+
+-- 3. Access -----------------------------------------------------------------
+--    Versions only reveal which CIKs changed, and when, which the public
+--    `filing` table shows anyway, so anyone may read them. Only the triggers
+--    write; the bump function is not callable through the API.
+
+alter table public.warehouse_version enable row level security;
+
+drop policy if exists "Public read access" on public.warehouse_version;
+create policy "Public read access"
+  on public.warehouse_version
+  for select
+  to anon, authenticated
+  using (true);
+
+grant select on public.warehouse_version to anon, authenticated;
+grant select on public.warehouse_version_latest to anon, authenticated;
+revoke insert, update, delete, truncate on public.warehouse_version from anon, authenticated;
+revoke all on function public.bump_warehouse_version(bigint[]) from public, anon, authenticated;